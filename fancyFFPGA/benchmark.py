@@ -0,0 +1,631 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Fractal Visualizer hot paths.
+
+Times the ingest, theme, enhancement, palette, display scaling and save stages
+of fancyFractal.py at several frame sizes without opening a window, writes the
+results as JSON and compares them against a stored baseline.
+
+Examples:
+  python benchmark.py --sizes 256 1080p
+  python benchmark.py --stages "theme.*" --output results.json
+  python benchmark.py --update-baseline
+  python benchmark.py --baseline benchmark_baseline.json --threshold 0.15
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import platform
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy
+import PIL
+from scipy import ndimage
+from PIL import Image
+
+from fancyFractal import EnhancedFractalVisualizer, FractalTheme, ColorPalette, SMOOTH_PALETTE_SIZE
+from fpga_simulator import mandelbrot_samples
+from fractal_engine import (
+    MandelbrotEngine, ParallelMandelbrotEngine, SubdivisionEngine, JuliaEngine, ViewPort
+)
+from perturbation import PerturbationEngine, DeepViewPort
+from palette_registry import PaletteRegistry, MAX_LUT_SIZE
+from fast_filters import median3x3, maximum_filter
+from canvas_blit import DisplayScaler, dirty_bbox
+from frame_stats import StreamingHistogram
+from golden_compare import GoldenComparator
+
+# Keep benchmark runs out of fractal_app.log: LogManager only adds its file
+# handler to a logger that has no handlers yet
+logging.getLogger("FractalVisualizer").addHandler(logging.NullHandler())
+
+# Frame sizes covered by the suite (name -> width, height)
+SIZES: Dict[str, Tuple[int, int]] = {
+    "256": (256, 256),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+    "8192": (8192, 8192),
+}
+
+THEMES = ["classic", "smooth", "dramatic", "organic", "crystalline", "ethereal", "histogram"]
+
+# Canvas area of the default 1600x1000 window next to the sidebar
+DISPLAY_CANVAS = (1180, 940)
+
+# Deep-zoom view near the Misiurewicz point c = i, far below float64 resolution
+DEEP_CENTER = ("3e-52", "1.0000000000000000000000000000000000000000000000000001")
+DEEP_ZOOM = 1e50
+
+# Interior-heavy views for periodicity checking: (center_x, center_y, zoom).
+# Run without the cardioid/bulb test so the main cardioid is iterated too.
+PERIODICITY_VIEWS = {
+    "cardioid": (-0.2, 0.0, 2.5),
+    "minibrot": (-1.7549, 0.0, 40.0),
+}
+PERIODICITY_ITER = 2048
+
+JULIA_C = -0.8 + 0.156j
+
+# Seahorse-valley view with plenty of edges for the anti-aliasing stages
+AA_VIEW = (-0.745, 0.1, 20.0)
+AA_THRESHOLD = 0.05
+# Frame size at which adaptive anti-aliasing must take less time than 2x2 supersampling
+AA_CHECK_SIZE = "256"
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.15
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one stage at one frame size"""
+    stage: str
+    size: str
+    width: int
+    height: int
+    times: List[float] = field(default_factory=list)
+
+    @property
+    def samples(self) -> int:
+        return self.width * self.height
+
+    @property
+    def median(self) -> float:
+        return float(np.median(self.times))
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.stage,
+            "size": self.size,
+            "width": self.width,
+            "height": self.height,
+            "repeat": len(self.times),
+            "median_s": self.median,
+            "min_s": float(min(self.times)),
+            "samples_per_second": self.samples / self.median if self.median > 0 else 0.0,
+        }
+
+
+class HeadlessVisualizer(EnhancedFractalVisualizer):
+    """Visualizer pipeline without Tk widgets or the file monitor thread"""
+
+    def _setup_ui(self):
+        self.root = None
+
+    def _start_file_monitoring(self):
+        pass
+
+    def _update_status(self, message: str):
+        pass
+
+    def _schedule_ui_update(self):
+        pass
+
+
+def benchmark_frame(width: int, height: int) -> np.ndarray:
+    """Deterministic normalized Mandelbrot frame of the requested size"""
+    # Compute at most 1024 px on the long side and upsample by index lookup so
+    # that 8192x8192 frames stay cheap to prepare
+    scale = min(1.0, 1024 / max(width, height))
+    small_w, small_h = max(1, int(width * scale)), max(1, int(height * scale))
+    small = mandelbrot_samples(small_w, small_h, max_iter=256)
+    rows = (np.arange(height) * small_h // height)[:, np.newaxis]
+    cols = (np.arange(width) * small_w // width)[np.newaxis, :]
+    return (small[rows, cols].astype(np.float32) / 1023.0)
+
+
+def render_parallel(width: int, height: int):
+    """Band-parallel render across all CPUs (the pool is reused between runs)"""
+    engine = ParallelMandelbrotEngine(ViewPort(width, height), 256)
+    engine.render()
+    engine.buffer.close()
+
+
+class BenchmarkSuite:
+    """Runs every selected stage at every selected size"""
+
+    def __init__(self, sizes: List[str], stage_patterns: List[str], repeat: int,
+                 workdir: Path):
+        self.sizes = sizes
+        self.stage_patterns = stage_patterns
+        self.repeat = repeat
+        self.workdir = workdir
+        self.results: List[BenchmarkResult] = []
+        self.series_reports: List[dict] = []
+        self.periodicity_reports: List[dict] = []
+        self.antialias_reports: List[dict] = []
+        self.parallel_reports: List[dict] = []
+        self.check_failures: List[str] = []
+
+    def _selected(self, stage: str) -> bool:
+        return any(fnmatch.fnmatch(stage, pattern) for pattern in self.stage_patterns)
+
+    def _time(self, stage: str, size: str, width: int, height: int,
+              fn: Callable[[], None], setup: Optional[Callable[[], None]] = None,
+              repeat: Optional[int] = None):
+        """Time fn() after setup(), keeping setup out of the measurement"""
+        if not self._selected(stage):
+            return
+        result = BenchmarkResult(stage, size, width, height)
+        # One untimed warm-up run so lazy imports and caches are not measured
+        if setup:
+            setup()
+        fn()
+        for _ in range(repeat or self.repeat):
+            if setup:
+                setup()
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            result.times.append(time.perf_counter() - start)
+        self.results.append(result)
+        print(f"  {stage:<28} {result.median * 1000:10.2f} ms  "
+              f"({result.samples / result.median / 1e6:8.2f} Msamples/s)")
+
+    def _make_visualizer(self, width: int, height: int, data_path: Path) -> HeadlessVisualizer:
+        visualizer = HeadlessVisualizer(str(data_path))
+        visualizer.settings.width = width
+        visualizer.settings.height = height
+        return visualizer
+
+    @staticmethod
+    def _reset(visualizer: HeadlessVisualizer):
+        visualizer.total_pixels = visualizer.settings.width * visualizer.settings.height
+        visualizer.fractal_data = np.zeros(
+            (visualizer.settings.height, visualizer.settings.width), dtype=np.float32
+        )
+        visualizer.pixels_read = 0
+        visualizer.file_position = 0
+
+    def run_size(self, size: str):
+        width, height = SIZES[size]
+        print(f"\n{size} ({width}x{height})")
+        frame = benchmark_frame(width, height)
+        raw = np.round(frame * 1023).astype(np.uint16)
+
+        text_path = self.workdir / f"capture_{size}.txt"
+        binary_path = self.workdir / f"capture_{size}.bin"
+        if self._selected("ingest.read_file_data"):
+            with open(text_path, "w") as f:
+                f.write("\n".join(map(str, raw.ravel().tolist())) + "\n")
+        raw.astype("<u2").tofile(binary_path)
+        float_path = self.workdir / f"capture_{size}.f32"
+        if self._selected("ingest.read_binary_float32"):
+            frame.astype("<f4").tofile(float_path)
+
+        visualizer = self._make_visualizer(width, height, text_path)
+        reset = lambda: self._reset(visualizer)
+
+        # Ingest
+        self._time("ingest.read_file_data", size, width, height,
+                   visualizer._read_file_data, reset)
+        visualizer.data_file_path = binary_path
+        self._time("ingest.read_binary_data", size, width, height,
+                   visualizer._read_binary_data, reset)
+        self._time("ingest.process_new_pixels", size, width, height,
+                   lambda: visualizer._process_new_pixels(frame.ravel()), reset)
+        # Three frames in one stream: each finished frame is copied into the frame ring
+        sequence = np.tile(frame.ravel(), 3)
+        self._time("ingest.frame_sequence", size, width, height,
+                   lambda: visualizer._process_new_pixels(sequence), reset)
+        if float_path.exists():
+            visualizer.data_file_path = float_path
+            visualizer.settings.sample_format = "float32"
+            self._time("ingest.read_binary_float32", size, width, height,
+                       visualizer._read_binary_data, reset)
+            visualizer.settings.sample_format = "int10"
+
+        visualizer.fractal_data = frame
+        visualizer.pixels_read = visualizer.total_pixels
+        settings = visualizer.settings
+
+        # Themes
+        for theme in THEMES:
+            self._time(f"theme.{theme}", size, width, height,
+                       lambda theme=theme: FractalTheme.apply_theme(frame, theme, settings))
+        scipy_settings = replace(settings, fast_filters=False)
+        for theme in ("dramatic", "ethereal"):
+            self._time(f"theme.{theme}.scipy_filters", size, width, height,
+                       lambda theme=theme: FractalTheme.apply_theme(frame, theme, scipy_settings))
+
+        # Neighbourhood kernels: SciPy's generic filters vs fast_filters
+        self._time("filter.rank3x3_scipy", size, width, height,
+                   lambda: ndimage.rank_filter(frame, rank=4, size=3))
+        self._time("filter.median3x3", size, width, height, lambda: median3x3(frame))
+        self._time("filter.maximum3x3_scipy", size, width, height,
+                   lambda: ndimage.maximum_filter(frame, size=3))
+        self._time("filter.maximum3x3", size, width, height, lambda: maximum_filter(frame, 3))
+        self._time("filter.maximum9x9_scipy", size, width, height,
+                   lambda: ndimage.maximum_filter(frame, size=9))
+        self._time("filter.maximum9x9_vhgw", size, width, height, lambda: maximum_filter(frame, 9))
+
+        # Enhancements and palette
+        themed = FractalTheme.apply_theme(frame, settings.theme, settings)
+        self._time("enhance.apply_enhancements", size, width, height,
+                   lambda: visualizer._apply_enhancements(themed))
+        enhanced = visualizer._apply_enhancements(themed)
+        palette = visualizer.color_palettes[settings.palette]
+        self._time("palette.gather", size, width, height,
+                   lambda: palette[np.clip(enhanced * 1023, 0, 1023).astype(int)])
+
+        # Golden comparison against a reference with a sparse set of 1-LSB errors:
+        # the per-frame cost of comparing as samples arrive, and the diff heatmap
+        reference = frame.copy()
+        reference.reshape(-1)[::4099] += 1 / 1023
+        comparator = GoldenComparator(reference, 0.5 / 1023)
+        self._time("verify.golden_compare", size, width, height,
+                   lambda: comparator.advance(frame, frame.size), comparator.reset)
+        rgb = palette[np.clip(enhanced * 1023, 0, 1023).astype(int)]
+        self._time("verify.diff_heatmap", size, width, height,
+                   lambda: comparator.overlay(rgb.copy(), frame, height))
+
+        # Histogram equalization: per-chunk histogram update, and the equalized
+        # palette mapping with the equalization folded into the LUT
+        self._time("stats.histogram_update", size, width, height,
+                   lambda: StreamingHistogram().add(frame))
+        equalized_settings = replace(settings, theme="histogram", smoothness=1.0, focus=1.0)
+        equalizing = self._make_visualizer(width, height, text_path)
+        equalizing.settings = equalized_settings
+        equalizing.fractal_data = frame
+        equalizing.pixels_read = equalizing.total_pixels = width * height
+        equalizing.frame_histogram.add(frame)
+        self._time("palette.gather_equalized", size, width, height,
+                   lambda: equalizing._equalized_palette(palette)[np.clip(frame * 1023, 0, 1023).astype(int)])
+
+        # Auto levels: contrast/exposure from the running statistics (independent of frame size)
+        self._time("stats.auto_levels", size, width, height,
+                   lambda: FractalTheme.auto_levels(settings.theme, settings, equalizing.frame_histogram))
+
+        # Smooth iteration channel: no de-banding blur, larger palette LUT
+        smooth_settings = replace(settings, sample_format="float32")
+        self._time("theme.classic.smooth", size, width, height,
+                   lambda: FractalTheme.apply_theme(frame, "classic", smooth_settings))
+        smooth_palette = ColorPalette.generate_palette(settings.palette, SMOOTH_PALETTE_SIZE)
+        top = SMOOTH_PALETTE_SIZE - 1
+        self._time("palette.gather_smooth", size, width, height,
+                   lambda: smooth_palette[np.clip(enhanced * top, 0, top).astype(int)])
+
+        # Largest LUT: generated from scratch vs loaded from the registry's .npy cache
+        palette_cache = self.workdir / "palettes"
+
+        def first_use(cache_dir):
+            registry = PaletteRegistry(cache_dir)
+            ColorPalette.register_builtins(registry)
+            return registry.get(settings.palette, MAX_LUT_SIZE)
+
+        self._time("palette.generate_64k", size, width, height, lambda: first_use(None))
+        # The untimed warm-up run writes the cache entry
+        self._time("palette.cache_load_64k", size, width, height, lambda: first_use(palette_cache))
+
+        rgb_image = Image.fromarray(palette[np.clip(enhanced * 1023, 0, 1023).astype(int)], "RGB")
+        self._time("enhance.image", size, width, height,
+                   lambda: visualizer._apply_image_enhancements(rgb_image))
+        self._time("render.compose_image", size, width, height,
+                   lambda: visualizer._compose_image(height))
+
+        # Display and save
+        self._time("display.scale", size, width, height,
+                   lambda: visualizer._scale_for_display(rgb_image, *DISPLAY_CANVAS))
+
+        # Interactive resize previews: nearest from the frame, bilinear from a cached rescale
+        display_size = visualizer._display_size((width, height), *DISPLAY_CANVAS)
+        preview_size = visualizer._display_size((width, height), DISPLAY_CANVAS[0] - 40, DISPLAY_CANVAS[1] - 40)
+        visualizer.processed_image = rgb_image
+        visualizer.display_cache.clear()
+        self._time("display.scale_preview", size, width, height,
+                   lambda: visualizer._preview_scale((width, height), preview_size))
+        visualizer.display_cache[(visualizer.image_version, display_size)] = \
+            visualizer._scale_for_display(rgb_image, *DISPLAY_CANVAS)
+        self._time("display.scale_preview_cached", size, width, height,
+                   lambda: visualizer._preview_scale((width, height), preview_size))
+
+        # Streaming tick: the frame grows from half height by one 64-row band
+        half = rgb_image.crop((0, 0, width, height // 2))
+        grown = rgb_image.crop((0, 0, width, min(height, height // 2 + 64)))
+        scaler = DisplayScaler()
+        self._time("display.scale_streaming", size, width, height,
+                   lambda: scaler.scale(grown, height, display_size),
+                   lambda: scaler.scale(half, height, display_size))
+        shown = np.asarray(scaler.scale(half, height, display_size))
+        grown_display = np.asarray(scaler.scale(grown, height, display_size))
+        self._time("display.dirty_bbox", size, width, height,
+                   lambda: dirty_bbox(shown, grown_display))
+        save_path = self.workdir / f"bench_{size}.png"
+        self._time("save.png", size, width, height,
+                   lambda: visualizer._write_image(rgb_image, save_path))
+
+        # Software compute engine (default view, 256 iterations)
+        self._time("compute.engine", size, width, height,
+                   lambda: MandelbrotEngine(ViewPort(width, height), 256).render())
+        self._time("compute.smooth", size, width, height,
+                   lambda: MandelbrotEngine(ViewPort(width, height), 256, smooth=True).render())
+        self._time("compute.no_symmetry", size, width, height,
+                   lambda: MandelbrotEngine(ViewPort(width, height), 256, use_symmetry=False).render())
+        self._time("compute.julia", size, width, height,
+                   lambda: JuliaEngine(ViewPort(width, height, 0.0, 0.0), JULIA_C, 256).render())
+
+        # Raising max_iter 1024 -> 8192 on a finished render
+        refined: Dict[str, MandelbrotEngine] = {}
+
+        def render_for_refine():
+            refined["engine"] = MandelbrotEngine(ViewPort(width, height), 1024, keep_orbits=True)
+            refined["engine"].render()
+
+        self._time("compute.refine", size, width, height,
+                   lambda: refined["engine"].refine(8192), render_for_refine)
+        self._time("compute.subdivision", size, width, height,
+                   lambda: SubdivisionEngine(ViewPort(width, height), 256).render())
+        self._time("compute.subdivision_exact", size, width, height,
+                   lambda: SubdivisionEngine(ViewPort(width, height), 256, exact=True).render())
+        self._time("compute.parallel", size, width, height,
+                   lambda: render_parallel(width, height))
+        self._report_parallel(size)
+        # Adaptive anti-aliasing vs full 2x2 supersampling (a frame of twice the size)
+        aa_view = ViewPort(width, height, *AA_VIEW)
+        self._time("compute.antialias.base", size, width, height,
+                   lambda: MandelbrotEngine(aa_view, 256).render())
+        self._time("compute.antialias", size, width, height,
+                   lambda: MandelbrotEngine(aa_view, 256, aa_threshold=AA_THRESHOLD).render())
+        self._time("compute.supersample_2x2", size, width, height,
+                   lambda: MandelbrotEngine(ViewPort(2 * width, 2 * height, *AA_VIEW), 256).render())
+        self._report_antialias(size, aa_view)
+        deep_view = DeepViewPort(width, height, *DEEP_CENTER, DEEP_ZOOM)
+        self._time("compute.perturbation", size, width, height,
+                   lambda: PerturbationEngine(deep_view, 1024, series_terms=0).render())
+        self._time("compute.series", size, width, height,
+                   lambda: PerturbationEngine(deep_view, 1024).render())
+        self._report_series(size, deep_view)
+
+        for view_name, (center_x, center_y, zoom) in PERIODICITY_VIEWS.items():
+            view = ViewPort(width, height, center_x, center_y, zoom)
+            for enabled in (False, True):
+                self._time(f"periodicity.{view_name}.{'on' if enabled else 'off'}", size, width, height,
+                           lambda view=view, enabled=enabled: MandelbrotEngine(
+                               view, PERIODICITY_ITER, use_bulb_check=False, use_periodicity=enabled
+                           ).render())
+            self._report_periodicity(size, view_name, view)
+
+        for path in (text_path, binary_path, float_path, save_path):
+            if path.exists():
+                path.unlink()
+
+    def _result(self, stage: str, size: str) -> Optional[BenchmarkResult]:
+        return next((r for r in self.results if r.stage == stage and r.size == size), None)
+
+    def _report_series(self, size: str, view: DeepViewPort):
+        """Iterations skipped and time saved by series approximation vs plain perturbation"""
+        plain_result = self._result("compute.perturbation", size)
+        series_result = self._result("compute.series", size)
+        if plain_result is None or series_result is None:
+            return
+        plain = PerturbationEngine(view, 1024, series_terms=0)
+        plain.render()
+        engine = PerturbationEngine(view, 1024)
+        engine.render()
+        total = plain.stats.iterations
+        report = {
+            "size": size,
+            "skip_iterations": engine.series.skip,
+            "iterations_skipped": engine.stats.series_skipped,
+            "iterations_plain": total,
+            "iterations_series": engine.stats.iterations,
+            "skipped_fraction": engine.stats.series_skipped / total if total else 0.0,
+            "time_saved_s": min(plain_result.times) - min(series_result.times),
+            "speedup": min(plain_result.times) / min(series_result.times),
+        }
+        self.series_reports.append(report)
+        print(f"  series approximation: skip {report['skip_iterations']} iterations/pixel, "
+              f"{report['iterations_skipped']:,} iterations skipped ({report['skipped_fraction']:.0%}), "
+              f"{report['time_saved_s'] * 1000:.2f} ms saved ({report['speedup']:.1f}x)")
+
+    def _report_parallel(self, size: str):
+        """Speedup of the band-parallel render over the serial engine on the same view"""
+        serial_result = self._result("compute.engine", size)
+        parallel_result = self._result("compute.parallel", size)
+        if serial_result is None or parallel_result is None:
+            return
+        workers = os.cpu_count() or 1
+        speedup = min(serial_result.times) / min(parallel_result.times)
+        report = {
+            "size": size,
+            "workers": workers,
+            "speedup": speedup,
+            "efficiency": speedup / workers,
+        }
+        self.parallel_reports.append(report)
+        print(f"  parallel: {workers} workers, {speedup:.2f}x the serial engine "
+              f"({report['efficiency']:.0%} of linear scaling)")
+
+    def _report_antialias(self, size: str, view: ViewPort):
+        """Share of pixels supersampled, and iterations and time relative to a plain render and to 2x2"""
+        aa_result = self._result("compute.antialias", size)
+        if aa_result is None:
+            return
+        engine = MandelbrotEngine(view, 256, aa_threshold=AA_THRESHOLD)
+        engine.render()
+        plain = MandelbrotEngine(view, 256)
+        plain.render()
+        report = {
+            "size": size,
+            "threshold": AA_THRESHOLD,
+            "supersampled_pixels": engine.stats.supersampled,
+            "supersampled_fraction": engine.stats.supersampled / engine.stats.pixels,
+            "full_grid_fraction": engine.stats.fully_supersampled / engine.stats.pixels,
+            "samples_per_pixel": engine.stats.samples_per_pixel,
+            # Refined pixels sit on the outline, where orbits are longest
+            "iterations_vs_base": engine.stats.iterations / max(plain.stats.iterations, 1),
+        }
+        base_result = self._result("compute.antialias.base", size)
+        if base_result is not None:
+            report["cost_vs_base"] = min(aa_result.times) / min(base_result.times)
+        full_result = self._result("compute.supersample_2x2", size)
+        if full_result is not None:
+            report["cost_vs_2x2"] = min(aa_result.times) / min(full_result.times)
+        self.antialias_reports.append(report)
+        print(f"  anti-aliasing: {report['supersampled_fraction']:.1%} of pixels probed, "
+              f"{report['full_grid_fraction']:.1%} fully supersampled, "
+              f"{report['samples_per_pixel']:.2f} samples/pixel, "
+              f"{report['iterations_vs_base']:.2f}x the iterations of a plain render"
+              + (f", {report['cost_vs_base']:.2f}x its time" if "cost_vs_base" in report else "")
+              + (f", {report['cost_vs_2x2']:.2f}x the time of 2x2" if "cost_vs_2x2" in report else ""))
+        if size == AA_CHECK_SIZE and "cost_vs_2x2" in report:
+            report["cheaper_than_2x2"] = report["cost_vs_2x2"] < 1.0
+            print(f"  anti-aliasing check at {size}: {'ok' if report['cheaper_than_2x2'] else 'FAILED'} "
+                  f"(must take less time than 2x2 supersampling)")
+            if not report["cheaper_than_2x2"]:
+                self.check_failures.append(
+                    f"adaptive anti-aliasing at {size} took {report['cost_vs_2x2']:.2f}x the time of 2x2 supersampling"
+                )
+
+    def _report_periodicity(self, size: str, view_name: str, view: ViewPort):
+        """Total iterations with and without periodicity checking on one view"""
+        off_result = self._result(f"periodicity.{view_name}.off", size)
+        on_result = self._result(f"periodicity.{view_name}.on", size)
+        if off_result is None or on_result is None:
+            return
+        plain = MandelbrotEngine(view, PERIODICITY_ITER, use_bulb_check=False, use_periodicity=False)
+        plain.render()
+        engine = MandelbrotEngine(view, PERIODICITY_ITER, use_bulb_check=False)
+        engine.render()
+        report = {
+            "size": size,
+            "view": view_name,
+            "iterations_off": plain.stats.iterations,
+            "iterations_on": engine.stats.iterations,
+            "iteration_reduction": 1.0 - engine.stats.iterations / max(plain.stats.iterations, 1),
+            "periodic_pixels": engine.stats.periodic,
+            "speedup": min(off_result.times) / min(on_result.times),
+        }
+        self.periodicity_reports.append(report)
+        print(f"  periodicity ({view_name}): {report['iterations_off']:,} -> {report['iterations_on']:,} "
+              f"iterations ({report['iteration_reduction']:.0%} fewer), "
+              f"{report['periodic_pixels']:,} pixels bailed out, {report['speedup']:.1f}x")
+
+    def run(self) -> dict:
+        for size in self.sizes:
+            self.run_size(size)
+        return {
+            "environment": environment_info(),
+            "repeat": self.repeat,
+            "results": [result.to_dict() for result in self.results],
+            "series_approximation": self.series_reports,
+            "periodicity": self.periodicity_reports,
+            "antialiasing": self.antialias_reports,
+            "parallel": self.parallel_reports,
+            "check_failures": self.check_failures,
+        }
+
+
+def environment_info() -> dict:
+    """Versions and machine details that affect the timings"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "platform": f"{platform.system()} {platform.release()}",
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "pillow": PIL.__version__,
+    }
+
+
+def compare_with_baseline(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """Return the stages whose best time regressed beyond the threshold"""
+    reference = {(r["stage"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\nComparison against baseline (threshold +{threshold:.0%}):")
+    for result in current["results"]:
+        key = (result["stage"], result["size"])
+        if key not in reference:
+            continue
+        # Best-of-N is far less sensitive to scheduler noise than the median
+        ratio = result["min_s"] / reference[key]["min_s"]
+        status = "REGRESSION" if ratio > 1.0 + threshold else "ok"
+        print(f"  {result['stage']:<28} {result['size']:>6}  {ratio:6.2f}x  {status}")
+        if status != "ok":
+            regressions.append({**result, "baseline_min_s": reference[key]["min_s"], "ratio": ratio})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--stages", nargs="+", default=["*"], help="Stage name patterns (fnmatch)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a stage counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="fractal_bench_"))
+    try:
+        suite = BenchmarkSuite(args.sizes, args.stages, args.repeat, workdir)
+        results = suite.run()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if results["check_failures"]:
+        print("\nChecks failed:\n  " + "\n  ".join(results["check_failures"]))
+        sys.exit(1)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed beyond +{args.threshold:.0%}")
+            sys.exit(1)
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to store one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Several FPGA boards monitored side by side in one visualizer process.
+
+EnhancedFractalVisualizer owns one source and one polling thread. In grid
+mode every board is a BoardSource: the visualizer's own ingest and render
+pipeline (file, binary, TCP and shared-memory readers, frame sequencing,
+themes) without widgets or a thread of its own.
+
+    IngestScheduler  one dispatcher and a shared worker pool; a board is
+                     polled again at once while it has data and after
+                     IDLE_POLL_S when it had none, never by two workers at
+                     the same time
+    render pool      shared worker threads that compose and scale a board's
+                     image for its tile, at most one render in flight per
+                     board, so a slow board cannot queue up work
+    BoardGrid        the window: one canvas per board; the Tk thread only
+                     queues renders and blits finished images, so the UI
+                     stays responsive however many boards stream
+
+Waiting for data (sleeping polls, socket timeouts, file reads) overlaps
+across boards and the NumPy decode and render stages release the GIL; text
+captures are parsed in Python and share one interpreter, so they scale less
+than binary, TCP and shared-memory sources.
+"""
+
+import heapq
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import customtkinter as ctk
+import tkinter as tk
+from PIL import Image
+
+from canvas_blit import CanvasBlitter
+from fancyFractal import EnhancedFractalVisualizer
+
+# Delay before re-polling a board whose last poll found nothing new (as _monitor_file)
+IDLE_POLL_S = 0.05
+# Tk refresh period of the grid
+GRID_TICK_MS = 100
+
+
+class BoardSource(EnhancedFractalVisualizer):
+    """One board's ingest and render state, driven by the shared scheduler and render pool"""
+
+    def __init__(self, source: str, width: int, height: int):
+        super().__init__(source, resume=False)
+        self.source = source
+        self.settings.width = width
+        self.settings.height = height
+        self.settings.checkpoint_interval = 0  # Grid sessions are not resumed
+        self.dirty = False  # New samples since the last render was queued
+
+    def _setup_ui(self):
+        self.root = None
+        self.control_vars = {}
+        self.control_labels = {}
+
+    def _start_file_monitoring(self):
+        pass
+
+    def _update_status(self, message: str):
+        pass
+
+    def _schedule_ui_update(self):
+        self.dirty = True
+
+
+@dataclass
+class SchedulerStats:
+    """How the shared pool spent its polls"""
+    polls: int = 0
+    busy_polls: int = 0       # Polls that ingested samples
+    errors: int = 0
+
+
+class IngestScheduler:
+    """Polls every board's source from one shared worker pool"""
+
+    def __init__(self, boards: List[BoardSource], workers: int = 0, idle_interval: float = IDLE_POLL_S):
+        self.boards = boards
+        self.idle_interval = idle_interval
+        self.workers = workers or min(len(boards), 2 * (os.cpu_count() or 1))
+        self.stats = SchedulerStats()
+        self.running = False
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._wakeup = threading.Condition()
+        self._due: List[Tuple[float, int]] = []  # (monotonic due time, board index) of boards not in flight
+
+    def start(self):
+        self.running = True
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest")
+        self._due = [(time.monotonic(), index) for index in range(len(self.boards))]
+        heapq.heapify(self._due)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="ingest-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    def stop(self):
+        with self._wakeup:
+            self.running = False
+            self._wakeup.notify()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def _dispatch(self):
+        """Hand boards that are due to the pool; sleep until the next one is"""
+        with self._wakeup:
+            while self.running:
+                now = time.monotonic()
+                while self._due and self._due[0][0] <= now:
+                    _, index = heapq.heappop(self._due)
+                    self._pool.submit(self._poll, index)
+                self._wakeup.wait(self._due[0][0] - now if self._due else None)
+
+    def _poll(self, index: int):
+        board = self.boards[index]
+        before = board.ingest_stats.samples
+        delay = self.idle_interval
+        try:
+            board._poll_source()
+            if board.ingest_stats.samples != before:
+                delay = 0.0  # More may be waiting: poll again right away
+        except Exception as e:
+            board.log_manager.logger.error(f"Board {board.source} polling error: {e}")
+            self.stats.errors += 1
+            delay = 10 * self.idle_interval
+        with self._wakeup:
+            self.stats.polls += 1
+            if delay == 0.0:
+                self.stats.busy_polls += 1
+            heapq.heappush(self._due, (time.monotonic() + delay, index))
+            self._wakeup.notify()
+
+
+@dataclass
+class BoardTile:
+    """A board's place in the grid"""
+    canvas: tk.Canvas
+    label: ctk.CTkLabel
+    blitter: CanvasBlitter
+    rendering: bool = False
+    last_samples: int = 0
+    last_time: float = 0.0
+    rate: float = 0.0          # Samples per second over the last tick
+
+
+class BoardGrid:
+    """Grid of live views, one per board"""
+
+    def __init__(self, sources: List[str], width: int = 256, height: int = 256,
+                 sample_format: Optional[str] = None, ingest_workers: int = 0, render_workers: int = 0):
+        self.boards = [BoardSource(source, width, height) for source in sources]
+        if sample_format:
+            for board in self.boards[1:]:
+                board.settings.sample_format = sample_format
+            self.boards[0]._set_sample_format(sample_format)
+        # Boards share the palette LUTs (same sample format), so each is generated once
+        for board in self.boards[1:]:
+            board.palette_registry = self.boards[0].palette_registry
+            board.color_palettes = self.boards[0].color_palettes
+        self.scheduler = IngestScheduler(self.boards, ingest_workers)
+        self.render_pool = ThreadPoolExecutor(
+            max_workers=render_workers or max(1, min(len(self.boards), (os.cpu_count() or 1) - 1)),
+            thread_name_prefix="render"
+        )
+        self.finished: "queue.SimpleQueue[Tuple[int, Optional[Image.Image], Optional[Tuple[int, int]]]]" = (
+            queue.SimpleQueue()
+        )
+        self.tiles: List[BoardTile] = []
+        self.root: Optional[ctk.CTk] = None
+        self.status_label: Optional[ctk.CTkLabel] = None
+        self._setup_ui()
+
+    @property
+    def settings(self):
+        return self.boards[0].settings
+
+    def _setup_ui(self):
+        colors = EnhancedFractalVisualizer.COLORS
+        self.root = ctk.CTk()
+        self.root.title(f"Fractal Visualizer - {len(self.boards)} boards")
+        self.root.geometry("1600x1000")
+        self.root.configure(fg_color=colors['bg_primary'])
+        self.root.grid_columnconfigure(0, weight=1)
+        self.root.grid_rowconfigure(1, weight=1)
+
+        # Theme and palette apply to every board
+        toolbar = ctk.CTkFrame(self.root, fg_color=colors['bg_secondary'])
+        toolbar.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
+        ctk.CTkOptionMenu(
+            toolbar,
+            values=["classic", "smooth", "dramatic", "organic", "crystalline", "ethereal", "histogram"],
+            variable=ctk.StringVar(value=self.settings.theme),
+            command=lambda theme: self._apply_to_boards("theme", theme),
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left", padx=10, pady=8)
+        ctk.CTkOptionMenu(
+            toolbar,
+            values=list(self.boards[0].color_palettes.keys()),
+            variable=ctk.StringVar(value=self.settings.palette),
+            command=lambda palette: self._apply_to_boards("palette", palette),
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left", padx=(0, 10), pady=8)
+        self.status_label = ctk.CTkLabel(
+            toolbar, text="", font=ctk.CTkFont(size=12), text_color=colors['text_muted']
+        )
+        self.status_label.pack(side="right", padx=10)
+
+        grid = ctk.CTkFrame(self.root, fg_color="transparent")
+        grid.grid(row=1, column=0, sticky="nsew", padx=10, pady=(5, 10))
+        columns = math.ceil(math.sqrt(len(self.boards)))
+        rows = math.ceil(len(self.boards) / columns)
+        for column in range(columns):
+            grid.grid_columnconfigure(column, weight=1, uniform="tile")
+        for row in range(rows):
+            grid.grid_rowconfigure(row, weight=1, uniform="tile")
+
+        for index, board in enumerate(self.boards):
+            cell = ctk.CTkFrame(grid, fg_color=colors['bg_secondary'], corner_radius=8)
+            cell.grid(row=index // columns, column=index % columns, sticky="nsew", padx=4, pady=4)
+            cell.grid_rowconfigure(1, weight=1)
+            cell.grid_columnconfigure(0, weight=1)
+            label = ctk.CTkLabel(cell, text=board.source, font=ctk.CTkFont(size=12),
+                                 text_color=colors['text_secondary'], anchor="w")
+            label.grid(row=0, column=0, sticky="ew", padx=10, pady=(6, 0))
+            canvas = tk.Canvas(cell, bg=colors['bg_primary'], highlightthickness=0, bd=0)
+            canvas.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
+            canvas.bind('<Configure>', lambda event, b=board: setattr(b, "dirty", True))
+            self.tiles.append(BoardTile(canvas, label, CanvasBlitter(canvas), last_time=time.perf_counter()))
+
+    def _apply_to_boards(self, attribute: str, value: str):
+        for board in self.boards:
+            setattr(board.settings, attribute, value)
+            board.dirty = True
+
+    def _tick(self):
+        """Blit finished renders, queue renders of boards with new samples, refresh the labels"""
+        while True:
+            try:
+                index, image, frame_size = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            tile = self.tiles[index]
+            tile.rendering = False
+            if image is not None:
+                try:
+                    center = (tile.canvas.winfo_width() // 2, tile.canvas.winfo_height() // 2)
+                    tile.blitter.show(image, frame_size, center)
+                except Exception as e:
+                    self.boards[index].log_manager.logger.error(f"Board {self.boards[index].source} display error: {e}")
+
+        for index, (board, tile) in enumerate(zip(self.boards, self.tiles)):
+            if board.dirty and not tile.rendering:
+                canvas_size = (tile.canvas.winfo_width(), tile.canvas.winfo_height())
+                if canvas_size[0] > 1 and canvas_size[1] > 1:
+                    board.dirty = False
+                    tile.rendering = True
+                    self.render_pool.submit(self._render, index, canvas_size)
+
+        self._update_labels()
+        self.root.after(GRID_TICK_MS, self._tick)
+
+    def _render(self, index: int, canvas_size: Tuple[int, int]):
+        """Compose a board's frame and scale it to its tile (render pool thread)"""
+        board = self.boards[index]
+        image = frame_display = None
+        try:
+            frame, samples = board._displayed_frame()
+            if frame is not None and samples:
+                width, height = board.settings.width, board.settings.height
+                visible_rows = min(height, (samples + width - 1) // width)
+                if board.settings.auto_levels:
+                    board._update_auto_levels()
+                image = board._compose_image(visible_rows)
+                frame_display = board._display_size((width, height), *canvas_size)
+                if frame_display != (width, height):
+                    with board.profiler.stage("display.scale") as record:
+                        image = record.output(board.display_scaler.scale(image, height, frame_display))
+        except Exception as e:
+            board.log_manager.logger.error(f"Board {board.source} render error: {e}")
+            image = None
+        self.finished.put((index, image, frame_display))
+
+    def _update_labels(self):
+        now = time.perf_counter()
+        total_rate = 0.0
+        for board, tile in zip(self.boards, self.tiles):
+            samples = board.ingest_stats.samples
+            elapsed = now - tile.last_time
+            if elapsed >= 0.5:
+                tile.rate = (samples - tile.last_samples) / elapsed
+                tile.last_samples, tile.last_time = samples, now
+            total_rate += tile.rate
+            progress = board.pixels_read / board.total_pixels * 100 if board.total_pixels else 0.0
+            tile.label.configure(
+                text=f"{board.source} • {board.settings.width}×{board.settings.height} • "
+                     f"frame {board.frame_ring.next_sequence + 1} • {progress:.0f}% • {tile.rate:,.0f} samples/s"
+            )
+        stats = self.scheduler.stats
+        self.status_label.configure(
+            text=f"{total_rate:,.0f} samples/s • {self.scheduler.workers} ingest workers • "
+                 f"{stats.busy_polls:,}/{stats.polls:,} polls with data"
+        )
+
+    def run(self):
+        self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+        self.scheduler.start()
+        self.root.after(GRID_TICK_MS, self._tick)
+        self.root.mainloop()
+
+    def _on_closing(self):
+        self.scheduler.stop()
+        self.render_pool.shutdown(wait=True)
+        for board in self.boards:
+            if board.shm_consumer:
+                board.shm_consumer.close()
+            if board.tcp_socket:
+                board.tcp_socket.close()
+        self.boards[0].log_manager.logger.info("Board grid closing")
+        self.root.quit()
+        self.root.destroy()
@@ -0,0 +1,162 @@
+"""
+Dirty-region blitting of the fractal image into a Tk canvas.
+
+Converting a whole PIL image to a new ImageTk.PhotoImage and recreating the
+canvas item on every refresh costs a full-frame Tk upload even when a
+streaming frame only gained a few rows. CanvasBlitter keeps one canvas image
+item and one backing tk.PhotoImage sized to the complete frame at display
+scale; each refresh compares the new display image with the one on screen
+and uploads only the bounding box of the rows/columns that changed, as
+binary PPM data written with `put ... -to x y`.
+
+The backing image starts blank (transparent), so rows that have not arrived
+yet show the canvas background and a partially streamed frame grows
+downwards in place instead of being re-centred on every update.
+
+DisplayScaler produces the display image for such a partial frame. Scaling
+the visible rows on their own would change the resampling weights (and so
+every displayed row) each time the frame grows; instead the rows are
+resampled as the top of the complete frame, in two separable LANCZOS passes
+whose horizontal pass is kept for rows that did not change.
+"""
+
+import tkinter as tk
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+BBox = Tuple[int, int, int, int]  # (left, top, right, bottom), right/bottom exclusive
+
+
+@dataclass
+class BlitStats:
+    """How display refreshes reached Tk"""
+    full: int = 0           # Whole-image uploads (first frame, size change, frame restart)
+    partial: int = 0        # Dirty-region uploads
+    unchanged: int = 0      # Refreshes with nothing to upload
+    uploaded_pixels: int = 0
+
+
+def dirty_bbox(previous: Optional[np.ndarray], current: np.ndarray) -> Optional[BBox]:
+    """
+    Bounding box of the pixels of `current` that differ from `previous`
+    (both (H, W, 3); rows past the end of `previous` count as changed).
+    None when nothing changed.
+    """
+    height, width = current.shape[:2]
+    if previous is None or previous.shape[1:] != current.shape[1:] or len(previous) > height:
+        return (0, 0, width, height)
+
+    overlap = len(previous)
+    changed = np.any(previous != current[:overlap], axis=2)
+    changed_rows = np.flatnonzero(changed.any(axis=1))
+    if overlap < height:
+        # Newly arrived rows are dirty across the full width
+        top = changed_rows[0] if len(changed_rows) else overlap
+        return (0, int(top), width, height)
+    if not len(changed_rows):
+        return None
+    changed_columns = np.flatnonzero(changed[changed_rows[0]:changed_rows[-1] + 1].any(axis=0))
+    return (int(changed_columns[0]), int(changed_rows[0]),
+            int(changed_columns[-1]) + 1, int(changed_rows[-1]) + 1)
+
+
+def ppm_bytes(rgb: np.ndarray) -> bytes:
+    """Binary PPM (P6) encoding of an (H, W, 3) uint8 array"""
+    height, width = rgb.shape[:2]
+    return b"P6 %d %d 255\n" % (width, height) + np.ascontiguousarray(rgb, dtype=np.uint8).tobytes()
+
+
+class DisplayScaler:
+    """LANCZOS downscale of a (partial) frame that reuses the horizontal pass of unchanged rows"""
+
+    def __init__(self):
+        self._key: Optional[Tuple] = None
+        self._source: Optional[np.ndarray] = None
+        self._rows: Optional[np.ndarray] = None  # Horizontally scaled rows of the complete frame
+
+    def scale(self, image: Image.Image, frame_height: int, display_size: Tuple[int, int]) -> Image.Image:
+        """
+        `image` holds the top rows of a frame_height-row frame; returns those
+        rows of the frame scaled to display_size, pixel-identical to the
+        matching rows of Image.resize(display_size, LANCZOS) on the complete frame.
+        """
+        display_width, display_height = display_size
+        key = (image.mode, image.width, frame_height, display_size)
+        if key != self._key or self._source is None or len(self._source) > image.height:
+            self._key = key
+            self._source = None
+            if image.height >= frame_height:
+                return image.resize(display_size, Image.Resampling.LANCZOS)  # Nothing to reuse
+            self._rows = np.zeros((frame_height, display_width, len(image.getbands())), dtype=np.uint8)
+        source = np.asarray(image)
+
+        # Only rows from the first change onwards need a new horizontal pass
+        first = 0
+        if self._source is not None:
+            overlap = len(self._source)
+            changed = np.flatnonzero(np.any((self._source != source[:overlap]).reshape(overlap, -1), axis=1))
+            first = int(changed[0]) if len(changed) else overlap
+        if first < len(source):
+            band = Image.fromarray(source[first:]).resize(
+                (display_width, len(source) - first), Image.Resampling.LANCZOS
+            )
+            self._rows[first:len(source)] = np.asarray(band)
+        self._source = source
+
+        # Vertical pass over the complete frame (rows not received yet are black)
+        scaled = Image.fromarray(self._rows).resize(display_size, Image.Resampling.LANCZOS)
+        return scaled.crop((0, 0, display_width, max(1, len(source) * display_height // frame_height)))
+
+
+class CanvasBlitter:
+    """A persistent canvas image item updated in place with only the changed regions"""
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.photo: Optional[tk.PhotoImage] = None
+        self.item: Optional[int] = None
+        self.stats = BlitStats()
+        self._shown: Optional[np.ndarray] = None
+
+    def reset(self):
+        """Forget the canvas item (after canvas.delete("all")) so the next show recreates it"""
+        self.item = None
+        self.photo = None
+        self._shown = None
+
+    def show(self, image: Image.Image, frame_size: Tuple[int, int], center: Tuple[int, int]) -> int:
+        """
+        Display `image` at the top of a frame_size backing image centred on
+        `center`; returns the number of pixels uploaded to Tk.
+        """
+        rgb = np.asarray(image.convert("RGB") if image.mode != "RGB" else image)
+        if self.photo is None or (self.photo.width(), self.photo.height()) != tuple(frame_size):
+            self.photo = tk.PhotoImage(master=self.canvas, width=frame_size[0], height=frame_size[1])
+            self._shown = None
+            if self.item is not None:
+                self.canvas.itemconfigure(self.item, image=self.photo)
+        if self.item is None:
+            self.item = self.canvas.create_image(*center, image=self.photo, anchor="center")
+        else:
+            self.canvas.coords(self.item, *center)
+
+        bbox = dirty_bbox(self._shown, rgb)
+        if bbox is None:
+            self.stats.unchanged += 1
+            return 0
+        if self._shown is not None and len(self._shown) > len(rgb):
+            self.photo.blank()  # A new frame started: drop the old frame's lower rows
+
+        left, top, right, bottom = bbox
+        self.photo.put(ppm_bytes(rgb[top:bottom, left:right]), to=(left, top))
+        if bbox == (0, 0, rgb.shape[1], rgb.shape[0]):
+            self.stats.full += 1
+        else:
+            self.stats.partial += 1
+        uploaded = (right - left) * (bottom - top)
+        self.stats.uploaded_pixels += uploaded
+        self._shown = rgb
+        return uploaded
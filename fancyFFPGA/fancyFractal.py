@@ -2,23 +2,71 @@ import os
 import sys
 import time
 import json
+import socket
 import logging
 import argparse
 import threading
+import tracemalloc
 from pathlib import Path
+from collections import deque, OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 from typing import Optional, Tuple, List, Dict, Any
 
 import numpy as np
 from PIL import Image, ImageTk, ImageDraw, ImageEnhance, ImageFilter
-from scipy import ndimage
 # O import de interp2d não é usado, pode ser removido para limpar o código.
 # from scipy.interpolate import interp2d 
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
+from frame_transport import ShmFrameConsumer
+from fractal_engine import (
+    MandelbrotEngine, ParallelMandelbrotEngine, SharedFrameBuffer, ViewPort, SAMPLE_FORMATS, shutdown_pools
+)
+from perturbation import PerturbationEngine, DeepViewPort, DEEP_ZOOM_THRESHOLD
+from palette_registry import PaletteRegistry, PaletteLUTs, GRADIENT_SUFFIXES
+from canvas_blit import CanvasBlitter, DisplayScaler
+from theme_pipeline import ThemePipeline
+from frame_stats import StreamingHistogram, histogram_of
+from session_checkpoint import SessionCheckpoint
+from frame_sequence import FrameRing, FRAME_MARKER_TEXT, FRAME_RING_SIZE, marker_splits
+from golden_compare import GoldenComparator, engine_reference, capture_reference, REFERENCE_ENGINE
+
+# Data sources with this prefix are read from a shared-memory frame segment
+SHM_SCHEME = "shm://"
+# Data sources with this prefix are little-endian uint16 streams over TCP
+TCP_SCHEME = "tcp://"
+# Files with these suffixes hold little-endian binary samples instead of text
+# (uint16, or float32 with --sample-format float32)
+BINARY_SUFFIXES = (".bin", ".raw", ".u16", ".f32")
+# Palette LUT entries for 10-bit samples and for smooth (uint16/float32) channels
+PALETTE_SIZE = 1024
+SMOOTH_PALETTE_SIZE = 4096
+# Canvas resizes are coalesced; the high-quality rescale runs once no resize
+# event arrived for this long
+RESIZE_SETTLE_MS = 150
+# Scaled display images kept per (image version, display size)
+DISPLAY_CACHE_SIZE = 4
+# Auto levels stretch these percentiles of the escaped samples to the ends of
+# the palette, with contrast and exposure kept within their slider ranges
+AUTO_LEVELS_PERCENTILES = (1.0, 99.0)
+AUTO_CONTRAST_RANGE = (0.5, 3.0)
+AUTO_EXPOSURE_RANGE = (0.1, 3.0)
+# Settings a resumed session takes from its checkpoint; the rest (workers,
+# filters, checkpointing itself) stay as configured for this run
+RESUMED_SETTINGS = ("width", "height", "sample_format", "smoothness", "contrast", "saturation",
+                    "exposure", "focus", "palette", "theme", "interpolation_method",
+                    "gamma_correction", "edge_enhancement", "auto_levels")
+
+
+def palette_indices(values: np.ndarray, top: int) -> np.ndarray:
+    """Palette LUT positions of normalized values; NaN maps to entry 0"""
+    return np.nan_to_num(np.clip(values * top, 0, top), nan=0.0).astype(int)
+
+
 # Configure modern appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -48,6 +96,9 @@ class IconProvider:
             "save_image": cls._create_save_image_icon,
             "view_log": cls._create_view_log_icon,
             "refresh": cls._create_refresh_icon,
+            "compute": cls._create_compute_icon,
+            "frames": cls._create_frames_icon,
+            "verify": cls._create_verify_icon,
         }
 
         creation_method = icon_creation_methods.get(name)
@@ -137,6 +188,29 @@ class IconProvider:
         draw.arc((padding, padding, size[0] - padding, size[1] - padding), start=30, end=300, fill="white", width=2)
         draw.polygon([(padding, size[1]//2), (padding+4, size[1]//2-4), (padding+4, size[1]//2+4)], fill="white")
 
+    @staticmethod
+    def _create_compute_icon(draw: ImageDraw.ImageDraw, size: Tuple[int, int]):
+        # Simple chip: square body with pins
+        draw.rectangle((5, 5, size[0] - 5, size[1] - 5), outline="white", width=1)
+        for offset in (8, size[0] // 2, size[0] - 8):
+            draw.line((offset, 2, offset, 5), fill="white", width=1)
+            draw.line((offset, size[1] - 5, offset, size[1] - 2), fill="white", width=1)
+
+    @staticmethod
+    def _create_frames_icon(draw: ImageDraw.ImageDraw, size: Tuple[int, int]):
+        # Film strip: frame outline with sprocket holes
+        draw.rectangle((3, 2, size[0] - 3, size[1] - 2), outline="white", width=1)
+        draw.line((3, size[1] // 2, size[0] - 3, size[1] // 2), fill="white", width=1)
+        for y in range(4, size[1] - 3, 4):
+            draw.point((5, y), fill="white")
+            draw.point((size[0] - 5, y), fill="white")
+
+    @staticmethod
+    def _create_verify_icon(draw: ImageDraw.ImageDraw, size: Tuple[int, int]):
+        # Check mark in a box
+        draw.rectangle((3, 3, size[0] - 3, size[1] - 3), outline="white", width=1)
+        draw.line((6, size[1] // 2, size[0] // 2 - 1, size[1] - 7, size[0] - 6, 6), fill="white", width=2)
+
 
 @dataclass
 class FractalSettings:
@@ -153,6 +227,32 @@ class FractalSettings:
     interpolation_method: str = "bicubic"
     gamma_correction: float = 0.8
     edge_enhancement: float = 0.3
+    center_x: float = -0.5
+    center_y: float = 0.0
+    zoom: float = 1.0
+    max_iter: int = 256
+    compute_workers: int = 0  # 0 = one per CPU
+    antialias_threshold: float = 0.0  # Sample step that triggers adaptive supersampling (0 = off)
+    sample_format: str = "int10"  # Ingest/compute channel, see SAMPLE_FORMATS
+    fast_filters: bool = True  # Specialized 3x3 median/max kernels instead of SciPy's generic filters
+    auto_levels: bool = False  # Derive contrast and exposure from the running frame statistics
+    checkpoint_interval: float = 5.0  # Seconds between checkpoints of file capture sessions (0 = off)
+    frame_ring_size: int = FRAME_RING_SIZE  # Finished frames kept for scrubbing (0 = none)
+    golden_tolerance: float = 0.0  # Difference from the golden reference still counted as a match (raw sample units)
+    diff_heatmap: bool = False  # Overlay the difference from the golden reference on the image
+    
+    @property
+    def golden_threshold(self) -> float:
+        """golden_tolerance in normalized units; integer samples match within half a step more"""
+        _, max_value = SAMPLE_FORMATS[self.sample_format]
+        if self.sample_format == "float32":
+            return self.golden_tolerance
+        return (self.golden_tolerance + 0.5) / max_value
+    
+    @property
+    def smooth_samples(self) -> bool:
+        """True for smooth iteration channels, which do not band"""
+        return self.sample_format != "int10"
 
 @dataclass
 class LogEntry:
@@ -163,26 +263,42 @@ class LogEntry:
     elapsed_time: float
     estimated_remaining: Optional[float] = None
 
+@dataclass
+class IngestStats:
+    """Ingest throughput and UI responsiveness counters"""
+    samples: int = 0
+    dropped_samples: int = 0
+    frames: int = 0               # Frames finished (full or cut short by a marker)
+    capture_restarts: int = 0     # Capture file truncated or replaced while being read
+    ui_updates: int = 0
+    coalesced_updates: int = 0
+    last_ui_latency: float = 0.0
+    max_ui_latency: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+    
+    @property
+    def samples_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.samples / elapsed if elapsed > 0 else 0.0
+
 class ColorPalette:
     """Advanced color palette generator for fractal visualization"""
     
+    BUILTIN = ("cosmic", "fire", "ocean", "aurora", "nebula", "solar", "ethereal", "mystic")
+    
     @staticmethod
     def generate_palette(name: str, size: int = 1024) -> np.ndarray:
         """Generate color palette with specified size"""
-        t = np.linspace(0, 1, size)
-        
-        palettes = {
-            "cosmic": ColorPalette._cosmic_palette(t),
-            "fire": ColorPalette._fire_palette(t),
-            "ocean": ColorPalette._ocean_palette(t),
-            "aurora": ColorPalette._aurora_palette(t),
-            "nebula": ColorPalette._nebula_palette(t),
-            "solar": ColorPalette._solar_palette(t),
-            "ethereal": ColorPalette._ethereal_palette(t),
-            "mystic": ColorPalette._mystic_palette(t)
-        }
-        
-        return palettes.get(name, palettes["cosmic"])
+        if name not in ColorPalette.BUILTIN:
+            name = "cosmic"
+        generator = getattr(ColorPalette, f"_{name}_palette")
+        return generator(np.linspace(0, 1, size))
+    
+    @staticmethod
+    def register_builtins(registry: PaletteRegistry):
+        """Add the built-in generators to a registry (evaluated on first use)"""
+        for name in ColorPalette.BUILTIN:
+            registry.register(name, getattr(ColorPalette, f"_{name}_palette"), replace=True)
     
     @staticmethod
     def _cosmic_palette(t):
@@ -249,113 +365,174 @@ class ColorPalette:
         return np.column_stack([r, g, b]).astype(np.uint8)
 
 class FractalTheme:
-    """Fractal interpretation themes"""
+    """Fractal interpretation themes, expressed as ThemePipeline stage graphs"""
     
     @staticmethod
-    def apply_theme(data: np.ndarray, theme: str, settings: FractalSettings) -> np.ndarray:
+    def apply_theme(data: np.ndarray, theme: str, settings: FractalSettings,
+                    histogram: Optional[StreamingHistogram] = None) -> np.ndarray:
         """Apply theme-specific transformations to fractal data"""
-        if theme == "classic":
-            return FractalTheme._classic_theme(data, settings)
-        elif theme == "smooth":
-            return FractalTheme._smooth_theme(data, settings)
-        elif theme == "dramatic":
-            return FractalTheme._dramatic_theme(data, settings)
-        elif theme == "organic":
-            return FractalTheme._organic_theme(data, settings)
-        elif theme == "crystalline":
-            return FractalTheme._crystalline_theme(data, settings)
-        elif theme == "ethereal":
-            return FractalTheme._ethereal_theme(data, settings)
-        else:
-            return data
+        if theme == "histogram" and histogram is None:
+            histogram = histogram_of(data)
+        pipeline = ThemePipeline()
+        return pipeline.run(data, FractalTheme.build(pipeline, pipeline.INPUT, theme, settings, histogram))
+    
+    @staticmethod
+    def build(pipeline: ThemePipeline, source: int, theme: str, settings: FractalSettings,
+              histogram: Optional[StreamingHistogram] = None) -> int:
+        """Add a theme's stages over `source`; unknown themes leave it unchanged"""
+        if theme == "histogram":
+            return FractalTheme._histogram_theme(pipeline, source, settings, histogram)
+        builder = FractalTheme.BUILDERS.get(theme)
+        return builder(pipeline, source, settings) if builder else source
     
     @staticmethod
-    def _classic_theme(data, settings):
+    def equalization_table(settings: FractalSettings, histogram: StreamingHistogram) -> np.ndarray:
+        """Histogram equalization as a table indexed like the current palette LUTs"""
+        size = SMOOTH_PALETTE_SIZE if settings.smooth_samples else PALETTE_SIZE
+        return histogram.equalization_table(size)
+    
+    @staticmethod
+    def point_enhancements_only(settings: FractalSettings) -> bool:
+        """True when the enhancement stages are all elementwise (no blur or unsharp mask)"""
+        return settings.smoothness <= 1.0 and settings.focus <= 1.0
+    
+    @staticmethod
+    def auto_levels(theme: str, settings: FractalSettings,
+                    histogram: StreamingHistogram) -> Optional[Tuple[float, float]]:
+        """
+        (contrast, exposure) stretching the AUTO_LEVELS_PERCENTILES of the
+        escaped samples, as the theme renders them, to 0 and 1; None before
+        any sample escaped. Themes are evaluated on a flat frame at each level
+        (every filter maps a constant to itself, edge detectors to zero), so
+        this costs two 1x1 pipeline runs.
+        """
+        levels = [histogram.percentile(q) for q in AUTO_LEVELS_PERCENTILES]
+        if any(np.isnan(level) for level in levels):
+            return None
+        low, high = (float(FractalTheme.apply_theme(np.full((1, 1), level, dtype=np.float32),
+                                                    theme, settings, histogram)[0, 0])
+                     for level in levels)
+        
+        # Enhancements compute (0.5 + (x - 0.5) * contrast) * exposure: contrast
+        # moves `low` to 0, exposure then moves `high` to 1, both within the slider ranges
+        contrast = 1.0 / (1.0 - 2.0 * low) if low < 0.5 else AUTO_CONTRAST_RANGE[1]
+        contrast = float(np.clip(contrast, *AUTO_CONTRAST_RANGE))
+        stretched = 0.5 + (high - 0.5) * contrast
+        exposure = 1.0 / stretched if stretched > 0 else AUTO_EXPOSURE_RANGE[1]
+        return contrast, float(np.clip(exposure, *AUTO_EXPOSURE_RANGE))
+    
+    @staticmethod
+    def enhancements(pipeline: ThemePipeline, source: int, settings: FractalSettings) -> int:
+        """Add the smoothness, contrast, exposure and focus stages over `source`"""
+        enhanced = source
+        if settings.smoothness > 1.0:
+            enhanced = pipeline.add("gaussian", enhanced, sigma=(settings.smoothness - 1.0) * 0.5)
+        enhanced = pipeline.add("contrast", enhanced, factor=settings.contrast)
+        enhanced = pipeline.add("scale", enhanced, factor=settings.exposure)
+        if settings.focus > 1.0:
+            blurred = pipeline.add("gaussian", enhanced, sigma=1.0)
+            enhanced = pipeline.add("unsharp", enhanced, blurred, strength=(settings.focus - 1.0) * 0.5)
+        return pipeline.add("clip", enhanced, low=0, high=1)
+    
+    @staticmethod
+    def _classic_theme(pipeline, data, settings):
         """Classic Mandelbrot interpretation"""
         # Apply gamma correction
-        enhanced = np.power(data, settings.gamma_correction)
+        enhanced = pipeline.add("power", data, exponent=settings.gamma_correction)
         
-        # Smooth transitions
-        if settings.smoothness > 1.0:
-            enhanced = ndimage.gaussian_filter(enhanced, sigma=settings.smoothness * 0.5)
+        # Smooth transitions (smooth iteration channels have no bands to hide)
+        if settings.smoothness > 1.0 and not settings.smooth_samples:
+            enhanced = pipeline.add("gaussian", enhanced, sigma=settings.smoothness * 0.5)
         
         return enhanced
     
     @staticmethod
-    def _smooth_theme(data, settings):
+    def _smooth_theme(pipeline, data, settings):
         """Ultra-smooth interpretation"""
-        # Heavy smoothing
-        smoothed = ndimage.gaussian_filter(data, sigma=settings.smoothness)
-        
-        # Blend with original
-        enhanced = 0.7 * smoothed + 0.3 * data
+        # Heavy smoothing, blended with original
+        smoothed = pipeline.add("gaussian", data, sigma=settings.smoothness)
+        enhanced = pipeline.add("blend", smoothed, data, weights=(0.7, 0.3))
         
         # Apply soft gamma
-        enhanced = np.power(enhanced, 0.9)
-        
-        return enhanced
+        return pipeline.add("power", enhanced, exponent=0.9)
     
     @staticmethod
-    def _dramatic_theme(data, settings):
+    def _dramatic_theme(pipeline, data, settings):
         """High contrast dramatic interpretation"""
         # Enhance edges
-        edges = ndimage.sobel(data)
-        enhanced = data + settings.edge_enhancement * edges
+        edges = pipeline.add("sobel", data)
+        enhanced = pipeline.add("blend", data, edges, weights=(1, settings.edge_enhancement))
         
-        # Strong gamma correction
-        enhanced = np.power(enhanced, 0.6)
+        # Strong gamma correction (negative edge responses would turn into NaN)
+        enhanced = pipeline.add("clip", enhanced, low=0, high=None)
+        enhanced = pipeline.add("power", enhanced, exponent=0.6)
         
         # Increase local contrast
-        enhanced = ndimage.rank_filter(enhanced, rank=4, size=3) * settings.contrast
+        if settings.fast_filters:
+            enhanced = pipeline.add("median3x3", enhanced)
+        else:
+            enhanced = pipeline.add("rank", enhanced, rank=4, size=3)
+        enhanced = pipeline.add("scale", enhanced, factor=settings.contrast)
         
-        return np.clip(enhanced, 0, 1)
+        return pipeline.add("clip", enhanced, low=0, high=1)
     
     @staticmethod
-    def _organic_theme(data, settings):
+    def _organic_theme(pipeline, data, settings):
         """Organic, flowing interpretation"""
         # Multiple scale smoothing
-        smooth1 = ndimage.gaussian_filter(data, sigma=0.5)
-        smooth2 = ndimage.gaussian_filter(data, sigma=2.0)
+        smooth1 = pipeline.add("gaussian", data, sigma=0.5)
+        smooth2 = pipeline.add("gaussian", data, sigma=2.0)
         
         # Combine scales
-        enhanced = 0.5 * smooth1 + 0.3 * smooth2 + 0.2 * data
+        enhanced = pipeline.add("blend", smooth1, smooth2, data, weights=(0.5, 0.3, 0.2))
         
         # Apply organic gamma curve
-        enhanced = np.power(enhanced, 0.85)
-        
-        return enhanced
+        return pipeline.add("power", enhanced, exponent=0.85)
     
     @staticmethod
-    def _crystalline_theme(data, settings):
+    def _crystalline_theme(pipeline, data, settings):
         """Sharp, crystalline interpretation"""
         # Edge enhancement
-        laplacian = ndimage.laplace(data)
-        enhanced = data - 0.2 * laplacian
+        laplacian = pipeline.add("laplace", data)
+        enhanced = pipeline.add("blend", data, laplacian, weights=(1, -0.2))
         
         # Sharpen
-        unsharp = data - ndimage.gaussian_filter(data, sigma=1.0)
-        enhanced = enhanced + 0.5 * unsharp
+        blurred = pipeline.add("gaussian", data, sigma=1.0)
+        unsharp = pipeline.add("blend", data, blurred, weights=(1, -1))
+        enhanced = pipeline.add("blend", enhanced, unsharp, weights=(1, 0.5))
         
         # Apply sharp gamma
-        enhanced = np.power(np.clip(enhanced, 0, 1), 0.7)
-        
-        return enhanced
+        enhanced = pipeline.add("clip", enhanced, low=0, high=1)
+        return pipeline.add("power", enhanced, exponent=0.7)
     
     @staticmethod
-    def _ethereal_theme(data, settings):
+    def _histogram_theme(pipeline, data, settings, histogram):
+        """Histogram-equalized interpretation: colors spread evenly over the escaped pixels"""
+        table = FractalTheme.equalization_table(settings, histogram)
+        return pipeline.add("lookup", data, table=table.tobytes())
+    
+    @staticmethod
+    def _ethereal_theme(pipeline, data, settings):
         """Ethereal, dreamy interpretation"""
         # Soft focus effect
-        blurred = ndimage.gaussian_filter(data, sigma=1.5)
-        enhanced = 0.8 * blurred + 0.2 * data
+        blurred = pipeline.add("gaussian", data, sigma=1.5)
+        enhanced = pipeline.add("blend", blurred, data, weights=(0.8, 0.2))
         
         # Add subtle glow
-        glow = ndimage.maximum_filter(enhanced, size=3)
-        enhanced = 0.9 * enhanced + 0.1 * glow
+        glow = pipeline.add("fast_maximum" if settings.fast_filters else "maximum", enhanced, size=3)
+        enhanced = pipeline.add("blend", enhanced, glow, weights=(0.9, 0.1))
         
         # Soft gamma
-        enhanced = np.power(enhanced, 1.1)
-        
-        return enhanced
+        return pipeline.add("power", enhanced, exponent=1.1)
+
+FractalTheme.BUILDERS = {
+    "classic": FractalTheme._classic_theme,
+    "smooth": FractalTheme._smooth_theme,
+    "dramatic": FractalTheme._dramatic_theme,
+    "organic": FractalTheme._organic_theme,
+    "crystalline": FractalTheme._crystalline_theme,
+    "ethereal": FractalTheme._ethereal_theme,
+}
 
 class LogManager:
     """Manages fractal generation logging and statistics"""
@@ -371,11 +548,12 @@ class LogManager:
         logger = logging.getLogger("FractalVisualizer")
         logger.setLevel(logging.INFO)
         
-        # File handler
-        handler = logging.FileHandler("fractal_app.log")
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        # File handler (once per process: several visualizers may share the logger)
+        if not logger.handlers:
+            handler = logging.FileHandler("fractal_app.log")
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
         
         return logger
     
@@ -385,6 +563,28 @@ class LogManager:
         self.current_session = []
         self.logger.info(f"Started fractal generation session: {width}x{height} ({total_pixels} pixels)")
     
+    def state(self) -> Dict[str, Any]:
+        """Session start and progress entries, as JSON-serializable values"""
+        return {
+            "session_start": self.session_start_time.isoformat() if self.session_start_time else None,
+            "entries": [
+                [e.timestamp.isoformat(), e.percentage, e.pixels_processed, e.elapsed_time, e.estimated_remaining]
+                for e in self.current_session
+            ],
+        }
+    
+    def restore(self, state: Dict[str, Any]):
+        """Continue a session saved with state()"""
+        start = state.get("session_start")
+        self.session_start_time = datetime.fromisoformat(start) if start else None
+        self.current_session = [
+            LogEntry(datetime.fromisoformat(timestamp), percentage, pixels, elapsed, remaining)
+            for timestamp, percentage, pixels, elapsed, remaining in state.get("entries", [])
+        ]
+        if self.current_session:
+            latest = self.current_session[-1]
+            self.logger.info(f"Resumed session at {latest.percentage:.1f}% ({latest.pixels_processed} pixels)")
+    
     def log_progress(self, percentage: float, pixels_processed: int):
         """Log progress milestone"""
         if not self.session_start_time:
@@ -431,6 +631,154 @@ class LogManager:
             "average_pixels_per_second": latest.pixels_processed / latest.elapsed_time if latest.elapsed_time > 0 else 0
         }
 
+@dataclass
+class StageRecord:
+    """One timed execution of a pipeline stage"""
+    name: str
+    start: float
+    duration: float = 0.0
+    bytes_allocated: int = 0
+    samples: int = 0
+    thread_id: int = 0
+    peak: int = 0
+    
+    def output(self, result):
+        """Count the stage result's size as the bytes it allocated"""
+        if isinstance(result, np.ndarray):
+            self.bytes_allocated = result.nbytes
+        elif isinstance(result, Image.Image):
+            self.bytes_allocated = result.width * result.height * len(result.getbands())
+        return result
+
+class StageProfiler:
+    """Per-stage wall time, allocation and throughput tracking with rolling percentiles"""
+    
+    def __init__(self, window: int = 200, trace_capacity: int = 50000):
+        self.window = window
+        self.records: Dict[str, deque] = {}
+        self.trace: deque = deque(maxlen=trace_capacity)
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._track_allocations = False
+    
+    @property
+    def track_allocations(self) -> bool:
+        return self._track_allocations
+    
+    @track_allocations.setter
+    def track_allocations(self, enabled: bool):
+        """Measure allocations with tracemalloc instead of output sizes"""
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._track_allocations = enabled
+    
+    @contextmanager
+    def stage(self, name: str, samples: int = 0):
+        """
+        Time a block of work. The yielded record's samples and bytes_allocated
+        may be filled in by the caller; with allocation tracking enabled the
+        tracemalloc peak over the block replaces bytes_allocated.
+
+        The tracemalloc peak is process-wide: while the ingest, compute or UI
+        threads run, a stage's bytes_allocated also counts what they allocated
+        during the block, and a stage starting in another thread resets the
+        peak. Per-stage figures are exact only while a single thread is
+        working; in the running app treat them as approximate.
+        """
+        record = StageRecord(name, time.perf_counter(), samples=samples, thread_id=threading.get_ident())
+        stack = self._local.__dict__.setdefault("stack", [])
+        tracking = self._track_allocations and tracemalloc.is_tracing()
+        if tracking:
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            stack.pop()
+            record.duration = time.perf_counter() - record.start
+            if tracking:
+                # Nested stages reset the peak, so fold their peaks back in
+                record.peak = max(record.peak, tracemalloc.get_traced_memory()[1])
+                record.bytes_allocated = max(0, record.peak - traced_start)
+                if stack:
+                    stack[-1].peak = max(stack[-1].peak, record.peak)
+            self._add(record)
+    
+    def _add(self, record: StageRecord):
+        with self._lock:
+            history = self.records.get(record.name)
+            if history is None:
+                history = self.records[record.name] = deque(maxlen=self.window)
+            history.append(record)
+            self.trace.append(record)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rolling percentiles per stage over the last `window` executions"""
+        with self._lock:
+            snapshot = {name: list(history) for name, history in self.records.items()}
+        
+        summary = {}
+        for name, history in snapshot.items():
+            durations = np.array([r.duration for r in history])
+            total_samples = sum(r.samples for r in history)
+            total_time = float(durations.sum())
+            summary[name] = {
+                "count": len(history),
+                "p50_ms": float(np.percentile(durations, 50)) * 1000,
+                "p95_ms": float(np.percentile(durations, 95)) * 1000,
+                "max_ms": float(durations.max()) * 1000,
+                "mean_bytes": float(np.mean([r.bytes_allocated for r in history])),
+                "samples_per_second": total_samples / total_time if total_samples and total_time > 0 else 0.0,
+            }
+        return summary
+    
+    def format_summary(self) -> str:
+        """Table of stage percentiles for the log window"""
+        summary = self.summary()
+        if not summary:
+            return "No pipeline timings recorded yet."
+        
+        lines = [f"{'Stage':<22}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'MB':>9}{'Msamp/s':>10}"]
+        for name, stats in sorted(summary.items()):
+            rate = f"{stats['samples_per_second'] / 1e6:10.2f}" if stats['samples_per_second'] else f"{'-':>10}"
+            lines.append(
+                f"{name:<22}{stats['count']:>6}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                f"{stats['max_ms']:>10.2f}{stats['mean_bytes'] / 2**20:>9.1f}{rate}"
+            )
+        return "\n".join(lines)
+    
+    def status_text(self, limit: int = 3) -> str:
+        """Compact 'slowest stages' line for the status bar"""
+        summary = self.summary()
+        slowest = sorted(summary.items(), key=lambda item: item[1]["p50_ms"], reverse=True)[:limit]
+        return " • ".join(f"{name} {stats['p50_ms']:.0f}ms" for name, stats in slowest)
+    
+    def export_chrome_trace(self, path: str):
+        """Write recorded stages as Chrome trace-format JSON (chrome://tracing, Perfetto)"""
+        with self._lock:
+            records = list(self.trace)
+        
+        pid = os.getpid()
+        events = [
+            {
+                "name": r.name,
+                "cat": r.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (r.start - self.origin) * 1e6,
+                "dur": r.duration * 1e6,
+                "pid": pid,
+                "tid": r.thread_id,
+                "args": {"bytes_allocated": r.bytes_allocated, "samples": r.samples},
+            }
+            for r in records
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
 class EnhancedFractalVisualizer:
     """Modern, minimalist fractal visualizer with advanced rendering"""
     
@@ -458,39 +806,121 @@ class EnhancedFractalVisualizer:
         ("Custom", 0, 0)
     ]
     
-    def __init__(self, data_file_path: str):
+    def __init__(self, data_file_path: str, resume: bool = True,
+                 settings: Optional[FractalSettings] = None, pinned_settings: Tuple[str, ...] = ()):
+        """
+        `settings` is in effect before a checkpoint is resumed and the source
+        is read; a checkpoint never overrides the `pinned_settings` among them
+        """
         self.data_file_path = Path(data_file_path)
-        self.settings = FractalSettings()
+        self.shm_name: Optional[str] = (
+            data_file_path[len(SHM_SCHEME):] if data_file_path.startswith(SHM_SCHEME) else None
+        )
+        self.shm_consumer: Optional[ShmFrameConsumer] = None
+        self.tcp_address: Optional[Tuple[str, int]] = self._parse_tcp_address(data_file_path)
+        self.tcp_socket: Optional[socket.socket] = None
+        self.tcp_pending = b""
+        self.settings = settings or FractalSettings()
+        self.pinned_settings = pinned_settings
         self.log_manager = LogManager()
+        self.profiler = StageProfiler()
         
         # Core data
         self.fractal_data: Optional[np.ndarray] = None
         self.processed_image: Optional[Image.Image] = None
+        self.image_version = 0  # Incremented whenever processed_image changes
+        self.frame_histogram = StreamingHistogram()  # Updated per ingested chunk
+        self.equalized_lut: Optional[np.ndarray] = None
+        self.equalized_lut_key: Optional[Tuple] = None
+        self.auto_levels_key: Optional[Tuple] = None
+        self.display_cache: "OrderedDict[Tuple[int, Tuple[int, int]], Image.Image]" = OrderedDict()
         self.pixels_read = 0
         self.total_pixels = 0
         self.file_position = 0
+        self.checkpoint: Optional[SessionCheckpoint] = None  # Backs fractal_data for file captures
+        self.capture_identity: Optional[Tuple[int, int]] = None  # (st_dev, st_ino) of the capture being read
+        self.frame_ring = FrameRing(self.settings.frame_ring_size)  # Recent finished frames
+        self.golden: Optional[GoldenComparator] = None  # Reference the ingested frame is compared with
+        self.golden_source: Optional[str] = None  # "engine" or the reference capture's path
         self.last_update_time = 0
+        self.ingest_stats = IngestStats()
+        self.ui_update_requested_at: Optional[float] = None
         
         # Threading
         self.running = True
         self.file_monitor_thread: Optional[threading.Thread] = None
         
+        # Software rendering (no-hardware mode)
+        self.software_mode = False
+        self.compute_engine: Optional[MandelbrotEngine] = None
+        self.compute_thread: Optional[threading.Thread] = None
+        self.shared_frame: Optional[SharedFrameBuffer] = None
+        self.compute_center: Optional[Tuple[str, str]] = None  # Exact centre text for deep zooms
+        self.compute_format: Optional[str] = None  # Sample format the compute engine rendered for
+        
         # UI Components
         self.root: Optional[ctk.CTk] = None
         self.canvas: Optional[tk.Canvas] = None
-        self.tk_image: Optional[ImageTk.PhotoImage] = None
+        self.canvas_blitter: Optional[CanvasBlitter] = None  # Persistent image item, dirty-region updates
+        self.display_scaler = DisplayScaler()
+        self.interactive_resize = False  # Window edge being dragged: use the fast preview scaling
+        self.resize_preview_pending = False
+        self.resize_settle_id: Optional[str] = None
+        self.palette_menu: Optional[ctk.CTkOptionMenu] = None
         self.placeholder_tk_icon: Optional[ImageTk.PhotoImage] = None
 
-        # Color palettes (1024 values for 0-1023 range)
+        # Color palettes (1024 values for 10-bit samples, more for smooth channels),
+        # each generated the first time it is shown
+        self.palette_registry = PaletteRegistry()
+        ColorPalette.register_builtins(self.palette_registry)
         self.color_palettes = self._initialize_palettes()
         
         self._setup_ui()
+        if resume:
+            self._resume_session()
         self._start_file_monitoring()
     
-    def _initialize_palettes(self) -> Dict[str, np.ndarray]:
-        """Initialize color palettes with 1024 values"""
-        palette_names = ["cosmic", "fire", "ocean", "aurora", "nebula", "solar", "ethereal", "mystic"]
-        return {name: ColorPalette.generate_palette(name, 1024) for name in palette_names}
+    @staticmethod
+    def _parse_tcp_address(source: str) -> Optional[Tuple[str, int]]:
+        """Parse tcp://host:port into an address tuple"""
+        if not source.startswith(TCP_SCHEME):
+            return None
+        host, _, port = source[len(TCP_SCHEME):].rpartition(":")
+        return (host or "127.0.0.1", int(port))
+    
+    def _initialize_palettes(self) -> PaletteLUTs:
+        """Palette LUTs sized for the sample channel (built lazily by the registry)"""
+        size = SMOOTH_PALETTE_SIZE if self.settings.smooth_samples else PALETTE_SIZE
+        return self.palette_registry.view(size)
+    
+    def _register_palette_file(self, path: str, select: bool = False) -> Optional[str]:
+        """Add a gradient file to the palette menu"""
+        try:
+            name = self.palette_registry.register_file(path, replace=True)
+            # Parse now so a broken file is reported here rather than mid-render
+            self.color_palettes[name]
+        except Exception as e:
+            self.log_manager.logger.error(f"Error loading palette {path}: {e}")
+            return None
+        if self.palette_menu is not None:
+            self.palette_menu.configure(values=list(self.color_palettes.keys()))
+        self.log_manager.logger.info(f"Palette '{name}' loaded from {path}")
+        if select:
+            self.palette_var.set(name)
+            self._on_palette_change(name)
+        return name
+    
+    def _set_sample_format(self, sample_format: str):
+        """Switch the ingest/compute sample channel and resize the palettes to match"""
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unknown sample format: {sample_format}")
+        self.settings.sample_format = sample_format
+        self.color_palettes = self._initialize_palettes()
+        self.log_manager.logger.info(
+            f"Sample format: {sample_format} ({self.color_palettes.size}-entry palettes)"
+        )
+        if self.golden_source is not None:
+            self._set_reference(self.golden_source)  # Same reference, decoded as the new format
     
     def _setup_ui(self):
         """Setup modern, minimalist UI"""
@@ -544,12 +974,21 @@ class EnhancedFractalVisualizer:
         # Dimensions Section
         self._create_dimensions_section(sidebar)
         
+        # Compute Section
+        self._create_compute_section(sidebar)
+        
         # Rendering Section
         self._create_rendering_section(sidebar)
         
         # Enhancement Section
         self._create_enhancement_section(sidebar)
         
+        # Frames Section
+        self._create_frames_section(sidebar)
+        
+        # Verification Section
+        self._create_verification_section(sidebar)
+        
         # Actions Section
         self._create_actions_section(sidebar)
     
@@ -609,6 +1048,42 @@ class EnhancedFractalVisualizer:
         )
         apply_btn.grid(row=0, column=3, padx=(5, 10), pady=10)
     
+    def _create_compute_section(self, parent):
+        """Create software compute controls section"""
+        section = self._create_section(parent, "Compute", "Built-in escape-time renderer", "compute")
+        
+        inputs_frame = ctk.CTkFrame(section, fg_color=self.COLORS['bg_tertiary'])
+        inputs_frame.pack(fill="x", pady=(10, 0))
+        inputs_frame.grid_columnconfigure((1, 3), weight=1)
+        
+        fields = [
+            ("Center X", "center_x", 0, 0),
+            ("Center Y", "center_y", 0, 2),
+            ("Zoom", "zoom", 1, 0),
+            ("Max Iter", "max_iter", 1, 2),
+        ]
+        
+        self.compute_entries = {}
+        for label, attr, row, column in fields:
+            ctk.CTkLabel(
+                inputs_frame,
+                text=label,
+                font=ctk.CTkFont(size=12)
+            ).grid(row=row, column=column, padx=(10, 5), pady=8, sticky="w")
+            
+            entry = ctk.CTkEntry(inputs_frame, width=80, font=ctk.CTkFont(size=12))
+            entry.insert(0, str(getattr(self.settings, attr)))
+            entry.grid(row=row, column=column + 1, padx=(0, 10), pady=8, sticky="ew")
+            self.compute_entries[attr] = entry
+        
+        generate_btn = ctk.CTkButton(
+            inputs_frame,
+            text="Generate",
+            command=self._generate_fractal,
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        generate_btn.grid(row=2, column=0, columnspan=4, padx=10, pady=(5, 10), sticky="ew")
+    
     def _create_rendering_section(self, parent):
         """Create rendering controls section"""
         section = self._create_section(parent, "Rendering", "Fractal interpretation settings", "rendering")
@@ -627,7 +1102,7 @@ class EnhancedFractalVisualizer:
         theme_menu = ctk.CTkOptionMenu(
             theme_frame,
             variable=self.theme_var,
-            values=["classic", "smooth", "dramatic", "organic", "crystalline", "ethereal"],
+            values=["classic", "smooth", "dramatic", "organic", "crystalline", "ethereal", "histogram"],
             command=self._on_theme_change,
             font=ctk.CTkFont(size=12)
         )
@@ -641,14 +1116,21 @@ class EnhancedFractalVisualizer:
         ).pack(pady=(10, 5))
         
         self.palette_var = ctk.StringVar(value=self.settings.palette)
-        palette_menu = ctk.CTkOptionMenu(
+        self.palette_menu = ctk.CTkOptionMenu(
             theme_frame,
             variable=self.palette_var,
             values=list(self.color_palettes.keys()),
             command=self._on_palette_change,
             font=ctk.CTkFont(size=12)
         )
-        palette_menu.pack(pady=(0, 10), padx=10, fill="x")
+        self.palette_menu.pack(pady=(0, 5), padx=10, fill="x")
+        
+        ctk.CTkButton(
+            theme_frame,
+            text="Load Gradient...",
+            command=self._open_palette_file,
+            font=ctk.CTkFont(size=12)
+        ).pack(pady=(0, 10), padx=10, fill="x")
     
     def _create_enhancement_section(self, parent):
         """Create enhancement controls section"""
@@ -668,6 +1150,17 @@ class EnhancedFractalVisualizer:
         ]
         
         self.control_vars = {}
+        self.control_labels = {}
+        
+        # Auto levels: contrast and exposure follow the frame statistics
+        self.auto_levels_var = ctk.BooleanVar(value=self.settings.auto_levels)
+        ctk.CTkSwitch(
+            controls_frame,
+            text="Auto Levels",
+            variable=self.auto_levels_var,
+            command=self._on_auto_levels_change,
+            font=ctk.CTkFont(size=12, weight="bold")
+        ).pack(anchor="w", padx=10, pady=(10, 0))
         
         for label, attr, min_val, max_val, default in controls:
             # Create control frame
@@ -695,6 +1188,7 @@ class EnhancedFractalVisualizer:
                 text_color=self.COLORS['text_muted']
             )
             value_label.pack(side="right")
+            self.control_labels[attr] = value_label
             
             # Slider
             slider = ctk.CTkSlider(
@@ -706,6 +1200,77 @@ class EnhancedFractalVisualizer:
             )
             slider.pack(fill="x", pady=(5, 0))
     
+    def _create_frames_section(self, parent):
+        """Create frame sequence scrubbing section"""
+        section = self._create_section(parent, "Frames", "Recent frames of the stream", "frames")
+        
+        frames_frame = ctk.CTkFrame(section, fg_color=self.COLORS['bg_tertiary'])
+        frames_frame.pack(fill="x", pady=(10, 0))
+        
+        self.frame_label = ctk.CTkLabel(
+            frames_frame,
+            text="Live",
+            font=ctk.CTkFont(size=12)
+        )
+        self.frame_label.pack(pady=(10, 5))
+        
+        # One position per ring frame, the last one is the live frame
+        self.frame_slider = ctk.CTkSlider(
+            frames_frame,
+            from_=0,
+            to=1,
+            number_of_steps=1,
+            command=self._on_frame_scrub
+        )
+        self.frame_slider.pack(fill="x", padx=10, pady=(0, 5))
+        self.frame_slider.set(1)
+        self.frame_slider.configure(state="disabled")
+        
+        ctk.CTkButton(
+            frames_frame,
+            text="Live",
+            command=self._show_live_frame,
+            font=ctk.CTkFont(size=12)
+        ).pack(pady=(0, 10), padx=10, fill="x")
+    
+    def _create_verification_section(self, parent):
+        """Create golden reference comparison section"""
+        section = self._create_section(parent, "Verification", "Compare against a golden reference", "verify")
+        
+        verify_frame = ctk.CTkFrame(section, fg_color=self.COLORS['bg_tertiary'])
+        verify_frame.pack(fill="x", pady=(10, 0))
+        
+        self.golden_label = ctk.CTkLabel(
+            verify_frame,
+            text="No reference",
+            font=ctk.CTkFont(size=12),
+            wraplength=300,
+            justify="left"
+        )
+        self.golden_label.pack(pady=(10, 5), padx=10, anchor="w")
+        
+        self.diff_heatmap_var = ctk.BooleanVar(value=self.settings.diff_heatmap)
+        ctk.CTkSwitch(
+            verify_frame,
+            text="Diff Heatmap",
+            variable=self.diff_heatmap_var,
+            command=self._on_diff_heatmap_change,
+            font=ctk.CTkFont(size=12, weight="bold")
+        ).pack(anchor="w", padx=10, pady=5)
+        
+        buttons = [
+            ("Engine Reference", lambda: self._set_reference(REFERENCE_ENGINE)),
+            ("Load Reference...", self._open_reference),
+            ("Clear Reference", self._clear_reference)
+        ]
+        for text, command in buttons:
+            ctk.CTkButton(
+                verify_frame,
+                text=text,
+                command=command,
+                font=ctk.CTkFont(size=12)
+            ).pack(pady=(0, 5), padx=10, fill="x")
+    
     def _create_actions_section(self, parent):
         """Create action buttons section"""
         section = self._create_section(parent, "Actions", "File operations and utilities", "actions")
@@ -771,6 +1336,7 @@ class EnhancedFractalVisualizer:
         )
         self.canvas.grid(row=0, column=0, sticky="nsew", padx=15, pady=15)
         self.canvas.bind('<Configure>', self._on_canvas_resize)
+        self.canvas_blitter = CanvasBlitter(self.canvas)
         
         # Initial placeholder
         self.root.after_idle(self._show_placeholder)
@@ -802,6 +1368,15 @@ class EnhancedFractalVisualizer:
             text_color=self.COLORS['text_muted']
         )
         self.file_info_label.pack(side="right", padx=15, pady=10)
+        
+        # Slowest pipeline stages (rolling p50)
+        self.perf_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=self.COLORS['text_muted']
+        )
+        self.perf_label.pack(side="right", padx=15, pady=10)
     
     def _create_section(self, parent, title: str, description: str, icon_name: str) -> ctk.CTkFrame:
         """Create a UI section with title, description, and an icon"""
@@ -862,6 +1437,7 @@ class EnhancedFractalVisualizer:
     def _show_placeholder(self):
         """Show placeholder when no fractal is loaded"""
         self.canvas.delete("all")
+        self.canvas_blitter.reset()
         
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
@@ -900,13 +1476,28 @@ class EnhancedFractalVisualizer:
         """Monitor data file for new pixel data"""
         while self.running:
             try:
-                if self.data_file_path.exists():
-                    self._read_file_data()
+                self._poll_source()
                 time.sleep(0.05)
             except Exception as e:
                 self.log_manager.logger.error(f"File monitoring error: {e}")
                 time.sleep(0.5)
     
+    def _poll_source(self):
+        """Ingest whatever the source has made available since the last poll"""
+        if self.software_mode:
+            pass  # Frames come from the compute engine
+        elif self.shm_name:
+            self._read_shm_frame()
+        elif self.tcp_address:
+            self._read_socket_data()
+        elif self.data_file_path.exists():
+            self._check_capture_rotation()
+            if self.data_file_path.suffix.lower() in BINARY_SUFFIXES:
+                self._read_binary_data()
+            else:
+                self._read_file_data()
+            self._checkpoint_if_due()
+    
     def _read_file_data(self):
         """Lê novas linhas de dados do arquivo."""
         try:
@@ -916,52 +1507,364 @@ class EnhancedFractalVisualizer:
                 new_lines = f.readlines()
                 
                 if new_lines:
-                    new_values = []
-                    for line in new_lines:
-                        line = line.strip()
-                        if line and line.isdigit():
-                            value = int(line)
-                            if 0 <= value <= 1023:
-                                new_values.append(value / 1023.0)
+                    with self.profiler.stage("ingest.parse_text") as record:
+                        # Values between frame markers, one list per frame segment
+                        new_values = []
+                        segments = [new_values]
+                        _, max_value = SAMPLE_FORMATS[self.settings.sample_format]
+                        if self.settings.sample_format == "float32":
+                            for line in new_lines:
+                                try:
+                                    value = float(line)
+                                except ValueError:
+                                    if line.strip() == FRAME_MARKER_TEXT:
+                                        new_values = []
+                                        segments.append(new_values)
+                                    continue
+                                if 0.0 <= value <= 1.0:
+                                    new_values.append(value)
+                        else:
+                            for line in new_lines:
+                                line = line.strip()
+                                if line and line.isdigit():
+                                    value = int(line)
+                                    if 0 <= value <= max_value:
+                                        new_values.append(value / max_value)
+                                elif line == FRAME_MARKER_TEXT:
+                                    new_values = []
+                                    segments.append(new_values)
+                        record.samples = sum(len(values) for values in segments)
                     
-                    if new_values:
-                        self._process_new_pixels(new_values)
+                    for index, values in enumerate(segments):
+                        if index:
+                            self._frame_marker()
+                        if values:
+                            self._process_new_pixels(values)
                     
                     self.file_position = f.tell()
                     
         except Exception as e:
             self.log_manager.logger.error(f"Erro ao ler os dados do arquivo: {e}")
     
-    def _process_new_pixels(self, values: List[float]):
-        """Process new pixel values"""
-        if self.fractal_data is None:
+    def _read_binary_data(self):
+        """Read new little-endian samples (uint16 or float32) from a binary capture"""
+        try:
+            with open(self.data_file_path, 'rb') as f:
+                f.seek(self.file_position)
+                data = f.read()
+            
+            # A writer may be mid-sample; leave a trailing partial sample for next time
+            dtype = np.dtype(SAMPLE_FORMATS[self.settings.sample_format][0])
+            usable = len(data) - len(data) % dtype.itemsize
+            if usable:
+                self.file_position += usable
+                self._ingest_samples(np.frombuffer(data, dtype=dtype, count=usable // dtype.itemsize))
+                
+        except Exception as e:
+            self.log_manager.logger.error(f"Error reading binary data: {e}")
+    
+    def _read_socket_data(self):
+        """Receive little-endian samples (uint16 or float32) from a TCP stream"""
+        if self.tcp_socket is None:
+            try:
+                self.tcp_socket = socket.create_connection(self.tcp_address, timeout=1.0)
+                self.tcp_socket.settimeout(0.05)
+                self.tcp_pending = b""
+                self.log_manager.logger.info(f"Connected to {TCP_SCHEME}{self.tcp_address[0]}:{self.tcp_address[1]}")
+            except OSError:
+                time.sleep(0.5)  # Stream not up yet
+                return
+        
+        chunks = [self.tcp_pending]
+        try:
+            while True:
+                chunk = self.tcp_socket.recv(1 << 20)
+                if not chunk:
+                    self.log_manager.logger.info("TCP stream closed by peer")
+                    self.tcp_socket.close()
+                    self.tcp_socket = None
+                    break
+                chunks.append(chunk)
+        except socket.timeout:
+            pass
+        
+        data = b"".join(chunks)
+        dtype = np.dtype(SAMPLE_FORMATS[self.settings.sample_format][0])
+        usable = len(data) - len(data) % dtype.itemsize
+        self.tcp_pending = data[usable:]
+        if usable:
+            self._ingest_samples(np.frombuffer(data, dtype=dtype, count=usable // dtype.itemsize))
+    
+    def _ingest_samples(self, samples: np.ndarray):
+        """Split raw samples of the current format at frame markers and ingest each run"""
+        for index, run in enumerate(marker_splits(samples, self.settings.sample_format)):
+            if index:
+                self._frame_marker()
+            if run.size:
+                self._ingest_run(run)
+    
+    def _ingest_run(self, samples: np.ndarray):
+        """Normalize raw samples of the current format and feed them to the frame buffer"""
+        _, max_value = SAMPLE_FORMATS[self.settings.sample_format]
+        with self.profiler.stage("ingest.decode", samples.size) as record:
+            # Also rejects NaN and negative float samples
+            valid = (samples >= 0) & (samples <= max_value)
+            if not valid.all():
+                self.ingest_stats.dropped_samples += int(np.count_nonzero(~valid))
+                samples = samples[valid]
+            if samples.dtype == np.float32:
+                values = record.output(samples.astype(np.float32))
+            else:
+                values = record.output(samples.astype(np.float32) / max_value)
+        if values.size:
+            self._process_new_pixels(values)
+    
+    def _read_shm_frame(self):
+        """Pick up rows published in the shared-memory frame segment"""
+        if self.shm_consumer is None:
+            try:
+                self.shm_consumer = ShmFrameConsumer(self.shm_name)
+            except FileNotFoundError:
+                return  # Producer has not created the segment yet
+        
+        progress = self.shm_consumer.poll()
+        if progress is None:
+            return
+        
+        first_row, rows_complete, new_frame = progress
+        header = self.shm_consumer.header
+        if new_frame and self.fractal_data is not None and self.pixels_read:
+            self._finish_frame()
+        if (new_frame or self.fractal_data is None
+                or (header.width, header.height) != (self.settings.width, self.settings.height)):
+            self.settings.width = header.width
+            self.settings.height = header.height
             self._initialize_fractal_data()
         
-        for value in values:
-            if self.pixels_read >= self.total_pixels:
-                break
-            
-            y, x = divmod(self.pixels_read, self.settings.width)
-            if y < self.settings.height:
-                self.fractal_data[y, x] = value
-                self.pixels_read += 1
+        # Samples are a zero-copy view; only the new rows are normalized
+        with self.profiler.stage("ingest.shm_rows", (rows_complete - first_row) * header.width):
+            np.multiply(
+                self.shm_consumer.samples[first_row:rows_complete],
+                self.shm_consumer.scale,
+                out=self.fractal_data[first_row:rows_complete],
+                casting='unsafe'
+            )
+            self.frame_histogram.add(self.fractal_data[first_row:rows_complete])
+        self.pixels_read = rows_complete * header.width
+        self._compare_ingested()
+        self.ingest_stats.samples += (rows_complete - first_row) * header.width
+        self._schedule_ui_update()
+    
+    def _process_new_pixels(self, values):
+        """Process new pixel values (list or array of normalized samples)"""
+        if self.fractal_data is None:
+            self._initialize_fractal_data()
         
+        with self.profiler.stage("ingest.store") as record:
+            values = np.asarray(values, dtype=np.float32)
+            stored = 0
+            while stored < values.size:
+                if self.pixels_read >= self.total_pixels:
+                    self._start_next_frame()  # Samples past a full frame begin the next one
+                count = min(values.size - stored, self.total_pixels - self.pixels_read)
+                # Row-major frame: consecutive samples fill a contiguous flat range
+                flat = self.fractal_data.reshape(-1)
+                flat[self.pixels_read:self.pixels_read + count] = values[stored:stored + count]
+                self.frame_histogram.add(values[stored:stored + count])
+                self.pixels_read += count
+                stored += count
+                self._compare_ingested()
+            record.samples = stored
+        
+        self.ingest_stats.samples += stored
+        self._schedule_ui_update()
+    
+    def _compare_ingested(self):
+        """Compare the samples ingested since the last call with the golden reference"""
+        golden = self.golden
+        if golden is None or golden.shape != self.fractal_data.shape:
+            return
+        with self.profiler.stage("verify.compare") as record:
+            record.samples = golden.advance(self.fractal_data, self.pixels_read)
+    
+    def _frame_marker(self):
+        """A frame marker in the stream: the next sample starts a new frame"""
+        if self.fractal_data is not None and self.pixels_read:
+            self._start_next_frame()
+    
+    def _finish_frame(self):
+        """Keep the live frame in the frame ring"""
+        if self.pixels_read < self.total_pixels:
+            self.log_manager.logger.warning(
+                f"Frame {self.frame_ring.next_sequence + 1} cut short at "
+                f"{self.pixels_read:,}/{self.total_pixels:,} pixels"
+            )
+        with self.profiler.stage("ingest.frame_ring", self.fractal_data.size):
+            self.frame_ring.push(self.fractal_data, self.pixels_read, self._live_histogram())
+        golden = self.golden
+        if golden is not None and golden.stats.compared:
+            _, max_value = SAMPLE_FORMATS[self.settings.sample_format]
+            self.log_manager.logger.info(f"Frame {self.frame_ring.next_sequence}: {golden.summary(max_value)}")
+            golden.reset()
+        self.ingest_stats.frames += 1
+    
+    def _start_next_frame(self):
+        """Finish the live frame and reuse its buffer for the next frame of the stream"""
+        self._finish_frame()
+        if self.checkpoint is not None:
+            # The saved state describes the frame being cleared: a crash before
+            # the next save must restart from the beginning, not resume into
+            # the new frame's samples
+            try:
+                self.checkpoint.drop_state()
+            except OSError as e:
+                self.log_manager.logger.error(f"Error dropping checkpoint {self.checkpoint.state_path}: {e}")
+        self.fractal_data.fill(0)
+        self.pixels_read = 0
+        self.frame_histogram.reset()
+        self.log_manager.start_session(self.settings.width, self.settings.height, self.total_pixels)
+    
+    def _check_capture_rotation(self):
+        """Detect the capture file being truncated or replaced; its new data starts a new frame"""
+        stat = self.data_file_path.stat()
+        identity = (stat.st_dev, stat.st_ino)
+        if self.capture_identity is not None:
+            replaced = identity != self.capture_identity
+            if replaced or stat.st_size < self.file_position:
+                self.log_manager.logger.warning(
+                    f"Capture {self.data_file_path.name} {'replaced' if replaced else 'truncated'} "
+                    f"after {self.file_position:,} bytes; reading it from the start as a new frame"
+                )
+                self.ingest_stats.capture_restarts += 1
+                self.file_position = 0
+                self._frame_marker()
+        self.capture_identity = identity
+    
+    def _schedule_ui_update(self):
+        """Queue a UI refresh, throttled to one every 100 ms"""
         current_time = time.time()
         if current_time - self.last_update_time > 0.1:
+            if self.ui_update_requested_at is None:
+                self.ui_update_requested_at = time.perf_counter()
             self.root.after_idle(self._update_ui)
             self.last_update_time = current_time
+        else:
+            self.ingest_stats.coalesced_updates += 1
     
     def _initialize_fractal_data(self):
         """Initialize fractal data array"""
         self.total_pixels = self.settings.width * self.settings.height
-        self.fractal_data = np.zeros((self.settings.height, self.settings.width), dtype=np.float32)
+        self.fractal_data = self._new_frame_buffer((self.settings.height, self.settings.width))
         self.pixels_read = 0
+        self.frame_histogram.reset()
         
         self.log_manager.start_session(self.settings.width, self.settings.height, self.total_pixels)
         self._update_status("Processing fractal data...")
     
+    def _checkpointable(self) -> bool:
+        """True when the source is a capture file, which a checkpoint can resume"""
+        return (self.settings.checkpoint_interval > 0 and not self.software_mode
+                and self.shm_name is None and self.tcp_address is None)
+    
+    def _new_frame_buffer(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Zeroed frame buffer, mapped from the session checkpoint for capture files"""
+        self.checkpoint = None
+        if self._checkpointable():
+            checkpoint = SessionCheckpoint(self.data_file_path)
+            try:
+                frame = checkpoint.create_frame(shape)
+                self.checkpoint = checkpoint
+                return frame
+            except OSError as e:
+                self.log_manager.logger.error(f"Checkpointing disabled, cannot create {checkpoint.frame_path}: {e}")
+        return np.zeros(shape, dtype=np.float32)
+    
+    def _checkpoint_if_due(self):
+        """Save the session checkpoint every checkpoint_interval seconds (called by the ingest thread)"""
+        if (self.checkpoint is not None and self.fractal_data is not None
+                and self.checkpoint.due(self.settings.checkpoint_interval, self.file_position, self.pixels_read)):
+            self._save_checkpoint()
+    
+    def _save_checkpoint(self):
+        """Flush the mapped frame and record where ingest stands"""
+        try:
+            with self.profiler.stage("checkpoint.save", self.pixels_read):
+                self.checkpoint.save(
+                    self.fractal_data, self.file_position, self.pixels_read,
+                    asdict(self.settings), self.log_manager.state()
+                )
+        except Exception as e:
+            self.log_manager.logger.error(f"Error saving checkpoint: {e}")
+    
+    def _resume_session(self) -> bool:
+        """Continue from the capture's checkpoint if it still matches the file"""
+        if not self._checkpointable():
+            return False
+        checkpoint = SessionCheckpoint(self.data_file_path)
+        try:
+            loaded = checkpoint.load()
+        except Exception as e:
+            self.log_manager.logger.error(f"Ignoring unreadable checkpoint {checkpoint.state_path}: {e}")
+            loaded = None
+        if loaded is None:
+            checkpoint.discard()  # Missing, or taken from a capture that has since changed
+            return False
+        state, frame = loaded
+        
+        resumed_format = state.settings.get("sample_format", self.settings.sample_format)
+        if "sample_format" in self.pinned_settings and resumed_format != self.settings.sample_format:
+            # The checkpointed samples were decoded as another format
+            self.log_manager.logger.info(
+                f"Checkpoint of {self.data_file_path.name} holds {resumed_format} samples; "
+                f"reading it from the start as {self.settings.sample_format}"
+            )
+            checkpoint.discard()
+            return False
+        
+        for name in RESUMED_SETTINGS:
+            if name in state.settings and name not in self.pinned_settings:
+                setattr(self.settings, name, state.settings[name])
+        if self.settings.palette not in self.color_palettes:
+            self.settings.palette = "cosmic"  # A gradient file of the earlier run
+        self._set_sample_format(self.settings.sample_format)
+        
+        self.checkpoint = checkpoint
+        self.fractal_data = frame
+        self.settings.height, self.settings.width = frame.shape
+        self.total_pixels = frame.size
+        self.pixels_read = state.pixels_read
+        self.file_position = state.file_position
+        self.frame_histogram.reset()
+        self.frame_histogram.stale = True  # Recounted from the mapped frame when first needed
+        self.log_manager.restore(state.log)
+        self._sync_controls()
+        self.root.after_idle(self._update_ui)
+        self.log_manager.logger.info(
+            f"Resumed {self.data_file_path.name} at byte {self.file_position:,} "
+            f"({self.pixels_read:,}/{self.total_pixels:,} pixels)"
+        )
+        return True
+    
+    def _sync_controls(self):
+        """Show the current settings in the sidebar widgets"""
+        self.theme_var.set(self.settings.theme)
+        self.palette_var.set(self.settings.palette)
+        self.auto_levels_var.set(self.settings.auto_levels)
+        for attribute, var in self.control_vars.items():
+            value = getattr(self.settings, attribute)
+            var.set(value)
+            self.control_labels[attribute].configure(text=f"{value:.1f}")
+    
     def _update_ui(self):
         """Update UI elements"""
+        if self.ui_update_requested_at is not None:
+            # Delay between the ingest thread requesting a refresh and Tk running it
+            latency = time.perf_counter() - self.ui_update_requested_at
+            self.ui_update_requested_at = None
+            self.ingest_stats.ui_updates += 1
+            self.ingest_stats.last_ui_latency = latency
+            self.ingest_stats.max_ui_latency = max(self.ingest_stats.max_ui_latency, latency)
+        
         if self.total_pixels > 0:
             progress = self.pixels_read / self.total_pixels
             self.progress_bar.set(progress)
@@ -981,59 +1884,140 @@ class EnhancedFractalVisualizer:
                 rows_processed = self.pixels_read // self.settings.width
                 self._update_status(f"Processing row {rows_processed + 1}/{self.settings.height}")
         
-        self._render_fractal()
+        self._update_frame_controls()
+        self._update_golden_label()
+        if self.viewed_frame is None or self.frame_ring.get(self.viewed_frame) is None:
+            self._render_fractal()  # A scrubbed-to frame does not change as data streams in
+        self.perf_label.configure(text=self.profiler.status_text())
     
     def _render_fractal(self):
         """Render the current fractal with all enhancements"""
-        if self.fractal_data is None or self.pixels_read == 0:
+        frame, samples = self._displayed_frame()
+        if frame is None or samples == 0:
             return
         
         try:
-            visible_rows = min(self.settings.height, (self.pixels_read + self.settings.width - 1) // self.settings.width)
+            visible_rows = min(self.settings.height, (samples + self.settings.width - 1) // self.settings.width)
             if visible_rows == 0:
                 return
             
-            data = self.fractal_data[:visible_rows, :].copy()
-            enhanced_data = FractalTheme.apply_theme(data, self.settings.theme, self.settings)
-            enhanced_data = self._apply_enhancements(enhanced_data)
-            indices = np.clip(enhanced_data * 1023, 0, 1023).astype(int)
-            
-            current_palette = self.color_palettes[self.settings.palette]
-            rgb_data = current_palette[indices]
-            
-            self.processed_image = Image.fromarray(rgb_data, 'RGB')
-            self.processed_image = self._apply_image_enhancements(self.processed_image)
+            with self.profiler.stage("render.frame", visible_rows * self.settings.width):
+                if self.settings.auto_levels:
+                    self._update_auto_levels()
+                self.processed_image = self._compose_image(visible_rows)
+                self.image_version += 1
             self._update_canvas_display()
             
         except Exception as e:
             self.log_manager.logger.error(f"Error rendering fractal: {e}")
     
-    def _apply_enhancements(self, data: np.ndarray) -> np.ndarray:
-        """Apply enhancement settings to fractal data"""
-        enhanced = data.copy()
-        
-        try:
-            if self.settings.smoothness > 1.0:
-                sigma = (self.settings.smoothness - 1.0) * 0.5
-                enhanced = ndimage.gaussian_filter(enhanced, sigma=sigma)
-            
-            if self.settings.contrast != 1.0:
-                enhanced = 0.5 + (enhanced - 0.5) * self.settings.contrast
-            
-            if self.settings.exposure != 1.0:
-                enhanced = enhanced * self.settings.exposure
-            
-            if self.settings.focus > 1.0:
-                blurred = ndimage.gaussian_filter(enhanced, sigma=1.0)
-                unsharp_strength = (self.settings.focus - 1.0) * 0.5
-                enhanced = enhanced + unsharp_strength * (enhanced - blurred)
-            
-            enhanced = np.clip(enhanced, 0, 1)
-            return enhanced
+    def _update_auto_levels(self):
+        """Follow the running statistics with contrast and exposure (only when they changed)"""
+        histogram = self._current_histogram()
+        # Everything the theme's response depends on, except the levels being derived
+        key = (histogram.version, self.settings.theme, self.settings.sample_format,
+               self.settings.gamma_correction, self.settings.smoothness,
+               self.settings.edge_enhancement, self.settings.fast_filters)
+        if key == self.auto_levels_key:
+            return
+        self.auto_levels_key = key
+        with self.profiler.stage("render.auto_levels"):
+            levels = FractalTheme.auto_levels(self.settings.theme, self.settings, histogram)
+        if levels is None:
+            return
+        for attribute, value in zip(("contrast", "exposure"), levels):
+            setattr(self.settings, attribute, value)
+            if attribute in self.control_vars:
+                self.control_vars[attribute].set(value)
+                self.control_labels[attribute].configure(text=f"{value:.1f}")
+    
+    def _compose_image(self, visible_rows: int) -> Image.Image:
+        """Run theme, enhancements and palette mapping over the visible rows"""
+        samples = visible_rows * self.settings.width
+        frame, _ = self._displayed_frame()
+        data = frame[:visible_rows, :].copy()
+        current_palette = self.color_palettes[self.settings.palette]
+        if self.settings.theme == "histogram" and FractalTheme.point_enhancements_only(self.settings):
+            # Equalization and enhancements are folded into the LUT: one gather per frame
+            with self.profiler.stage("render.palette", samples) as record:
+                lut = self._equalized_palette(current_palette)
+                top = len(lut) - 1
+                indices = palette_indices(data, top)
+                rgb_data = record.output(lut[indices])
+        else:
+            with self.profiler.stage("render.pipeline", samples) as record:
+                # Theme and enhancements as one graph, so shared stages run once
+                enhanced_data = record.output(self._run_pipeline(data, self.settings.theme))
             
+            with self.profiler.stage("render.palette", samples) as record:
+                top = len(current_palette) - 1
+                indices = palette_indices(enhanced_data, top)
+                rgb_data = record.output(current_palette[indices])
+        
+        image = Image.fromarray(rgb_data, 'RGB')
+        with self.profiler.stage("render.pil_enhance", samples) as record:
+            image = record.output(self._apply_image_enhancements(image))
+        
+        golden = self.golden
+        if self.settings.diff_heatmap and golden is not None and golden.shape == frame.shape:
+            # After the PIL enhancements, so the heatmap colors keep their meaning
+            with self.profiler.stage("render.diff_heatmap", samples):
+                rgb_data = golden.overlay(np.array(image), frame, visible_rows)
+                image = Image.fromarray(rgb_data, 'RGB')
+        return image
+    
+    def _displayed_frame(self) -> Tuple[Optional[np.ndarray], int]:
+        """(frame, samples received) to show: the live frame, or the ring frame scrubbed to"""
+        if self.viewed_frame is not None:
+            entry = self.frame_ring.get(self.viewed_frame)
+            if entry is not None:
+                return entry.data, entry.pixels
+            self.viewed_frame = None  # Dropped from the ring meanwhile: back to live
+        return self.fractal_data, self.pixels_read
+    
+    def _current_histogram(self) -> StreamingHistogram:
+        """Histogram of the frame being shown"""
+        entry = self.frame_ring.get(self.viewed_frame) if self.viewed_frame is not None else None
+        return entry.histogram if entry is not None else self._live_histogram()
+    
+    def _live_histogram(self) -> StreamingHistogram:
+        """The running histogram, recounted first if samples were rewritten in place"""
+        if self.frame_histogram.stale and self.fractal_data is not None:
+            self.frame_histogram.rebuild(self.fractal_data.reshape(-1)[:self.pixels_read])
+        return self.frame_histogram
+    
+    def _equalized_palette(self, palette: np.ndarray) -> np.ndarray:
+        """
+        Palette LUT with histogram equalization and the point enhancements
+        composed in; rebuilt (O(LUT size)) only when the histogram or settings change
+        """
+        histogram = self._current_histogram()
+        key = (histogram.version, self.settings.palette, len(palette), self.settings.sample_format,
+               self.settings.contrast, self.settings.exposure)
+        if self.equalized_lut is None or self.equalized_lut_key != key:
+            table = FractalTheme.equalization_table(self.settings, histogram)
+            curve = self._run_pipeline(table, None)
+            top = len(palette) - 1
+            self.equalized_lut = palette[palette_indices(curve, top)]
+            self.equalized_lut_key = key
+        return self.equalized_lut
+    
+    def _run_pipeline(self, data: np.ndarray, theme: Optional[str]) -> np.ndarray:
+        """Theme (None for none) followed by the enhancement stages"""
+        pipeline = ThemePipeline()
+        themed = pipeline.INPUT
+        try:
+            if theme is not None:
+                histogram = self._current_histogram() if theme == "histogram" else None
+                themed = FractalTheme.build(pipeline, themed, theme, self.settings, histogram)
+            return pipeline.run(data, FractalTheme.enhancements(pipeline, themed, self.settings))
         except Exception as e:
             self.log_manager.logger.error(f"Error applying enhancements: {e}")
-            return data
+            return pipeline.run(data, themed) if themed != pipeline.INPUT else data
+    
+    def _apply_enhancements(self, data: np.ndarray) -> np.ndarray:
+        """Apply enhancement settings to fractal data"""
+        return self._run_pipeline(data, None)
     
     def _apply_image_enhancements(self, image: Image.Image) -> Image.Image:
         """Apply PIL-based image enhancements"""
@@ -1065,35 +2049,83 @@ class EnhancedFractalVisualizer:
             if canvas_width <= 1 or canvas_height <= 1:
                 return
             
-            img_width, img_height = self.processed_image.size
-            scale_x = (canvas_width - 20) / img_width
-            scale_y = (canvas_height - 20) / img_height
-            scale = min(scale_x, scale_y, 1.0)
+            # Scale for the complete frame, so a streaming frame keeps its size and position
+            frame_size = (self.settings.width, self.settings.height)
+            display_frame = self._display_size(frame_size, canvas_width, canvas_height)
+            display_image = self._display_image(frame_size, display_frame)
             
-            if scale < 1.0:
-                new_width = int(img_width * scale)
-                new_height = int(img_height * scale)
-                
-                display_image = self.processed_image.resize(
-                    (new_width, new_height), 
-                    Image.Resampling.LANCZOS
+            with self.profiler.stage("display.photoimage") as record:
+                record.samples = self.canvas_blitter.show(
+                    display_image, display_frame, (canvas_width // 2, canvas_height // 2)
                 )
-            else:
-                display_image = self.processed_image
-            
-            self.tk_image = ImageTk.PhotoImage(display_image)
-            
-            self.canvas.delete("all")
-            self.canvas.create_image(
-                canvas_width // 2,
-                canvas_height // 2,
-                image=self.tk_image,
-                anchor="center"
-            )
             
         except Exception as e:
             self.log_manager.logger.error(f"Error updating canvas display: {e}")
     
+    def _display_image(self, frame_size: Tuple[int, int], display_frame: Tuple[int, int]) -> Image.Image:
+        """processed_image scaled for display: cached, previewed while resizing, or LANCZOS"""
+        if display_frame == frame_size:
+            return self.processed_image
+        key = (self.image_version, display_frame)
+        display_image = self.display_cache.get(key)
+        if display_image is not None:
+            self.display_cache.move_to_end(key)
+            return display_image
+        
+        if self.interactive_resize:
+            with self.profiler.stage("display.scale_preview") as record:
+                return record.output(self._preview_scale(frame_size, display_frame))
+        
+        with self.profiler.stage("display.scale") as record:
+            display_image = record.output(
+                self.display_scaler.scale(self.processed_image, frame_size[1], display_frame)
+            )
+        for stale in [k for k in self.display_cache if k[0] != self.image_version]:
+            del self.display_cache[stale]
+        self.display_cache[key] = display_image
+        if len(self.display_cache) > DISPLAY_CACHE_SIZE:
+            self.display_cache.popitem(last=False)
+        return display_image
+    
+    def _preview_scale(self, frame_size: Tuple[int, int], display_frame: Tuple[int, int]) -> Image.Image:
+        """
+        Cheap scaling for interactive resizes: bilinear from an already scaled
+        copy of this image when one is cached, nearest-neighbour from the
+        full image otherwise. Both cost about one output image.
+        """
+        rows = self.processed_image.height * display_frame[1] // frame_size[1]
+        size = (display_frame[0], max(1, rows))
+        cached = [image for (version, _), image in self.display_cache.items() if version == self.image_version]
+        if cached:
+            return cached[-1].resize(size, Image.Resampling.BILINEAR)
+        return self.processed_image.resize(size, Image.Resampling.NEAREST)
+    
+    @staticmethod
+    def _display_scale(frame_size: Tuple[int, int], canvas_width: int, canvas_height: int) -> float:
+        """Factor that fits a frame into the canvas (never upscales)"""
+        img_width, img_height = frame_size
+        scale_x = (canvas_width - 20) / img_width
+        scale_y = (canvas_height - 20) / img_height
+        return min(scale_x, scale_y, 1.0)
+    
+    @staticmethod
+    def _display_size(frame_size: Tuple[int, int], canvas_width: int, canvas_height: int) -> Tuple[int, int]:
+        """Size of a frame once scaled to the canvas"""
+        scale = EnhancedFractalVisualizer._display_scale(frame_size, canvas_width, canvas_height)
+        return max(1, int(frame_size[0] * scale)), max(1, int(frame_size[1] * scale))
+    
+    @staticmethod
+    def _scale_for_display(image: Image.Image, canvas_width: int, canvas_height: int) -> Image.Image:
+        """Downscale an image to fit the canvas (never upscales)"""
+        scale = EnhancedFractalVisualizer._display_scale(image.size, canvas_width, canvas_height)
+        
+        if scale < 1.0:
+            return image.resize(
+                EnhancedFractalVisualizer._display_size(image.size, canvas_width, canvas_height),
+                Image.Resampling.LANCZOS
+            )
+        return image
+    
     def _update_status(self, message: str):
         """Update status bar message"""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -1127,10 +2159,200 @@ class EnhancedFractalVisualizer:
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter valid numeric dimensions")
     
+    def _compute_view(self) -> Optional[Tuple[float, float, float, int]]:
+        """(center_x, center_y, zoom, max_iter) from the compute section, None after reporting bad input"""
+        try:
+            center_x = float(self.compute_entries["center_x"].get())
+            center_y = float(self.compute_entries["center_y"].get())
+            zoom = float(self.compute_entries["zoom"].get())
+            max_iter = int(self.compute_entries["max_iter"].get())
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter valid numeric compute parameters")
+            return None
+        
+        if zoom <= 0 or max_iter <= 0:
+            messagebox.showerror("Invalid Input", "Zoom and max iterations must be positive")
+            return None
+        return center_x, center_y, zoom, max_iter
+    
+    def _generate_fractal(self):
+        """Render the current view with the built-in compute engine"""
+        view = self._compute_view()
+        if view is None:
+            return
+        center_x, center_y, zoom, max_iter = view
+        
+        self.settings.center_x, self.settings.center_y = center_x, center_y
+        self.settings.zoom, self.settings.max_iter = zoom, max_iter
+        # Keep every typed digit: deep zooms need more precision than float64
+        self.compute_center = (
+            self.compute_entries["center_x"].get().strip(),
+            self.compute_entries["center_y"].get().strip()
+        )
+        if self._can_refine():
+            self._start_refinement(max_iter)
+        else:
+            self._start_software_render()
+    
+    def _can_refine(self) -> bool:
+        """True when only max_iter went up since the last finished render (same view and sample settings)"""
+        engine = self.compute_engine
+        if not self.software_mode or engine is None or engine.orbits is None:
+            return False
+        if self.compute_thread is not None and self.compute_thread.is_alive():
+            return False
+        viewport = ViewPort(
+            self.settings.width, self.settings.height,
+            self.settings.center_x, self.settings.center_y, self.settings.zoom
+        )
+        same_samples = (
+            self.compute_format == self.settings.sample_format
+            and engine.smooth == self.settings.smooth_samples
+            and engine.aa_threshold == self.settings.antialias_threshold
+        )
+        return engine.viewport == viewport and same_samples and self.settings.max_iter > engine.max_iter
+    
+    def _start_refinement(self, max_iter: int):
+        """Continue the undecided orbits of the last render up to max_iter"""
+        engine = self.compute_engine
+        self._update_status(
+            f"Refining {engine.orbits.undecided:,} undecided pixels from {engine.max_iter} to {max_iter} iterations..."
+        )
+        self.compute_thread = threading.Thread(target=self._run_refine, args=(engine, max_iter), daemon=True)
+        self.compute_thread.start()
+    
+    def _run_refine(self, engine: MandelbrotEngine, max_iter: int):
+        """Refinement thread body: resolved pixels are streamed into fractal_data"""
+        previous, undecided = engine.max_iter, engine.orbits.undecided
+        
+        def on_chunk(row_start: int, row_stop: int):
+            if engine is self.compute_engine:
+                self._schedule_ui_update()
+        
+        try:
+            with self.profiler.stage("compute.refine", undecided):
+                engine.refine(max_iter, out=self.fractal_data, progress=on_chunk)
+            self.frame_histogram.stale = True  # Refined samples were rewritten in place
+            if not engine.cancelled:
+                self.log_manager.logger.info(
+                    f"Refined {undecided:,} pixels from {previous} to {max_iter} iterations in "
+                    f"{engine.stats.elapsed:.2f}s ({engine.orbits.undecided:,} still bounded)"
+                )
+                self.root.after_idle(self._update_ui)
+        except Exception as e:
+            self.log_manager.logger.error(f"Refinement error: {e}")
+    
+    def _start_software_render(self):
+        """Start a background compute engine render into fractal_data"""
+        self._reset_fractal_data()
+        self.software_mode = True
+        self._initialize_fractal_data()
+        
+        viewport = ViewPort(
+            self.settings.width, self.settings.height,
+            self.settings.center_x, self.settings.center_y, self.settings.zoom
+        )
+        workers = self.settings.compute_workers or os.cpu_count() or 1
+        if self.settings.zoom >= DEEP_ZOOM_THRESHOLD:
+            center_x, center_y = self.compute_center or (repr(self.settings.center_x), repr(self.settings.center_y))
+            deep_viewport = DeepViewPort(viewport.width, viewport.height, center_x, center_y, self.settings.zoom)
+            engine = PerturbationEngine(deep_viewport, self.settings.max_iter,
+                                        aa_threshold=self.settings.antialias_threshold,
+                                        smooth=self.settings.smooth_samples)
+        elif workers > 1:
+            # Workers write their bands straight into fractal_data
+            self.shared_frame = SharedFrameBuffer(viewport.height, viewport.width)
+            self.fractal_data = self.shared_frame.array
+            engine = ParallelMandelbrotEngine(viewport, self.settings.max_iter, workers=workers,
+                                              aa_threshold=self.settings.antialias_threshold,
+                                              smooth=self.settings.smooth_samples)
+        else:
+            # Keep bounded orbits so a higher max_iter only continues those
+            engine = MandelbrotEngine(viewport, self.settings.max_iter, keep_orbits=True,
+                                      aa_threshold=self.settings.antialias_threshold,
+                                      smooth=self.settings.smooth_samples)
+        self.compute_engine = engine
+        self.compute_format = self.settings.sample_format
+        self.compute_thread = threading.Thread(target=self._run_compute, args=(engine,), daemon=True)
+        self.compute_thread.start()
+        self._update_status(f"Computing {viewport.width}×{viewport.height} at {self.settings.max_iter} iterations...")
+    
+    def _run_compute(self, engine: MandelbrotEngine):
+        """Compute thread body: tiles land directly in fractal_data"""
+        width, height = engine.viewport.width, engine.viewport.height
+        out = self.shared_frame if isinstance(engine, ParallelMandelbrotEngine) else self.fractal_data
+        # Bands may finish out of order; only the contiguous prefix is shown
+        rows_done = np.zeros(height, dtype=bool)
+        frontier = 0
+        
+        def on_tile(row_start: int, row_stop: int):
+            nonlocal frontier
+            if engine is self.compute_engine:
+                # Progress may repeat rows (mirroring, anti-aliasing); count each row once
+                new_rows = np.flatnonzero(~rows_done[row_start:row_stop]) + row_start
+                self.frame_histogram.add(self.fractal_data[new_rows])
+                rows_done[row_start:row_stop] = True
+                while frontier < height and rows_done[frontier]:
+                    frontier += 1
+                self.pixels_read = frontier * width
+                self.ingest_stats.samples += (row_stop - row_start) * width
+                self._schedule_ui_update()
+        
+        try:
+            with self.profiler.stage("compute.frame", width * height):
+                engine.render(out=out, progress=on_tile)
+            if engine.stats.supersampled:
+                self.frame_histogram.stale = True  # Anti-aliasing rewrote counted samples
+            if not engine.cancelled:
+                self.log_manager.logger.info(
+                    f"Software render: {engine.stats.pixels:,} pixels in {engine.stats.elapsed:.2f}s "
+                    f"({engine.stats.bulb_rejected:,} rejected by cardioid/bulb check, "
+                    f"{engine.stats.periodic:,} by periodicity, {engine.stats.mirrored:,} mirrored)"
+                )
+                if engine.stats.supersampled:
+                    self.log_manager.logger.info(
+                        f"Anti-aliasing: {engine.stats.supersampled:,} pixels supersampled, "
+                        f"{engine.stats.samples_per_pixel:.2f} samples per pixel"
+                    )
+                if isinstance(engine, PerturbationEngine):
+                    reference = engine.reference
+                    self.log_manager.logger.info(
+                        f"Perturbation: {reference.length:,}-step reference orbit at {reference.digits} digits "
+                        f"({reference.backend}, {reference.elapsed:.2f}s), {engine.stats.rebases:,} rebases"
+                    )
+                    if engine.series is not None and engine.series.skip:
+                        self.log_manager.logger.info(
+                            f"Series approximation: skipped {engine.series.skip} iterations per pixel "
+                            f"({engine.stats.series_skipped:,} total)"
+                        )
+                self.root.after_idle(self._update_ui)
+        except Exception as e:
+            self.log_manager.logger.error(f"Compute engine error: {e}")
+    
+    def _cancel_software_render(self):
+        """Stop any running compute engine render"""
+        if self.compute_engine is not None:
+            self.compute_engine.cancel()
+            self.compute_engine = None
+    
+    def _release_shared_frame(self):
+        """Free the shared-memory frame of the last parallel render"""
+        if self.shared_frame is not None:
+            self.shared_frame.close()
+            self.shared_frame = None
+    
     def _reset_fractal_data(self):
         """Reset fractal data for new dimensions"""
+        self._cancel_software_render()
         self.fractal_data = None
+        self.checkpoint = None
+        self.capture_identity = None
+        self.frame_ring.clear()
+        self.viewed_frame = None
+        self._update_frame_controls()
+        self._release_shared_frame()
         self.processed_image = None
+        self.display_cache.clear()
         self.pixels_read = 0
         self.total_pixels = 0
         self.file_position = 0
@@ -1150,60 +2372,219 @@ class EnhancedFractalVisualizer:
         self._render_fractal()
         self._update_status(f"Palette changed to {palette}")
     
+    def _open_palette_file(self):
+        """Ask for a gradient file and add it as a palette"""
+        file_path = filedialog.askopenfilename(
+            title="Select Gradient",
+            filetypes=[("Gradient files", " ".join(f"*{suffix}" for suffix in GRADIENT_SUFFIXES)),
+                       ("All files", "*.*")]
+        )
+        if file_path:
+            if self._register_palette_file(file_path, select=True) is None:
+                messagebox.showerror("Invalid Gradient", f"Could not load a palette from {file_path}")
+    
     def _on_control_change(self, value: float, label: ctk.CTkLabel, attribute: str):
         """Handle enhancement control changes"""
         setattr(self.settings, attribute, value)
         label.configure(text=f"{value:.1f}")
+        if attribute in ("contrast", "exposure") and self.settings.auto_levels:
+            # Moving a level by hand takes it back from auto levels
+            self.settings.auto_levels = False
+            self.auto_levels_var.set(False)
+        self._render_fractal()
+    
+    def _on_auto_levels_change(self):
+        """Handle the auto levels switch"""
+        self.settings.auto_levels = self.auto_levels_var.get()
+        self.auto_levels_key = None
+        self._render_fractal()
+        self._update_status(f"Auto levels {'on' if self.settings.auto_levels else 'off'}")
+    
+    @property
+    def viewed_frame(self) -> Optional[int]:
+        """Sequence number of the ring frame shown (None = live); pinned in the ring"""
+        return self.frame_ring.pinned
+    
+    @viewed_frame.setter
+    def viewed_frame(self, sequence: Optional[int]):
+        self.frame_ring.pin(sequence)
+    
+    def _update_frame_controls(self):
+        """Fit the frame slider to the ring and describe the frame shown"""
+        frames = self.frame_ring.snapshot()
+        live = self.frame_ring.next_sequence
+        entry = self.frame_ring.get(self.viewed_frame) if self.viewed_frame is not None else None
+        position = next((index for index, frame in enumerate(frames) if frame is entry), len(frames))
+        self.frame_slider.configure(
+            to=max(len(frames), 1), number_of_steps=max(len(frames), 1),
+            state="normal" if frames else "disabled"
+        )
+        self.frame_slider.set(position)
+        if entry is None:
+            self.frame_label.configure(text=f"Live • frame {live + 1}")
+        else:
+            state = "" if entry.complete else f" • cut short at {entry.pixels:,} pixels"
+            self.frame_label.configure(text=f"Frame {entry.sequence + 1} of {live + 1}{state}")
+    
+    def _on_frame_scrub(self, value: float):
+        """Show the ring frame under the slider (its last position is the live frame)"""
+        frames = self.frame_ring.snapshot()
+        index = int(round(value))
+        self.viewed_frame = frames[index].sequence if index < len(frames) else None
+        self._update_frame_controls()
+        self._render_fractal()
+    
+    def _show_live_frame(self):
+        """Leave scrubbing and follow the incoming frame again"""
+        self.viewed_frame = None
+        self._update_frame_controls()
+        self._render_fractal()
+    
+    def _set_reference(self, source: str):
+        """Compare ingested frames with a reference: the compute engine's view or a capture file"""
+        if source == REFERENCE_ENGINE:
+            view = self._compute_view()
+            if view is None:
+                return
+        else:
+            view = None
+        self.golden_label.configure(text="Preparing reference...")
+        threading.Thread(target=self._load_reference, args=(source, view), daemon=True).start()
+    
+    def _load_reference(self, source: str, view: Optional[Tuple[float, float, float, int]]):
+        """Reference loader thread: build the comparator and catch up with the samples already read"""
+        width, height = self.settings.width, self.settings.height
+        sample_format = self.settings.sample_format
+        try:
+            start = time.perf_counter()
+            if source == REFERENCE_ENGINE:
+                center_x, center_y, zoom, max_iter = view
+                reference = engine_reference(width, height, sample_format, max_iter, center_x, center_y, zoom)
+                name = f"engine ({max_iter} iterations)"
+            else:
+                path = Path(source)
+                binary = path.suffix.lower() in BINARY_SUFFIXES
+                reference = capture_reference(path, sample_format, (height, width), binary)
+                name = path.name
+            golden = GoldenComparator(reference, self.settings.golden_threshold, name)
+            self.golden, self.golden_source = golden, source
+            if self.fractal_data is not None and golden.shape == self.fractal_data.shape:
+                golden.advance(self.fractal_data, self.pixels_read)
+            self.log_manager.logger.info(
+                f"Golden reference {name}: {width}x{height} {sample_format}, "
+                f"ready in {time.perf_counter() - start:.2f}s"
+            )
+        except Exception as e:
+            message = f"Could not prepare the reference:\n{e}"
+            self.log_manager.logger.error(f"Error preparing reference {source}: {e}")
+            self.root.after(0, lambda: messagebox.showerror("Reference Error", message))
+            self.root.after(0, self._update_golden_label)
+            return
+        self.root.after(0, self._update_golden_label)
+        self.root.after(0, self._render_fractal)
+    
+    def _open_reference(self):
+        """Pick a capture file to compare with"""
+        file_path = filedialog.askopenfilename(
+            title="Select Reference Capture",
+            filetypes=[("Data files", "*.txt *.bin *.raw *.u16 *.f32"), ("All files", "*.*")]
+        )
+        if file_path:
+            self._set_reference(file_path)
+    
+    def _clear_reference(self):
+        """Stop comparing"""
+        self.golden = self.golden_source = None
+        self._update_golden_label()
+        self._render_fractal()
+    
+    def _update_golden_label(self):
+        """Report the comparison of the live frame"""
+        golden = self.golden
+        if golden is None:
+            text = "No reference"
+        elif self.fractal_data is not None and golden.shape != self.fractal_data.shape:
+            text = f"Reference {golden.name} is {golden.shape[1]}x{golden.shape[0]}, the frame is not"
+        else:
+            _, max_value = SAMPLE_FORMATS[self.settings.sample_format]
+            text = golden.summary(max_value)
+        self.golden_label.configure(text=text)
+    
+    def _on_diff_heatmap_change(self):
+        """Handle the diff heatmap switch"""
+        self.settings.diff_heatmap = self.diff_heatmap_var.get()
         self._render_fractal()
     
     def _on_canvas_resize(self, event):
         """Handle canvas resize event"""
         if hasattr(self, 'processed_image') and self.processed_image:
-            self.root.after_idle(self._update_canvas_display)
+            # Coalesce the burst of <Configure> events from dragging the window edge into
+            # one fast preview per idle cycle and a single high-quality rescale at the end
+            self.interactive_resize = True
+            if self.resize_settle_id is not None:
+                self.root.after_cancel(self.resize_settle_id)
+            self.resize_settle_id = self.root.after(RESIZE_SETTLE_MS, self._finish_canvas_resize)
+            if not self.resize_preview_pending:
+                self.resize_preview_pending = True
+                self.root.after_idle(self._preview_canvas_resize)
         else:
             self.root.after_idle(self._show_placeholder)
     
+    def _preview_canvas_resize(self):
+        """Redraw at the current canvas size with the fast scaling"""
+        self.resize_preview_pending = False
+        self._update_canvas_display()
+    
+    def _finish_canvas_resize(self):
+        """No resize for RESIZE_SETTLE_MS: redraw with the high-quality scaling"""
+        self.resize_settle_id = None
+        self.interactive_resize = False
+        self._update_canvas_display()
+    
     def _open_file(self):
         """Open a new data file"""
         file_path = filedialog.askopenfilename(
             title="Open Fractal Data File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Text files", "*.txt"), ("Binary captures", "*.bin *.raw *.u16"), ("All files", "*.*")]
         )
         
         if file_path:
             self.data_file_path = Path(file_path)
+            self.software_mode = False
+            self.shm_name = None
+            if self.shm_consumer:
+                self.shm_consumer.close()
+                self.shm_consumer = None
+            self.tcp_address = None
+            if self.tcp_socket:
+                self.tcp_socket.close()
+                self.tcp_socket = None
             self._reset_fractal_data()
-            self._update_status(f"Opened file: {self.data_file_path.name}")
+            if self._resume_session():
+                self._update_status(f"Resumed file: {self.data_file_path.name}")
+            else:
+                self._update_status(f"Opened file: {self.data_file_path.name}")
             self.status_label.configure(text=f"Ready • File: {self.data_file_path.name}")
     
     def _save_image(self):
         """Save the current fractal image with simplified logic"""
         try:
             # Check if we have fractal data
-            if self.fractal_data is None or self.pixels_read == 0:
+            frame, samples = self._displayed_frame()
+            if frame is None or samples == 0:
                 messagebox.showwarning("No Image", "No fractal data available to save")
                 return
             
             # Force render the current fractal state
-            if self.fractal_data is not None:
+            if frame is not None:
                 # Get visible rows (even if incomplete)
-                visible_rows = min(self.settings.height, (self.pixels_read + self.settings.width - 1) // self.settings.width)
+                visible_rows = min(self.settings.height, (samples + self.settings.width - 1) // self.settings.width)
                 if visible_rows == 0:
                     messagebox.showwarning("No Image", "No pixel data to save")
                     return
                 
                 # Create image from current data
-                data = self.fractal_data[:visible_rows, :].copy()
-                enhanced_data = FractalTheme.apply_theme(data, self.settings.theme, self.settings)
-                enhanced_data = self._apply_enhancements(enhanced_data)
-                indices = np.clip(enhanced_data * 1023, 0, 1023).astype(int)
-                
-                current_palette = self.color_palettes[self.settings.palette]
-                rgb_data = current_palette[indices]
-                
-                # Create PIL image
-                save_image = Image.fromarray(rgb_data, 'RGB')
-                save_image = self._apply_image_enhancements(save_image)
+                save_image = self._compose_image(visible_rows)
             
             # Generate filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1213,7 +2594,8 @@ class EnhancedFractalVisualizer:
             save_path = self.data_file_path.parent / filename
             
             # Save with maximum quality
-            save_image.save(str(save_path), "PNG", optimize=False, compress_level=0)
+            with self.profiler.stage("save.png", save_image.width * save_image.height):
+                self._write_image(save_image, save_path)
             
             # Update UI
             self._update_status(f"Image saved: {filename}")
@@ -1228,11 +2610,16 @@ class EnhancedFractalVisualizer:
             messagebox.showerror("Save Error", error_msg)
             print(f"Save error: {e}")  # Also print to console for debugging
     
+    @staticmethod
+    def _write_image(image: Image.Image, save_path: Path):
+        """Write an image as uncompressed PNG"""
+        image.save(str(save_path), "PNG", optimize=False, compress_level=0)
+    
     def _show_log(self):
         """Show the fractal generation log"""
         log_window = ctk.CTkToplevel(self.root)
         log_window.title("Fractal Generation Log")
-        log_window.geometry("700x500")
+        log_window.geometry("800x600")
         log_window.configure(fg_color=self.COLORS['bg_primary'])
         
         log_window.transient(self.root)
@@ -1271,6 +2658,13 @@ Elapsed Time: {summary_data.get('elapsed_time', 'N/A')}
 Estimated Remaining: {summary_data.get('estimated_remaining', 'N/A')}
 Processing Speed: {summary_data.get('average_pixels_per_second', 0):.1f} pixels/sec"""
         
+        stats = self.ingest_stats
+        summary_text += f"""
+
+Ingest: {stats.samples:,} samples ({stats.samples_per_second:,.0f}/s), {stats.dropped_samples:,} dropped
+UI Updates: {stats.ui_updates:,} drawn, {stats.coalesced_updates:,} coalesced
+UI Latency: {stats.last_ui_latency * 1000:.1f} ms last, {stats.max_ui_latency * 1000:.1f} ms max"""
+        
         summary_label = ctk.CTkLabel(
             summary_frame,
             text=summary_text,
@@ -1285,30 +2679,64 @@ Processing Speed: {summary_data.get('average_pixels_per_second', 0):.1f} pixels/
         log_text = ctk.CTkTextbox(
             log_frame,
             font=ctk.CTkFont(size=11, family="Consolas"),
-            wrap="word"
+            wrap="none"
         )
         log_text.pack(fill="both", expand=True, padx=10, pady=10)
         
+        log_content = "Pipeline Timing (last 200 runs per stage):\n" + "="*50 + "\n\n"
+        log_content += self.profiler.format_summary() + "\n\n"
+        
         if self.log_manager.current_session:
-            log_content = "Session Log Entries:\n" + "="*50 + "\n\n"
+            log_content += "Session Log Entries:\n" + "="*50 + "\n\n"
             
             for entry in self.log_manager.current_session[-20:]:
                 timestamp = entry.timestamp.strftime("%H:%M:%S.%f")[:-3]
                 remaining = f" (ETA: {entry.estimated_remaining:.1f}s)" if entry.estimated_remaining else ""
                 log_content += f"[{timestamp}] {entry.percentage:6.1f}% | {entry.pixels_processed:8,} pixels | {entry.elapsed_time:6.1f}s{remaining}\n"
         else:
-            log_content = "No active session data available."
+            log_content += "No active session data available."
         
         log_text.insert("1.0", log_content)
         log_text.configure(state="disabled")
         
+        button_frame = ctk.CTkFrame(log_window, fg_color="transparent")
+        button_frame.pack(pady=(0, 20))
+        
+        export_btn = ctk.CTkButton(
+            button_frame,
+            text="Export Trace",
+            command=self._export_trace,
+            width=120
+        )
+        export_btn.pack(side="left", padx=5)
+        
         close_btn = ctk.CTkButton(
-            log_window,
+            button_frame,
             text="Close",
             command=log_window.destroy,
             width=100
         )
-        close_btn.pack(pady=(0, 20))
+        close_btn.pack(side="left", padx=5)
+    
+    def _export_trace(self):
+        """Export pipeline timings as a Chrome trace-format JSON file"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = filedialog.asksaveasfilename(
+            title="Export Pipeline Trace",
+            defaultextension=".json",
+            initialfile=f"fractal_trace_{timestamp}.json",
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            self.profiler.export_chrome_trace(file_path)
+            self._update_status(f"Trace exported: {Path(file_path).name}")
+            self.log_manager.logger.info(f"Pipeline trace exported: {file_path}")
+        except Exception as e:
+            self.log_manager.logger.error(f"Failed to export trace: {e}")
+            messagebox.showerror("Export Error", f"Failed to export trace: {e}")
     
     def _refresh_display(self):
         """Refresh the fractal display"""
@@ -1332,8 +2760,17 @@ Processing Speed: {summary_data.get('average_pixels_per_second', 0):.1f} pixels/
     def _on_closing(self):
         """Handle application closing"""
         self.running = False
+        self._cancel_software_render()
+        self._release_shared_frame()
+        shutdown_pools()
         if self.file_monitor_thread:
             self.file_monitor_thread.join()
+        if self.checkpoint is not None and self.fractal_data is not None:
+            self._save_checkpoint()
+        if self.shm_consumer:
+            self.shm_consumer.close()
+        if self.tcp_socket:
+            self.tcp_socket.close()
         self.log_manager.logger.info("Application closing")
         self.root.quit()
         self.root.destroy()
@@ -1351,6 +2788,21 @@ Exemplos de uso:
 
   # Inicia e carrega imediatamente o arquivo 'meus_dados.txt'
   python fancyFractal.py meus_dados.txt
+
+  # Renderiza em software, sem FPGA conectado
+  python fancyFractal.py --generate
+
+  # Lê quadros publicados em memória compartilhada (mandelbrot.c -DUSE_FRAME_SHM)
+  python fancyFractal.py shm://ffpga_frame
+
+  # Lê amostras uint16 de uma conexão TCP (ex.: fpga_simulator.py --format socket)
+  python fancyFractal.py tcp://127.0.0.1:5555
+
+  # Compara a captura da placa com o motor embutido e mostra as diferenças
+  python fancyFractal.py captura.bin --reference engine --diff-heatmap
+
+  # Monitora várias placas lado a lado em uma grade
+  python fancyFractal.py --boards placa1.bin placa2.bin tcp://10.0.0.7:5555 --board-size 1920x1080
 """
     )
     
@@ -1358,21 +2810,204 @@ Exemplos de uso:
         'data_file',
         nargs='?',
         default=None,
-        help='(Opcional) Caminho para o arquivo de dados do fractal a ser carregado no início.'
+        help='(Opcional) Caminho para o arquivo de dados do fractal shm://<nome> do segmento de memória compartilhada ou tcp://<host>:<porta>.'
+    )
+    
+    parser.add_argument(
+        '--generate',
+        action='store_true',
+        help='Renderiza o fractal com o motor de cálculo embutido (modo sem hardware).'
+    )
+    
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Mede alocações por etapa com tracemalloc (mais lento). O pico do tracemalloc é do processo '
+             'inteiro: com várias threads ativas cada etapa também conta o que as outras alocaram.'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Processos usados pelo motor de cálculo (0 = um por CPU, 1 = sem paralelismo).'
+    )
+    
+    parser.add_argument(
+        '--antialias',
+        type=float,
+        default=0.0,
+        metavar='LIMIAR',
+        help='Superamostra apenas pixels cuja diferença para os vizinhos excede o limiar (0-1; 0 = desligado). '
+             'Cada pixel marcado recebe uma subamostra de teste e só os que discordam dela recebem a grade '
+             'completa, dentro de um orçamento de iterações: o custo típico é 1,5-2x o de uma renderização '
+             'simples, menos da metade da superamostragem 2x2.'
+    )
+    
+    parser.add_argument(
+        '--palette',
+        action='append',
+        default=[],
+        metavar='ARQUIVO',
+        help='Adiciona uma paleta a partir de um arquivo de gradiente (.npy, .json, .gpl, .txt, .csv); '
+             'pode ser repetido. O nome da paleta é o nome do arquivo.'
+    )
+    
+    parser.add_argument(
+        '--palette-cache',
+        default=None,
+        metavar='DIR',
+        help='Diretório para guardar as paletas geradas como .npy entre execuções.'
+    )
+    
+    parser.add_argument(
+        '--sample-format',
+        choices=list(SAMPLE_FORMATS),
+        default=None,
+        help='Canal de amostras: int10 (0-1023, padrão da FPGA), uint16 ou float32 (iteração suavizada). '
+             'Também faz o motor embutido gerar contagens suavizadas.'
+    )
+    
+    parser.add_argument(
+        '--scipy-filters',
+        action='store_true',
+        help='Usa os filtros genéricos do SciPy nos temas dramatic e ethereal em vez dos núcleos 3x3 otimizados.'
+    )
+    
+    parser.add_argument(
+        '--auto-levels',
+        action='store_true',
+        help='Ajusta contraste e exposição automaticamente pelas estatísticas do quadro (percentis 1-99), '
+             'atualizados conforme os dados chegam.'
+    )
+    
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=float,
+        default=FractalSettings.checkpoint_interval,
+        metavar='SEGUNDOS',
+        help='Intervalo entre checkpoints da sessão (quadro em <arquivo>.checkpoint.npy, posição e '
+             'configurações em <arquivo>.checkpoint.json); ao reabrir o mesmo arquivo a leitura '
+             'continua de onde parou (0 = desligado).'
+    )
+    
+    parser.add_argument(
+        '--frame-ring',
+        type=int,
+        default=FRAME_RING_SIZE,
+        metavar='N',
+        help='Quadros recentes mantidos em memória para navegar pela sequência (limitado a 1 GiB; 0 = nenhum). '
+             'Um fluxo com vários quadros é dividido por marcadores FRAME ou pela contagem de amostras.'
+    )
+    
+    parser.add_argument(
+        '--reference',
+        default=None,
+        metavar='FONTE',
+        help='Compara cada quadro recebido, conforme as amostras chegam, com uma referência: "engine" '
+             '(o motor embutido na vista da seção Compute) ou o primeiro quadro de outra captura. '
+             'Informa divergências, erro máximo e a primeira linha divergente.'
+    )
+    
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=FractalSettings.golden_tolerance,
+        metavar='LSB',
+        help='Diferença da referência ainda aceita, em unidades da amostra (0 = igualdade exata).'
+    )
+    
+    parser.add_argument(
+        '--diff-heatmap',
+        action='store_true',
+        help='Mostra o mapa de calor das diferenças em relação à referência sobre a imagem.'
+    )
+    
+    parser.add_argument(
+        '--boards',
+        nargs='+',
+        default=None,
+        metavar='FONTE',
+        help='Monitora várias placas (arquivos, shm://<nome> ou tcp://<host>:<porta>) em uma grade de '
+             'visualizações, com leitura e renderização em grupos de threads compartilhados.'
+    )
+    
+    parser.add_argument(
+        '--board-size',
+        default='256x256',
+        metavar='LxA',
+        help='Dimensões dos quadros das placas em --boards (fontes shm:// informam as próprias).'
+    )
+    
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Ignora um checkpoint existente e lê o arquivo desde o início.'
     )
     
     args = parser.parse_args()
     
+    if args.boards:
+        for source in args.boards:
+            if not source.startswith((SHM_SCHEME, TCP_SCHEME)) and not os.path.exists(source):
+                print(f"Erro: O arquivo de entrada '{source}' não foi encontrado.")
+                sys.exit(1)
+        try:
+            width, height = (int(value) for value in args.board_size.lower().split('x'))
+        except ValueError:
+            print(f"Erro: dimensões inválidas em --board-size: '{args.board_size}' (use LxA, ex.: 1920x1080).")
+            sys.exit(1)
+        
+        from board_grid import BoardGrid
+        grid = BoardGrid(args.boards, width, height, args.sample_format)
+        for board in grid.boards:
+            board.settings.fast_filters = not args.scipy_filters
+            board.settings.auto_levels = args.auto_levels
+            board.settings.frame_ring_size = board.frame_ring.capacity = args.frame_ring
+        grid.run()
+        return
+    
     initial_file_path = "fractal_data.txt"
 
     if args.data_file:
-        if not os.path.exists(args.data_file):
+        is_stream = args.data_file.startswith((SHM_SCHEME, TCP_SCHEME))
+        if not is_stream and not os.path.exists(args.data_file):
             print(f"Erro: O arquivo de entrada '{args.data_file}' não foi encontrado.")
             sys.exit(1)
         initial_file_path = args.data_file
     
     try:
-        visualizer = EnhancedFractalVisualizer(initial_file_path)
+        # Everything given on the command line is in place before a checkpoint
+        # is resumed and the monitor thread starts reading the source
+        settings = FractalSettings(
+            sample_format=args.sample_format or FractalSettings.sample_format,
+            compute_workers=args.workers,
+            antialias_threshold=args.antialias,
+            fast_filters=not args.scipy_filters,
+            auto_levels=args.auto_levels,
+            checkpoint_interval=args.checkpoint_interval,
+            frame_ring_size=args.frame_ring,
+            golden_tolerance=args.tolerance,
+            diff_heatmap=args.diff_heatmap,
+        )
+        # An explicit sample format or auto levels wins over the resumed session's
+        pinned = tuple(name for name, given in (("sample_format", args.sample_format),
+                                                ("auto_levels", args.auto_levels)) if given)
+        resume = args.checkpoint_interval > 0 and not args.no_resume
+        visualizer = EnhancedFractalVisualizer(initial_file_path, resume=resume,
+                                               settings=settings, pinned_settings=pinned)
+        visualizer.profiler.track_allocations = args.trace_memory
+        if args.palette_cache:
+            visualizer.palette_registry.cache_dir = Path(args.palette_cache)
+        for palette_file in args.palette:
+            visualizer._register_palette_file(palette_file)
+        if args.reference:
+            if args.reference != REFERENCE_ENGINE and not os.path.exists(args.reference):
+                print(f"Erro: O arquivo de referência '{args.reference}' não foi encontrado.")
+                sys.exit(1)
+            visualizer._set_reference(args.reference)
+        if args.generate:
+            visualizer.root.after(100, visualizer._start_software_render)
         visualizer.run()
         
     except KeyboardInterrupt:
@@ -0,0 +1,113 @@
+"""
+Specialized neighbourhood filters for the theme pipeline.
+
+SciPy's rank_filter sorts every 3x3 window and maximum_filter scans every
+window; both are generic. The kernels here are vectorized NumPy over shifted
+views of the whole frame:
+
+    median3x3       9-sample median as a sorting network: each column triple
+                    is sorted once (shared by the three windows containing
+                    it), then median = med3(max of lows, med3 of mids,
+                    min of highs)
+    maximum_filter  separable running maximum; windows wider than three use
+                    van Herk/Gil-Werman block-wise prefix and suffix maxima,
+                    three comparisons per sample and axis for any size
+
+Borders follow SciPy's default mode="reflect" (edge samples repeated), so for
+finite data the results are identical to ndimage.rank_filter(rank=4, size=3)
+and ndimage.maximum_filter(size=size). NaN samples (e.g. from a fractional
+power of a negative edge-enhanced value) are skipped by the comparisons
+(np.fmin/np.fmax) instead of spreading to every window that contains them.
+"""
+
+import numpy as np
+
+
+def _sort3(a: np.ndarray, b: np.ndarray, c: np.ndarray):
+    """Elementwise (low, middle, high) of three arrays"""
+    low, high = np.fmin(a, b), np.fmax(a, b)
+    middle = np.fmin(high, c)
+    np.fmax(high, c, out=high)
+    swapped = np.fmax(low, middle)
+    np.fmin(low, middle, out=low)
+    return low, swapped, high
+
+
+def _med3(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Elementwise median of three arrays"""
+    high = np.fmax(a, b)
+    np.fmin(high, c, out=high)
+    return np.fmax(np.fmin(a, b), high, out=high)
+
+
+def median3x3(data: np.ndarray) -> np.ndarray:
+    """3x3 median of a 2D array (equals ndimage.rank_filter(data, rank=4, size=3))"""
+    if data.ndim != 2:
+        raise ValueError(f"median3x3 expects a 2D array, got shape {data.shape}")
+    padded = np.pad(data, 1, mode="symmetric")
+    rows = padded.shape[0] - 2
+
+    # Sort each vertical triple once; every window reuses three of them
+    low, middle, high = _sort3(padded[:rows], padded[1:rows + 1], padded[2:])
+
+    width = data.shape[1]
+    left, centre, right = slice(0, width), slice(1, width + 1), slice(2, width + 2)
+    max_low = np.fmax(low[:, left], low[:, centre])
+    np.fmax(max_low, low[:, right], out=max_low)
+    min_high = np.fmin(high[:, left], high[:, centre])
+    np.fmin(min_high, high[:, right], out=min_high)
+    med_middle = _med3(middle[:, left], middle[:, centre], middle[:, right])
+    return _med3(max_low, med_middle, min_high)
+
+
+def _take(data: np.ndarray, axis: int, start: int, stop: int) -> np.ndarray:
+    return data[(slice(None),) * axis + (slice(start, stop),)]
+
+
+def _running_max(padded: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """Maximum over each run of `size` samples along `axis` ("valid" positions only)"""
+    length = padded.shape[axis] - size + 1
+    if size <= 3:
+        # Shifted views take size - 1 comparisons, no more than van Herk/Gil-Werman's three
+        result = _take(padded, axis, 0, length)
+        for j in range(1, size):
+            result = np.fmax(result, _take(padded, axis, j, j + length))
+        return result
+
+    # Pad to whole blocks of `size` with copies of the last sample
+    blocks = -(-padded.shape[axis] // size)
+    widths = [(0, 0)] * padded.ndim
+    widths[axis] = (0, blocks * size - padded.shape[axis])
+    padded = np.pad(padded, widths, mode="edge")
+
+    # View each block as its own axis and scan it with whole-slice operations
+    shape = padded.shape[:axis] + (blocks, size) + padded.shape[axis + 1:]
+    blocked = padded.reshape(shape)
+    prefix = np.empty_like(blocked)
+    suffix = np.empty_like(blocked)
+    lead = (slice(None),) * (axis + 1)
+    prefix[lead + (0,)] = blocked[lead + (0,)]
+    suffix[lead + (size - 1,)] = blocked[lead + (size - 1,)]
+    for j in range(1, size):
+        np.fmax(prefix[lead + (j - 1,)], blocked[lead + (j,)], out=prefix[lead + (j,)])
+        k = size - 1 - j
+        np.fmax(suffix[lead + (k + 1,)], blocked[lead + (k,)], out=suffix[lead + (k,)])
+    prefix = prefix.reshape(padded.shape)
+    suffix = suffix.reshape(padded.shape)
+
+    # Window [i, i + size) spans at most two blocks: suffix of one, prefix of the next
+    return np.fmax(_take(suffix, axis, 0, length), _take(prefix, axis, size - 1, size - 1 + length))
+
+
+def maximum_filter(data: np.ndarray, size: int = 3) -> np.ndarray:
+    """size x size maximum filter (equals ndimage.maximum_filter(data, size=size))"""
+    if size < 1:
+        raise ValueError(f"Filter size must be positive, got {size}")
+    if size == 1:
+        return data.copy()
+    # Reflect-pad every axis once; each pass then shrinks its axis back
+    before = size // 2
+    result = np.pad(data, (before, size - 1 - before), mode="symmetric")
+    for axis in range(data.ndim):
+        result = _running_max(result, size, axis)
+    return result
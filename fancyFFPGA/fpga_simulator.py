@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+FPGA stream simulator and load generator for the Fractal Visualizer.
+
+Emits 10-bit fractal samples the way the board does, in every format the
+visualizer ingests:
+
+    text    one decimal sample per line, appended to a file (_read_file_data)
+    binary  little-endian uint16 samples appended to a .bin file
+    socket  little-endian uint16 samples served over TCP (tcp://host:port)
+    shm     rows published to a shared-memory frame segment (shm://name)
+
+With --sample-format uint16 or float32 the generated frames carry the smooth
+(fractional) iteration count instead, as 16-bit samples or little-endian
+float32 values in 0-1 (shared memory supports uint16 only).
+
+With --frames N the frames follow each other in one stream; --frame-markers
+also starts each frame with a frame marker (see frame_sequence.py) instead
+of relying on the visualizer counting width x height samples.
+
+Samples are either generated (Mandelbrot escape time) or replayed from a
+recorded capture, and paced with configurable rates and burst patterns so the
+visualizer's sustained throughput, UI latency and dropped updates can be
+measured without the board attached.
+"""
+
+import sys
+import json
+import time
+import socket
+import argparse
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from frame_transport import ShmFrameProducer, SHM_DEFAULT_NAME
+from frame_sequence import FRAME_MARKER_TEXT, FRAME_MARKERS
+from fractal_engine import MandelbrotEngine, ViewPort, SAMPLE_FORMATS
+
+FORMATS = ["text", "binary", "socket", "shm"]
+PATTERNS = ["steady", "burst", "jitter"]
+
+
+@dataclass
+class SimulatorConfig:
+    """Stream geometry, pacing and output settings"""
+    format: str = "text"
+    sample_format: str = "int10"
+    output: str = "fractal_data.txt"
+    width: int = 256
+    height: int = 256
+    frames: int = 1
+    rate: float = 100_000.0        # Average samples per second (0 = unthrottled)
+    chunk: int = 4096              # Samples per write
+    pattern: str = "steady"
+    burst_chunks: int = 16         # Chunks per burst in the "burst" pattern
+    seed: int = 0
+    source: str = "mandelbrot"
+    replay: Optional[str] = None
+    max_iter: int = 256
+    center_x: float = -0.5
+    center_y: float = 0.0
+    zoom: float = 1.0
+    host: str = "127.0.0.1"
+    port: int = 5555
+    shm_name: str = SHM_DEFAULT_NAME
+    frame_markers: bool = False    # Start every frame with a frame marker
+
+
+@dataclass
+class SimulatorReport:
+    """What was actually emitted, for comparison with the visualizer's counters"""
+    samples_emitted: int = 0
+    writes: int = 0
+    elapsed: float = 0.0
+    late_writes: int = 0           # Writes issued after their scheduled time
+    max_lateness: float = 0.0
+    chunk_sizes: List[int] = field(default_factory=list)
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples_emitted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("chunk_sizes")
+        data["samples_per_second"] = self.samples_per_second
+        data["mean_chunk"] = float(np.mean(self.chunk_sizes)) if self.chunk_sizes else 0.0
+        return data
+
+
+def mandelbrot_samples(width: int, height: int, max_iter: int = 256,
+                       center_x: float = -0.5, center_y: float = 0.0,
+                       zoom: float = 1.0, sample_format: str = "int10") -> np.ndarray:
+    """
+    Escape-time frame quantized to the board's 10-bit sample range, or the
+    smooth iteration count as 16-bit samples (uint16) or 0-1 values (float32)
+    """
+    viewport = ViewPort(width, height, center_x, center_y, zoom)
+    engine = MandelbrotEngine(viewport, max_iter, smooth=sample_format != "int10")
+    if sample_format == "float32":
+        return engine.render()
+    return engine.render_samples()
+
+
+def load_capture(path: str, sample_format: str = "int10") -> np.ndarray:
+    """
+    Load a recorded capture (text lines of `sample_format` values, little-endian
+    uint16 or .f32 float32 binary); text values outside the format's range are
+    dropped
+    """
+    capture = Path(path)
+    if capture.suffix.lower() == ".f32":
+        return np.fromfile(capture, dtype="<f4")
+    if capture.suffix.lower() in (".bin", ".raw", ".u16"):
+        return np.fromfile(capture, dtype="<u2")
+
+    dtype, max_value = SAMPLE_FORMATS[sample_format]
+    values = []
+    with open(capture, "r") as f:
+        for line in f:
+            try:
+                value = float(line) if sample_format == "float32" else int(line)
+            except ValueError:
+                continue
+            if 0 <= value <= max_value:
+                values.append(value)
+    return np.asarray(values, dtype=dtype)
+
+
+class StreamWriter:
+    """Destination for simulated samples"""
+
+    def write(self, samples: np.ndarray):
+        raise NotImplementedError
+
+    def start_frame(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TextWriter(StreamWriter):
+    """Appends one decimal sample per line, as the board's text capture does"""
+
+    def __init__(self, path: str, frame_markers: bool = False):
+        self.file = open(path, "w")
+        self.frame_markers = frame_markers
+
+    def start_frame(self):
+        if self.frame_markers:
+            self.file.write(FRAME_MARKER_TEXT + "\n")
+
+    def write(self, samples: np.ndarray):
+        self.file.write("\n".join(map(str, samples.tolist())) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class BinaryWriter(StreamWriter):
+    """Appends raw little-endian samples (uint16, or float32 for that sample format)"""
+
+    def __init__(self, path: str, dtype: str = "<u2", marker: Optional[float] = None):
+        self.file = open(path, "wb")
+        self.dtype = dtype
+        self.marker = marker
+
+    def start_frame(self):
+        if self.marker is not None:
+            self.file.write(np.asarray([self.marker]).astype(self.dtype).tobytes())
+
+    def write(self, samples: np.ndarray):
+        self.file.write(samples.astype(self.dtype).tobytes())
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SocketWriter(StreamWriter):
+    """Serves the stream to the first client that connects"""
+
+    def __init__(self, host: str, port: int, dtype: str = "<u2", marker: Optional[float] = None):
+        self.dtype = dtype
+        self.marker = marker
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(1)
+        print(f"Waiting for visualizer on tcp://{host}:{port} ...")
+        self.client, address = self.server.accept()
+        print(f"Client connected from {address[0]}:{address[1]}")
+
+    def start_frame(self):
+        if self.marker is not None:
+            self.client.sendall(np.asarray([self.marker]).astype(self.dtype).tobytes())
+
+    def write(self, samples: np.ndarray):
+        self.client.sendall(samples.astype(self.dtype).tobytes())
+
+    def close(self):
+        self.client.close()
+        self.server.close()
+
+
+class ShmWriter(StreamWriter):
+    """Publishes whole rows to a shared-memory frame segment"""
+
+    def __init__(self, name: str, width: int, height: int, bit_depth: int = 10):
+        self.producer = ShmFrameProducer(name, width, height, bit_depth)
+        self.width = width
+        self.pending = np.empty(0, dtype=np.uint16)
+
+    def start_frame(self):
+        self.producer.start_frame()
+        self.pending = np.empty(0, dtype=np.uint16)
+
+    def write(self, samples: np.ndarray):
+        # The segment only publishes complete rows; carry the remainder over
+        data = np.concatenate([self.pending, samples])
+        rows = len(data) // self.width
+        if rows:
+            self.producer.write_rows(data[:rows * self.width].reshape(rows, self.width))
+        self.pending = data[rows * self.width:]
+
+    def close(self):
+        self.producer.close()
+
+
+class FPGASimulator:
+    """Paces frame samples into a writer according to the configured pattern"""
+
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.rng = np.random.default_rng(config.seed)
+        self.report = SimulatorReport()
+
+    def build_frame(self) -> np.ndarray:
+        """Flat sample sequence for one frame"""
+        cfg = self.config
+        if cfg.source == "replay":
+            if not cfg.replay:
+                raise ValueError("--replay is required when --source replay is used")
+            return load_capture(cfg.replay, cfg.sample_format)
+        return mandelbrot_samples(
+            cfg.width, cfg.height, cfg.max_iter, cfg.center_x, cfg.center_y, cfg.zoom,
+            cfg.sample_format
+        ).ravel()
+
+    def create_writer(self) -> StreamWriter:
+        cfg = self.config
+        dtype, max_value = SAMPLE_FORMATS[cfg.sample_format]
+        marker = FRAME_MARKERS.get(cfg.sample_format) if cfg.frame_markers else None
+        if cfg.frame_markers and marker is None and cfg.format in ("binary", "socket"):
+            raise ValueError(f"{cfg.sample_format} samples have no frame marker; frames are split by sample count")
+        if cfg.format == "text":
+            return TextWriter(cfg.output, cfg.frame_markers)
+        if cfg.format == "binary":
+            return BinaryWriter(cfg.output, dtype, marker)
+        if cfg.format == "socket":
+            return SocketWriter(cfg.host, cfg.port, dtype, marker)
+        if cfg.format == "shm":
+            if cfg.sample_format == "float32":
+                raise ValueError("Shared-memory frames carry uint16 samples; use --sample-format uint16")
+            return ShmWriter(cfg.shm_name, cfg.width, cfg.height, int(max_value).bit_length())
+        raise ValueError(f"Unknown format: {cfg.format}")
+
+    def _chunks(self, frame: np.ndarray) -> Iterator[np.ndarray]:
+        """Split a frame into writes according to the burst pattern"""
+        cfg = self.config
+        position = 0
+        while position < len(frame):
+            size = cfg.chunk
+            if cfg.pattern == "jitter":
+                size = int(self.rng.integers(max(1, cfg.chunk // 4), cfg.chunk * 2 + 1))
+            yield frame[position:position + size]
+            position += size
+
+    def _delay_after(self, write_index: int, samples: int) -> float:
+        """Seconds the schedule advances after a write"""
+        cfg = self.config
+        if cfg.rate <= 0:
+            return 0.0
+        nominal = samples / cfg.rate
+        if cfg.pattern == "burst":
+            # Back-to-back writes inside a burst, then an idle gap that keeps
+            # the average rate at cfg.rate
+            if (write_index + 1) % cfg.burst_chunks:
+                return 0.0
+            return nominal * cfg.burst_chunks
+        if cfg.pattern == "jitter":
+            return nominal * float(self.rng.uniform(0.5, 1.5))
+        return nominal
+
+    def run(self) -> SimulatorReport:
+        """Emit all frames and return what was sent"""
+        frame = self.build_frame()
+        writer = self.create_writer()
+        start = time.perf_counter()
+        deadline = start
+        try:
+            for _ in range(self.config.frames):
+                writer.start_frame()
+                for chunk in self._chunks(frame):
+                    now = time.perf_counter()
+                    if deadline > now:
+                        time.sleep(deadline - now)
+                    elif self.config.rate > 0:
+                        lateness = now - deadline
+                        if lateness > 0.001:
+                            self.report.late_writes += 1
+                            self.report.max_lateness = max(self.report.max_lateness, lateness)
+
+                    writer.write(chunk)
+                    self.report.samples_emitted += len(chunk)
+                    self.report.chunk_sizes.append(len(chunk))
+                    deadline += self._delay_after(self.report.writes, len(chunk))
+                    self.report.writes += 1
+        finally:
+            self.report.elapsed = time.perf_counter() - start
+            writer.close()
+        return self.report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="FPGA stream simulator and load generator for the Fractal Visualizer",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python fpga_simulator.py --format text --output fractal_data.txt --rate 50000
+  python fpga_simulator.py --format binary --output capture.bin --width 1920 --height 1080 --rate 0
+  python fpga_simulator.py --format socket --port 5555 --pattern burst --burst-chunks 32
+  python fpga_simulator.py --format shm --frames 10 --source replay --replay capture.txt
+  python fpga_simulator.py --format binary --sample-format float32 --output capture.f32 --rate 0
+  python fpga_simulator.py --format text --frames 20 --frame-markers --rate 200000
+"""
+    )
+    defaults = SimulatorConfig()
+    parser.add_argument("--format", choices=FORMATS, default=defaults.format)
+    parser.add_argument("--sample-format", choices=list(SAMPLE_FORMATS), default=defaults.sample_format,
+                        help="int10 board samples, or smooth iteration counts as uint16/float32")
+    parser.add_argument("--output", default=defaults.output, help="Output file (text/binary)")
+    parser.add_argument("--width", type=int, default=defaults.width)
+    parser.add_argument("--height", type=int, default=defaults.height)
+    parser.add_argument("--frames", type=int, default=defaults.frames)
+    parser.add_argument("--frame-markers", action="store_true",
+                        help="Start every frame with a frame marker (text and binary streams)")
+    parser.add_argument("--rate", type=float, default=defaults.rate,
+                        help="Average samples per second (0 = as fast as possible)")
+    parser.add_argument("--chunk", type=int, default=defaults.chunk, help="Samples per write")
+    parser.add_argument("--pattern", choices=PATTERNS, default=defaults.pattern)
+    parser.add_argument("--burst-chunks", type=int, default=defaults.burst_chunks)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--source", choices=["mandelbrot", "replay"], default=defaults.source)
+    parser.add_argument("--replay", help="Recorded capture to replay (.txt or .bin)")
+    parser.add_argument("--max-iter", type=int, default=defaults.max_iter)
+    parser.add_argument("--center-x", type=float, default=defaults.center_x)
+    parser.add_argument("--center-y", type=float, default=defaults.center_y)
+    parser.add_argument("--zoom", type=float, default=defaults.zoom)
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--shm-name", default=defaults.shm_name)
+    parser.add_argument("--report", help="Write the emission report as JSON to this file")
+    args = parser.parse_args()
+
+    config = SimulatorConfig(**{
+        name: getattr(args, name) for name in SimulatorConfig.__dataclass_fields__
+    })
+
+    try:
+        report = FPGASimulator(config).run()
+    except KeyboardInterrupt:
+        print("\nSimulation interrupted")
+        sys.exit(1)
+
+    summary = report.to_dict()
+    print(f"Emitted {report.samples_emitted:,} samples in {report.elapsed:.2f}s "
+          f"({report.samples_per_second:,.0f} samples/s, {report.late_writes} late writes)")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"config": asdict(config), "report": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Multi-frame sample streams: frame boundaries and a ring of recent frames.
+
+A capture may carry a sequence of frames. A frame ends when it has received
+width x height samples, or earlier at a frame marker:
+
+    text     a line reading FRAME (any other non-numeric line is skipped)
+    binary   the sample value FRAME_MARKERS[sample_format], chosen outside
+             that format's valid range: 0xFFFF for 10-bit samples and -1.0
+             for float32. uint16 captures use the whole 16-bit range, so they
+             can only be split by sample count.
+
+A marker starts a new frame; one at the very start of a frame is a no-op, so
+writers may mark every frame including the first.
+
+FrameRing keeps the most recent finished frames for scrubbing without
+re-reading the source. Its slots are one preallocated (capacity, height,
+width) float32 block; finishing a frame copies it into the oldest slot
+together with a copy of its histogram, so the live frame buffer (which may
+be the mapped session checkpoint) is reused for the next frame.
+
+The ingest thread pushes while the UI thread looks frames up, so the ring is
+guarded by a lock, and the frame on screen is pinned: push never picks its
+slot, so its data can be read outside the lock while newer frames arrive.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from frame_stats import StreamingHistogram
+
+FRAME_MARKER_TEXT = "FRAME"
+FRAME_MARKERS: Dict[str, float] = {"int10": 0xFFFF, "float32": -1.0}
+FRAME_RING_SIZE = 8
+# Upper bound on the ring's memory; large frames get fewer slots
+FRAME_RING_BYTES = 1 << 30
+
+
+@dataclass
+class RingFrame:
+    """A finished frame held in the ring"""
+    sequence: int                  # Position in the stream (0 = first frame)
+    slot: int
+    pixels: int                    # Samples received; fewer than data.size if cut short
+    histogram: StreamingHistogram
+    data: np.ndarray               # (height, width) view of the slot
+
+    @property
+    def complete(self) -> bool:
+        return self.pixels >= self.data.size
+
+
+def marker_splits(samples: np.ndarray, sample_format: str) -> List[np.ndarray]:
+    """Split raw binary samples at the format's frame markers (markers removed)"""
+    marker = FRAME_MARKERS.get(sample_format)
+    if marker is None:
+        return [samples]
+    positions = np.flatnonzero(samples == np.asarray(marker, dtype=samples.dtype))
+    if not len(positions):
+        return [samples]
+    bounds = np.concatenate(([-1], positions, [len(samples)]))
+    return [samples[start + 1:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+class FrameRing:
+    """Bounded ring of finished frames in preallocated buffers"""
+
+    def __init__(self, capacity: int = FRAME_RING_SIZE, max_bytes: int = FRAME_RING_BYTES):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.buffer: Optional[np.ndarray] = None   # (slots, height, width)
+        self.frames: List[RingFrame] = []          # Oldest first
+        self.next_sequence = 0
+        self.pinned: Optional[int] = None          # Sequence of the frame on screen (never overwritten)
+        self._lock = threading.Lock()              # Ingest thread pushes, UI thread reads
+
+    @property
+    def slots(self) -> int:
+        return 0 if self.buffer is None else len(self.buffer)
+
+    def _allocate(self, shape: Tuple[int, int]):
+        frame_bytes = shape[0] * shape[1] * np.dtype(np.float32).itemsize
+        slots = max(1, min(self.capacity, self.max_bytes // max(frame_bytes, 1)))
+        self.buffer = np.empty((slots,) + tuple(shape), dtype=np.float32)
+        self.frames = []
+
+    def push(self, frame: np.ndarray, pixels: int, histogram: StreamingHistogram) -> Optional[RingFrame]:
+        """
+        Copy a finished frame into the oldest unpinned slot; None when the ring
+        is disabled or its only slot holds the pinned frame
+        """
+        with self._lock:
+            sequence = self.next_sequence
+            self.next_sequence += 1
+            if self.capacity <= 0:
+                return None
+            if self.buffer is None or self.buffer.shape[1:] != frame.shape:
+                self._allocate(frame.shape)
+            if len(self.frames) < self.slots:
+                slot = len(self.frames)
+            else:
+                victim = next((index for index, entry in enumerate(self.frames)
+                               if entry.sequence != self.pinned), None)
+                if victim is None:
+                    return None
+                slot = self.frames.pop(victim).slot
+            np.copyto(self.buffer[slot], frame)
+            entry = RingFrame(sequence, slot, pixels, histogram.copy(), self.buffer[slot])
+            self.frames.append(entry)
+            return entry
+
+    def get(self, sequence: int) -> Optional[RingFrame]:
+        """The frame with this sequence number, if it is still held"""
+        with self._lock:
+            return next((entry for entry in self.frames if entry.sequence == sequence), None)
+
+    def snapshot(self) -> List[RingFrame]:
+        """The frames held right now, oldest first"""
+        with self._lock:
+            return list(self.frames)
+
+    def pin(self, sequence: Optional[int]):
+        """Keep this frame's slot from being reused (None = nothing on screen from the ring)"""
+        with self._lock:
+            self.pinned = sequence
+
+    def clear(self):
+        """Forget the frames and the stream position (the buffer is kept for reuse)"""
+        with self._lock:
+            self.frames = []
+            self.next_sequence = 0
+            self.pinned = None
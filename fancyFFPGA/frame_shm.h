@@ -0,0 +1,116 @@
+// frame_shm.h
+// Shared-memory frame producer for the Enhanced Fractal Visualizer.
+// The segment layout matches frame_transport.py: a 64-byte header followed by
+// height x width little-endian uint16 samples. Rows are written first and the
+// rows_complete counter is published afterwards with release semantics, so the
+// visualizer can render every row below the counter as soon as it advances.
+//
+// Usage (POSIX / Cygwin):
+//   FrameShm shm;
+//   frame_shm_open(&shm, "ffpga_frame", width, height, 10);
+//   ... fill frame_shm_row(&shm, y) ... frame_shm_publish_rows(&shm, y + 1);
+//   frame_shm_close(&shm, 0);  // keep the segment for the visualizer
+
+#ifndef FRAME_SHM_H
+#define FRAME_SHM_H
+
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+#define FRAME_SHM_MAGIC        "FFSM"
+#define FRAME_SHM_VERSION      1
+#define FRAME_SHM_HEADER_SIZE  64
+
+typedef struct {
+    char     magic[4];          // "FFSM"
+    uint16_t version;           // Layout version
+    uint16_t header_size;       // Offset of the sample body
+    uint32_t width;             // Frame width in pixels
+    uint32_t height;            // Frame height in pixels
+    uint32_t bit_depth;         // Significant bits per sample
+    uint32_t rows_complete;     // Rows fully written (published last)
+    uint32_t frame_id;          // Incremented for every new frame
+    uint8_t  reserved[FRAME_SHM_HEADER_SIZE - 28];
+} FrameShmHeader;
+
+typedef struct {
+    int             fd;         // Shared-memory file descriptor
+    size_t          size;       // Mapped size in bytes
+    FrameShmHeader* header;     // Mapped header
+    uint16_t*       samples;    // Mapped sample body
+    char            name[64];   // Segment name (with leading '/')
+} FrameShm;
+
+// Create (or reuse) the segment and initialise the header
+// Returns: 1 on success, 0 on failure
+static int frame_shm_open(FrameShm* shm, const char* name,
+                          uint32_t width, uint32_t height, uint32_t bit_depth) {
+    memset(shm, 0, sizeof(*shm));
+    snprintf(shm->name, sizeof(shm->name), "/%s", name);
+    shm->size = FRAME_SHM_HEADER_SIZE + (size_t)width * height * sizeof(uint16_t);
+
+    shm->fd = shm_open(shm->name, O_CREAT | O_RDWR, 0600);
+    if (shm->fd < 0) {
+        perror("shm_open");
+        return 0;
+    }
+    if (ftruncate(shm->fd, (off_t)shm->size) != 0) {
+        perror("ftruncate");
+        close(shm->fd);
+        return 0;
+    }
+
+    void* base = mmap(NULL, shm->size, PROT_READ | PROT_WRITE, MAP_SHARED, shm->fd, 0);
+    if (base == MAP_FAILED) {
+        perror("mmap");
+        close(shm->fd);
+        return 0;
+    }
+
+    shm->header = (FrameShmHeader*)base;
+    shm->samples = (uint16_t*)((char*)base + FRAME_SHM_HEADER_SIZE);
+
+    uint32_t previous_id = memcmp(shm->header->magic, FRAME_SHM_MAGIC, 4) == 0 ? shm->header->frame_id : 0;
+    __atomic_store_n(&shm->header->rows_complete, 0, __ATOMIC_RELEASE);
+    memcpy(shm->header->magic, FRAME_SHM_MAGIC, 4);
+    shm->header->version = FRAME_SHM_VERSION;
+    shm->header->header_size = FRAME_SHM_HEADER_SIZE;
+    shm->header->width = width;
+    shm->header->height = height;
+    shm->header->bit_depth = bit_depth;
+    // New frame id last so consumers re-read the geometry above
+    __atomic_store_n(&shm->header->frame_id, previous_id + 1, __ATOMIC_RELEASE);
+    return 1;
+}
+
+// Pointer to the first sample of row y
+static inline uint16_t* frame_shm_row(FrameShm* shm, uint32_t y) {
+    return shm->samples + (size_t)y * shm->header->width;
+}
+
+// Make rows [0, rows_complete) visible to the consumer
+static inline void frame_shm_publish_rows(FrameShm* shm, uint32_t rows_complete) {
+    __atomic_store_n(&shm->header->rows_complete, rows_complete, __ATOMIC_RELEASE);
+}
+
+// Start a new frame with the same geometry
+static inline void frame_shm_new_frame(FrameShm* shm) {
+    __atomic_store_n(&shm->header->rows_complete, 0, __ATOMIC_RELEASE);
+    __atomic_add_fetch(&shm->header->frame_id, 1, __ATOMIC_RELEASE);
+}
+
+// Unmap the segment; unlink removes it for every process
+static void frame_shm_close(FrameShm* shm, int unlink) {
+    if (shm->header) munmap(shm->header, shm->size);
+    if (shm->fd >= 0) close(shm->fd);
+    if (unlink) shm_unlink(shm->name);
+    shm->header = NULL;
+    shm->samples = NULL;
+}
+
+#endif // FRAME_SHM_H
@@ -0,0 +1,136 @@
+"""
+Running statistics of the frame being ingested.
+
+StreamingHistogram keeps a fixed-bin histogram of the normalized samples
+(0-1) that is updated with np.bincount on each newly ingested chunk, so its
+cost is proportional to the new samples rather than to the frame. Bounded
+(in-set) pixels, stored as exactly 1.0, are counted separately and left out
+of the equalization, as USE_HISTOGRAM does in C-FFPGAv2/ffpga.c.
+
+The equalization table maps palette LUT positions to the fraction of escaped
+samples at or below them; indexing it like a palette LUT (position =
+int(value * (size - 1))) turns any frame into its histogram-equalized form,
+and composing it with the palette folds the equalization into the LUT.
+
+The same update also keeps the running minimum, maximum and sum of the
+escaped samples, and percentiles are read off the cumulative counts, so the
+frame's levels (used by automatic exposure/contrast) are known at every
+chunk without another pass over the frame.
+"""
+
+import itertools
+
+import numpy as np
+
+HISTOGRAM_BINS = 1024
+# Versions are unique across histograms, so a version alone identifies the
+# counts a cached table or level was derived from
+_versions = itertools.count(1)
+
+
+class StreamingHistogram:
+    """Histogram of normalized samples, updated chunk by chunk"""
+
+    def __init__(self, bins: int = HISTOGRAM_BINS):
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.interior = 0          # Samples equal to 1.0 (bounded orbits)
+        self.minimum = np.inf      # Of the escaped samples
+        self.maximum = -np.inf
+        self.sum = 0.0
+        self.version = next(_versions)  # Changes on every update
+        self.stale = False         # Frame data changed in place; rebuild before use
+
+    def reset(self):
+        self.counts[:] = 0
+        self.interior = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.sum = 0.0
+        self.stale = False
+        self.version = next(_versions)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def escaped(self) -> int:
+        return self.total - self.interior
+
+    @property
+    def mean(self) -> float:
+        """Mean of the escaped samples (NaN before any escaped)"""
+        escaped = self.escaped
+        return self.sum / escaped if escaped else float("nan")
+
+    def add(self, values: np.ndarray):
+        """Count a chunk of normalized samples"""
+        values = np.asarray(values).reshape(-1)
+        if not values.size:
+            return
+        bins = np.minimum((values * self.bins).astype(np.intp), self.bins - 1)
+        self.counts += np.bincount(bins, minlength=self.bins)
+        interior = int(np.count_nonzero(values >= 1.0))
+        self.interior += interior
+        if interior < values.size:
+            escaped = values < 1.0
+            self.minimum = min(self.minimum, float(values.min()))
+            self.maximum = max(self.maximum, float(np.max(values, where=escaped, initial=-np.inf)))
+            self.sum += float(values.sum(dtype=np.float64)) - interior  # Interior samples are 1.0
+        self.version = next(_versions)
+
+    def copy(self) -> "StreamingHistogram":
+        """Independent snapshot (with a version of its own)"""
+        snapshot = StreamingHistogram(self.bins)
+        snapshot.counts[:] = self.counts
+        snapshot.interior = self.interior
+        snapshot.minimum, snapshot.maximum, snapshot.sum = self.minimum, self.maximum, self.sum
+        snapshot.stale = self.stale
+        return snapshot
+
+    def rebuild(self, values: np.ndarray):
+        """Recount from scratch (after samples were rewritten in place, e.g. by a refine)"""
+        self.reset()
+        self.add(values)
+
+    def percentile(self, q: float) -> float:
+        """
+        q-th percentile (0-100) of the escaped samples, interpolated within
+        its bin (resolution 1 / bins) and kept within [minimum, maximum];
+        NaN before any escaped.
+        """
+        escaped = self.counts.copy()
+        escaped[-1] -= self.interior
+        cumulative = np.cumsum(escaped)
+        if cumulative[-1] <= 0:
+            return float("nan")
+        rank = np.clip(q, 0.0, 100.0) / 100.0 * cumulative[-1]
+        index = min(int(np.searchsorted(cumulative, rank)), self.bins - 1)
+        before = cumulative[index - 1] if index else 0
+        fraction = (rank - before) / escaped[index] if escaped[index] else 0.0
+        return float(np.clip((index + fraction) / self.bins, self.minimum, self.maximum))
+
+    def equalization_table(self, size: int) -> np.ndarray:
+        """
+        float32 table of `size` entries: entry k is the equalized value of
+        samples at position k / (size - 1). The identity when nothing escaped.
+        """
+        positions = np.arange(size, dtype=np.float32) / np.float32(size - 1)
+        escaped = self.counts.copy()
+        escaped[-1] -= self.interior
+        cumulative = np.cumsum(escaped)
+        if cumulative[-1] <= 0:
+            return positions
+        cdf = (cumulative / cumulative[-1]).astype(np.float32)
+        bins = np.minimum((positions * self.bins).astype(np.intp), self.bins - 1)
+        table = cdf[bins]
+        table[positions >= 1.0] = 1.0
+        return table
+
+
+def histogram_of(values: np.ndarray, bins: int = HISTOGRAM_BINS) -> StreamingHistogram:
+    """A histogram of a whole frame in one pass"""
+    histogram = StreamingHistogram(bins)
+    histogram.add(values)
+    return histogram
@@ -0,0 +1,259 @@
+"""
+Shared-memory frame transport between the fractal generators and the visualizer.
+
+A frame lives in a single POSIX shared-memory segment (see frame_shm.h for the
+C producer). All fields are little-endian:
+
+    offset  type       field
+    0       char[4]    magic "FFSM"
+    4       uint16     layout version
+    6       uint16     header size in bytes (offset of the sample body)
+    8       uint32     width
+    12      uint32     height
+    16      uint32     bit depth (significant bits per sample, e.g. 10)
+    20      uint32     rows complete (published last by the producer)
+    24      uint32     frame id (incremented whenever a new frame starts)
+    28      ...        reserved, zero
+    64      uint16     samples[height][width]
+
+The producer fills whole rows and then advances the rows-complete counter, so a
+consumer may read every row below the counter without further locking.
+"""
+
+import sys
+import time
+import struct
+import argparse
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+SHM_MAGIC = b"FFSM"
+SHM_VERSION = 1
+SHM_HEADER_SIZE = 64
+SHM_HEADER_FORMAT = "<4sHHIIIII"
+SHM_ROWS_OFFSET = 20
+SHM_FRAME_ID_OFFSET = 24
+SHM_DEFAULT_NAME = "ffpga_frame"
+
+
+@dataclass
+class ShmFrameHeader:
+    """Decoded shared-memory frame header"""
+    width: int
+    height: int
+    bit_depth: int = 10
+    rows_complete: int = 0
+    frame_id: int = 0
+    version: int = SHM_VERSION
+    header_size: int = SHM_HEADER_SIZE
+
+    @property
+    def body_size(self) -> int:
+        return self.width * self.height * 2
+
+    @property
+    def max_value(self) -> int:
+        return (1 << self.bit_depth) - 1
+
+    def pack(self) -> bytes:
+        """Serialize the header, padded to its declared size"""
+        packed = struct.pack(
+            SHM_HEADER_FORMAT, SHM_MAGIC, self.version, self.header_size,
+            self.width, self.height, self.bit_depth, self.rows_complete, self.frame_id
+        )
+        return packed.ljust(self.header_size, b"\0")
+
+    @classmethod
+    def unpack(cls, buffer) -> "ShmFrameHeader":
+        """Parse a header from the start of a shared-memory buffer"""
+        magic, version, header_size, width, height, bit_depth, rows, frame_id = struct.unpack_from(
+            SHM_HEADER_FORMAT, buffer, 0
+        )
+        if magic != SHM_MAGIC:
+            raise ValueError(f"Invalid frame segment magic: {magic!r}")
+        if version != SHM_VERSION:
+            raise ValueError(f"Unsupported frame segment version: {version}")
+        return cls(width, height, bit_depth, rows, frame_id, version, header_size)
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing its lifetime to this process"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    shm = shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching registers the segment with the resource tracker,
+    # which would unlink the producer's segment when the visualizer exits.
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class ShmFrameConsumer:
+    """Zero-copy reader for frames published in shared memory"""
+
+    def __init__(self, name: str = SHM_DEFAULT_NAME):
+        self.name = name
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.header: Optional[ShmFrameHeader] = None
+        self.samples: Optional[np.ndarray] = None
+        self.rows_read = 0
+        self.frame_id: Optional[int] = None
+        self._attach()
+
+    def _attach(self):
+        """Map the segment and build the sample view"""
+        self.close()
+        self.shm = _attach_shared_memory(self.name)
+        self._map_samples(ShmFrameHeader.unpack(self.shm.buf))
+
+    def _map_samples(self, header: ShmFrameHeader):
+        """(Re)build the NumPy view over the sample body"""
+        if header.header_size + header.body_size > self.shm.size:
+            # Producer grew the segment for a larger frame; remap it
+            self.samples = None
+            self.shm.close()
+            self.shm = _attach_shared_memory(self.name)
+        self.header = header
+        self.samples = np.ndarray(
+            (header.height, header.width), dtype="<u2",
+            buffer=self.shm.buf, offset=header.header_size
+        )
+
+    @property
+    def scale(self) -> float:
+        """Factor that maps raw samples onto the 0-1 range"""
+        return 1.0 / self.header.max_value
+
+    def poll(self) -> Optional[Tuple[int, int, bool]]:
+        """
+        Check the producer's progress.
+        Returns (first_new_row, rows_complete, new_frame) when rows were
+        published since the last call, otherwise None.
+        """
+        # frame_id, rows, frame_id: the mirror of the producer storing rows = 0
+        # before bumping frame_id (frame_shm.h), so the row count belongs to
+        # the frame whose id was read twice and never to an older frame
+        while True:
+            frame_id, = struct.unpack_from("<I", self.shm.buf, SHM_FRAME_ID_OFFSET)
+            rows, = struct.unpack_from("<I", self.shm.buf, SHM_ROWS_OFFSET)
+            if struct.unpack_from("<I", self.shm.buf, SHM_FRAME_ID_OFFSET)[0] == frame_id:
+                break
+        new_frame = frame_id != self.frame_id
+        if new_frame:
+            header = ShmFrameHeader.unpack(self.shm.buf)
+            if (header.width, header.height, header.bit_depth) != (
+                self.header.width, self.header.height, self.header.bit_depth
+            ):
+                self._map_samples(header)
+            self.frame_id = frame_id
+            self.rows_read = 0
+
+        rows = min(rows, self.header.height)
+        if rows < self.rows_read:
+            # Counter went backwards without a new frame id: producer restarted
+            self.rows_read = 0
+            new_frame = True
+        if rows == self.rows_read and not new_frame:
+            return None
+
+        first_row = self.rows_read
+        self.rows_read = rows
+        return first_row, rows, new_frame
+
+    def close(self):
+        """Release the mapping (the segment itself is owned by the producer)"""
+        self.samples = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+
+class ShmFrameProducer:
+    """Reference producer matching frame_shm.h, used for tests and simulation"""
+
+    def __init__(self, name: str = SHM_DEFAULT_NAME, width: int = 256, height: int = 256,
+                 bit_depth: int = 10):
+        self.name = name
+        self.header = ShmFrameHeader(width, height, bit_depth)
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=True, size=SHM_HEADER_SIZE + self.header.body_size
+        )
+        self.shm.buf[:SHM_HEADER_SIZE] = self.header.pack()
+        self.samples = np.ndarray(
+            (height, width), dtype="<u2", buffer=self.shm.buf, offset=SHM_HEADER_SIZE
+        )
+
+    def start_frame(self):
+        """Begin a new frame: reset the row counter and bump the frame id"""
+        self.header.rows_complete = 0
+        self.header.frame_id = (self.header.frame_id + 1) & 0xFFFFFFFF
+        struct.pack_into("<I", self.shm.buf, SHM_ROWS_OFFSET, 0)
+        struct.pack_into("<I", self.shm.buf, SHM_FRAME_ID_OFFSET, self.header.frame_id)
+
+    def write_rows(self, rows: np.ndarray):
+        """Append whole rows of samples and publish them"""
+        start = self.header.rows_complete
+        end = min(start + rows.shape[0], self.header.height)
+        self.samples[start:end] = rows[:end - start]
+        self.header.rows_complete = end
+        struct.pack_into("<I", self.shm.buf, SHM_ROWS_OFFSET, end)
+
+    def publish_frame(self, frame: np.ndarray, rows_per_step: int = 1, delay: float = 0.0):
+        """Stream a complete frame in row batches"""
+        self.start_frame()
+        for start in range(0, self.header.height, rows_per_step):
+            self.write_rows(frame[start:start + rows_per_step])
+            if delay:
+                time.sleep(delay)
+
+    def close(self, unlink: bool = True):
+        """Release the mapping and optionally remove the segment"""
+        self.samples = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def synthetic_frame(width: int, height: int, bit_depth: int = 10) -> np.ndarray:
+    """Deterministic ring pattern used when no real samples are available"""
+    y, x = np.mgrid[0:height, 0:width]
+    radius = np.hypot(x - width / 2, y - height / 2) / max(width, height)
+    values = 0.5 + 0.5 * np.sin(radius * 40 * np.pi)
+    return np.round(values * ((1 << bit_depth) - 1)).astype(np.uint16)
+
+
+def main():
+    """Run the reference producer from the command line"""
+    parser = argparse.ArgumentParser(description="Reference shared-memory frame producer")
+    parser.add_argument("--name", default=SHM_DEFAULT_NAME, help="Shared-memory segment name")
+    parser.add_argument("--width", type=int, default=256)
+    parser.add_argument("--height", type=int, default=256)
+    parser.add_argument("--bit-depth", type=int, default=10)
+    parser.add_argument("--rows-per-step", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.01, help="Seconds between row batches")
+    parser.add_argument("--frames", type=int, default=1, help="Number of frames to publish")
+    args = parser.parse_args()
+
+    producer = ShmFrameProducer(args.name, args.width, args.height, args.bit_depth)
+    frame = synthetic_frame(args.width, args.height, args.bit_depth)
+    try:
+        for _ in range(args.frames):
+            producer.publish_frame(frame, args.rows_per_step, args.delay)
+        print(f"Published {args.frames} frame(s) to shm://{args.name}; Ctrl+C to remove the segment")
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        producer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Golden comparison of a capture against a reference frame.
+
+Validating a bitstream by looking at its image misses off-by-one iteration
+counts and single bad rows. GoldenComparator pairs the frame being ingested
+with a reference frame of the same shape, either rendered by the built-in
+compute engine (exactly what fpga_simulator emits for the view) or the first
+frame of a second capture, and compares samples as they arrive:
+
+    mismatches          samples differing from the reference by more than
+                        the tolerance
+    max error           largest absolute difference, and where it is
+    first divergent     first sample (in stream order) over the tolerance,
+                        i.e. the first row where the board went wrong
+
+Samples arrive as a growing prefix of the row-major frame, so each update
+compares only the range ingested since the previous one, in fixed-size
+chunks through preallocated scratch buffers: a few vectorized passes per
+sample and no allocation, which keeps up with ingest on 8192 x 8192 frames.
+No per-pixel error map is stored; the diff heatmap recomputes |frame -
+reference| over the visible rows when a frame is rendered, like the rest of
+the render path.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from fractal_engine import SAMPLE_FORMATS
+from fpga_simulator import mandelbrot_samples
+from frame_sequence import FRAME_MARKER_TEXT, marker_splits
+
+# Samples compared per vectorized pass (bounds the scratch buffers to 5 MiB)
+COMPARE_CHUNK = 1 << 20
+# Diff heatmap: matching pixels keep 1/4 of their brightness, mismatches go
+# from dark red (just over the tolerance) through yellow to white (max error)
+HEATMAP_SIZE = 256
+HEATMAP_DIM_SHIFT = 2
+REFERENCE_ENGINE = "engine"
+
+
+def _heatmap_lut(size: int = HEATMAP_SIZE) -> np.ndarray:
+    position = np.linspace(0.0, 1.0, size)
+    red = np.clip(0.35 + position * 1.95, 0, 1)
+    green = np.clip(position * 2.0 - 0.6, 0, 1)
+    blue = np.clip(position * 3.0 - 2.0, 0, 1)
+    return (np.stack([red, green, blue], axis=1) * 255).astype(np.uint8)
+
+
+HEATMAP_LUT = _heatmap_lut()
+
+
+def normalize_samples(samples: np.ndarray, sample_format: str) -> np.ndarray:
+    """Raw samples as the visualizer stores them (valid samples only, 0-1 float32)"""
+    _, max_value = SAMPLE_FORMATS[sample_format]
+    samples = samples[(samples >= 0) & (samples <= max_value)]
+    if samples.dtype == np.float32:
+        return samples.astype(np.float32)
+    return samples.astype(np.float32) / max_value
+
+
+def engine_reference(width: int, height: int, sample_format: str, max_iter: int = 256,
+                     center_x: float = -0.5, center_y: float = 0.0, zoom: float = 1.0) -> np.ndarray:
+    """The frame a correct board streams for this view, normalized like ingested samples"""
+    samples = mandelbrot_samples(width, height, max_iter, center_x, center_y, zoom, sample_format)
+    return normalize_samples(samples.reshape(-1), sample_format).reshape(height, width)
+
+
+def capture_reference(path: Path, sample_format: str, shape: Tuple[int, int], binary: bool) -> np.ndarray:
+    """
+    First frame of a recorded capture (little-endian samples when `binary`,
+    else text; split at frame markers like the live stream), normalized like
+    ingested samples
+    """
+    path = Path(path)
+    height, width = shape
+    if binary:
+        raw = np.fromfile(path, dtype=SAMPLE_FORMATS[sample_format][0])
+        runs = [run for run in marker_splits(raw, sample_format) if run.size]
+        samples = normalize_samples(runs[0], sample_format) if runs else np.empty(0, np.float32)
+    else:
+        _, max_value = SAMPLE_FORMATS[sample_format]
+        values = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line == FRAME_MARKER_TEXT:
+                    if values:
+                        break
+                    continue
+                try:
+                    value = float(line) if sample_format == "float32" else int(line)
+                except ValueError:
+                    continue
+                if 0 <= value <= max_value:
+                    values.append(value)
+                    if len(values) == width * height:
+                        break
+        samples = normalize_samples(np.asarray(values, dtype=np.float32 if sample_format == "float32"
+                                               else np.int64), sample_format)
+    if samples.size < width * height:
+        raise ValueError(f"{path.name} holds {samples.size:,} samples in its first frame, "
+                         f"{width}x{height} needs {width * height:,}")
+    return samples[:width * height].reshape(height, width)
+
+
+@dataclass
+class ComparisonStats:
+    """Running result of comparing the current frame with the reference"""
+    compared: int = 0              # Samples compared (a prefix of the frame)
+    mismatches: int = 0            # Samples over the tolerance
+    max_error: float = 0.0         # Largest |sample - reference|
+    max_error_index: int = -1      # Flat index of max_error (-1 = no error yet)
+    first_divergent: int = -1      # Flat index of the first mismatch (-1 = none)
+    seconds: float = 0.0           # Time spent comparing
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.compared / self.seconds if self.seconds > 0 else 0.0
+
+
+class GoldenComparator:
+    """Incremental comparison of a frame being filled against a reference frame"""
+
+    def __init__(self, reference: np.ndarray, tolerance: float = 0.0, name: str = REFERENCE_ENGINE,
+                 chunk: int = COMPARE_CHUNK):
+        self.reference = np.ascontiguousarray(reference, dtype=np.float32)
+        self.tolerance = tolerance     # In normalized units
+        self.name = name               # "engine" or the reference capture's file name
+        self.chunk = chunk
+        self.stats = ComparisonStats()
+        self._difference = np.empty(chunk, dtype=np.float32)
+        self._mismatch = np.empty(chunk, dtype=bool)
+        self._lock = threading.Lock()  # Ingest thread updates, a loader thread catches up
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.reference.shape
+
+    @property
+    def width(self) -> int:
+        return self.reference.shape[1]
+
+    def row(self, index: int) -> Optional[int]:
+        """Row of a flat index, None for -1"""
+        return None if index < 0 else index // self.width
+
+    def reset(self):
+        """Start over for a new frame"""
+        with self._lock:
+            self.stats = ComparisonStats()
+
+    def advance(self, frame: np.ndarray, pixels: int) -> int:
+        """
+        Compare the samples the frame received since the last call (its first
+        `pixels` are valid); returns how many were compared. A frame that went
+        back (a new frame in the same buffer) is compared from its start.
+        """
+        with self._lock:
+            stats = self.stats
+            if pixels < stats.compared:
+                stats = self.stats = ComparisonStats()
+            start_time = time.perf_counter()
+            flat = frame.reshape(-1)
+            reference = self.reference.reshape(-1)
+            first = stats.compared
+            for start in range(first, pixels, self.chunk):
+                stop = min(start + self.chunk, pixels)
+                difference = self._difference[:stop - start]
+                np.subtract(flat[start:stop], reference[start:stop], out=difference)
+                np.abs(difference, out=difference)
+                mismatch = np.greater(difference, self.tolerance, out=self._mismatch[:stop - start])
+                count = int(np.count_nonzero(mismatch))
+                if not count:
+                    continue
+                stats.mismatches += count
+                if stats.first_divergent < 0:
+                    stats.first_divergent = start + int(mismatch.argmax())
+                peak = int(difference.argmax())
+                if difference[peak] > stats.max_error:
+                    stats.max_error = float(difference[peak])
+                    stats.max_error_index = start + peak
+            stats.compared = max(pixels, first)
+            stats.seconds += time.perf_counter() - start_time
+            return stats.compared - first
+
+    def overlay(self, rgb: np.ndarray, frame: np.ndarray, rows: int) -> np.ndarray:
+        """
+        Diff heatmap over an (rows, width, 3) uint8 image of the frame's first
+        rows, in place: matching pixels dimmed, mismatches colored by error
+        relative to the largest error in view
+        """
+        error = np.abs(frame[:rows] - self.reference[:rows])
+        mismatch = error > self.tolerance
+        np.right_shift(rgb, HEATMAP_DIM_SHIFT, out=rgb)
+        if mismatch.any():
+            errors = error[mismatch]
+            top = len(HEATMAP_LUT) - 1
+            scale = top / max(float(errors.max()), np.finfo(np.float32).tiny)
+            rgb[mismatch] = HEATMAP_LUT[np.minimum(errors * scale, top).astype(np.intp)]
+        return rgb
+
+    def summary(self, max_value: float) -> str:
+        """One-line report; errors in raw sample units (LSBs) for integer formats"""
+        stats = self.stats
+        if not stats.compared:
+            return f"Reference {self.name}: waiting for samples"
+        if not stats.mismatches:
+            return f"Reference {self.name}: {stats.compared:,} samples match"
+        row = self.row(stats.first_divergent)
+        peak_row = self.row(stats.max_error_index)
+        error = stats.max_error * max_value
+        error_text = f"{error:.4g}" if max_value == 1.0 else f"{error:.0f} LSB"
+        return (f"Reference {self.name}: {stats.mismatches:,} of {stats.compared:,} samples differ • "
+                f"max error {error_text} (row {peak_row}) • first divergent row {row}")
@@ -2,6 +2,12 @@
 #include <stdlib.h>
 #include <time.h>
 
+// Compile with -DUSE_FRAME_SHM to stream samples to the visualizer
+// (python fancyFractal.py shm://ffpga_frame) while the image is generated
+#ifdef USE_FRAME_SHM
+#include "frame_shm.h"
+#endif
+
 // Função para mapear iterações para cores (paleta de cores do Mandelbrot)
 void get_mandelbrot_color(int iter, int max_iter, unsigned char* r, unsigned char* g, unsigned char* b) {
     if (iter >= max_iter) {
@@ -147,6 +153,14 @@ int main() // ponto de entrada
         return 1;
     }
     
+#ifdef USE_FRAME_SHM
+    // Segmento de memória compartilhada com amostras de 10 bits por pixel
+    FrameShm frame_shm;
+    const char* shm_name = getenv("FRAME_SHM_NAME");
+    int shm_ok = frame_shm_open(&frame_shm, shm_name ? shm_name : "ffpga_frame",
+                                img_width, img_height, 10);
+#endif
+    
     int px = 0;  // coluna atual (x)
     int py = 0;  // linha atual (y)
     
@@ -207,8 +221,18 @@ int main() // ponto de entrada
             image_data[pixel_index + 1] = g; // Green  
             image_data[pixel_index + 2] = b; // Blue
             
+#ifdef USE_FRAME_SHM
+            if (shm_ok) {
+                // Amostra de 10 bits (0-1023), mesmo formato do FPGA
+                frame_shm_row(&frame_shm, py)[px] = (uint16_t)((iter * 1023) / max_iter);
+            }
+#endif
+            
             px++;  // próxima coluna
         }
+#ifdef USE_FRAME_SHM
+        if (shm_ok) frame_shm_publish_rows(&frame_shm, py + 1);  // linha pronta
+#endif
         py++;  // próxima linha
     }
     
@@ -238,6 +262,9 @@ int main() // ponto de entrada
     
     // Libera a memória
     free(image_data);
+#ifdef USE_FRAME_SHM
+    if (shm_ok) frame_shm_close(&frame_shm, 0);  // mantém o segmento para o visualizador
+#endif
     
     printf("\n=== PROCESSO CONCLUÍDO ===\n");
     printf("A imagem foi salva no mesmo diretório do executável.\n");
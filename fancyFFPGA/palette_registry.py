@@ -0,0 +1,273 @@
+"""
+Lazy palette registry for the Fractal Visualizer.
+
+Palettes are registered by name from one of three sources and only turned
+into a lookup table (LUT, an (N, 3) uint8 array) the first time a given name
+and resolution is requested:
+
+    function  f(t) -> (N, 3) uint8 for t = linspace(0, 1, N), like the
+              built-in ColorPalette generators
+    array     an (M, 3) LUT (uint8, or floats in 0-1) resampled to N entries
+    file      a gradient file, parsed on first use:
+                .npy           (M, 3) LUT as above
+                .json          {"stops": [[position, color], ...]} or a bare
+                               list of stops; color is "#rrggbb" or [r, g, b]
+                .gpl/.txt/.csv rows of "r g b" (evenly spaced) or
+                               "position r g b"; other lines are ignored
+
+Built LUTs are kept in memory and, when a cache directory is given, saved as
+.npy files keyed by name, resolution and a fingerprint of the source, so a
+changed generator or gradient file is never served from a stale cache.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+MIN_LUT_SIZE = 1024
+MAX_LUT_SIZE = 65536
+GRADIENT_SUFFIXES = (".npy", ".json", ".gpl", ".txt", ".csv")
+
+PaletteSource = Union[Callable[[np.ndarray], np.ndarray], np.ndarray, str, Path]
+
+
+@dataclass
+class RegistryStats:
+    """How palette requests were served"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    generated: int = 0
+
+
+def _parse_color(color) -> Tuple[float, float, float]:
+    """'#rrggbb' or [r, g, b] (0-255) as floats"""
+    if isinstance(color, str):
+        value = color.lstrip("#")
+        if len(value) != 6:
+            raise ValueError(f"Invalid color: {color!r}")
+        return tuple(float(int(value[i:i + 2], 16)) for i in (0, 2, 4))
+    r, g, b = color
+    return float(r), float(g), float(b)
+
+
+def _stops_to_lut(positions: np.ndarray, colors: np.ndarray, size: int) -> np.ndarray:
+    """Piecewise-linear gradient through (position, color) stops"""
+    order = np.argsort(positions, kind="stable")
+    positions, colors = positions[order], colors[order]
+    t = np.linspace(0.0, 1.0, size)
+    channels = [np.interp(t, positions, colors[:, channel]) for channel in range(3)]
+    return np.clip(np.rint(np.column_stack(channels)), 0, 255).astype(np.uint8)
+
+
+def resample_lut(lut: np.ndarray, size: int) -> np.ndarray:
+    """Linearly resample an (M, 3) LUT (uint8, or floats in 0-1) to size entries"""
+    lut = np.asarray(lut)
+    if lut.ndim != 2 or lut.shape[1] != 3 or len(lut) < 1:
+        raise ValueError(f"Palette LUT must have shape (N, 3), got {lut.shape}")
+    if lut.dtype == np.uint8 and len(lut) == size:
+        return lut.copy()
+    colors = lut.astype(np.float64)
+    if lut.dtype.kind == "f":
+        colors = colors * 255.0
+    if len(lut) == 1:
+        colors = np.repeat(colors, 2, axis=0)
+    return _stops_to_lut(np.linspace(0.0, 1.0, len(colors)), colors, size)
+
+
+def load_gradient(path: Union[str, Path], size: int) -> np.ndarray:
+    """Read a gradient file (see module docstring) as a size-entry LUT"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        return resample_lut(np.load(path), size)
+
+    if suffix == ".json":
+        with open(path, "r") as f:
+            data = json.load(f)
+        stops = data["stops"] if isinstance(data, dict) else data
+        if len(stops) < 2:
+            raise ValueError(f"{path}: a gradient needs at least two stops")
+        positions = np.array([float(position) for position, _ in stops])
+        colors = np.array([_parse_color(color) for _, color in stops])
+        return _stops_to_lut(positions, colors, size)
+
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            # Leading numbers only: headers, comments and GIMP color names are skipped
+            values = []
+            for field in line.replace(",", " ").split()[:4]:
+                try:
+                    values.append(float(field))
+                except ValueError:
+                    break
+            if len(values) >= 3:
+                rows.append(values)
+    if len(rows) < 2:
+        raise ValueError(f"{path}: no gradient rows found")
+    if all(len(row) == 4 for row in rows):
+        table = np.array(rows)
+        return _stops_to_lut(table[:, 0], table[:, 1:], size)
+    colors = np.array([row[:3] for row in rows])
+    return _stops_to_lut(np.linspace(0.0, 1.0, len(colors)), colors, size)
+
+
+def _fingerprint(source: PaletteSource) -> str:
+    """Short hash that changes whenever the source would produce a different LUT"""
+    digest = hashlib.sha1()
+    if callable(source):
+        code = getattr(source, "__code__", None)
+        digest.update(f"{getattr(source, '__module__', '')}.{getattr(source, '__qualname__', repr(source))}".encode())
+        if code is not None:
+            digest.update(code.co_code)
+            digest.update(repr(code.co_consts).encode())
+    elif isinstance(source, np.ndarray):
+        digest.update(str(source.dtype).encode() + str(source.shape).encode())
+        digest.update(np.ascontiguousarray(source).tobytes())
+    else:
+        stat = os.stat(source)
+        digest.update(f"{Path(source).resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+class PaletteRegistry:
+    """Named palette sources whose LUTs are built on first use"""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.stats = RegistryStats()
+        self._sources: Dict[str, PaletteSource] = {}
+        self._luts: Dict[Tuple[str, int], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, source: PaletteSource, replace: bool = False):
+        """
+        Add a palette. Nothing is evaluated or read until the palette is
+        requested; re-registering a name requires replace=True.
+        """
+        if name in self._sources and not replace:
+            raise ValueError(f"Palette already registered: {name}")
+        if not callable(source) and not isinstance(source, np.ndarray):
+            path = Path(source)
+            if path.suffix.lower() not in GRADIENT_SUFFIXES:
+                raise ValueError(f"Unsupported gradient file: {path}")
+            if not path.exists():
+                raise FileNotFoundError(path)
+            source = path
+        with self._lock:
+            self._sources[name] = source
+            for key in [key for key in self._luts if key[0] == name]:
+                del self._luts[key]
+
+    def register_file(self, path: Union[str, Path], name: Optional[str] = None,
+                      replace: bool = False) -> str:
+        """Register a gradient file under its stem (or `name`); returns the name"""
+        name = name or Path(path).stem
+        self.register(name, Path(path), replace=replace)
+        return name
+
+    def names(self) -> List[str]:
+        return list(self._sources)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sources
+
+    def get(self, name: str, size: int = MIN_LUT_SIZE) -> np.ndarray:
+        """(size, 3) uint8 LUT of a palette, built on first request"""
+        if not MIN_LUT_SIZE <= size <= MAX_LUT_SIZE:
+            raise ValueError(f"LUT size must be within {MIN_LUT_SIZE}-{MAX_LUT_SIZE}, got {size}")
+        key = (name, size)
+        lut = self._luts.get(key)
+        if lut is not None:
+            self.stats.memory_hits += 1
+            return lut
+        source = self._sources.get(name)
+        if source is None:
+            raise KeyError(name)
+
+        with self._lock:
+            lut = self._luts.get(key)
+            if lut is None:
+                lut = self._load_cached(name, size, source)
+                if lut is None:
+                    lut = self._build(source, size)
+                    self.stats.generated += 1
+                    self._store_cached(name, size, source, lut)
+                lut.setflags(write=False)  # Shared between callers
+                self._luts[key] = lut
+        return lut
+
+    def view(self, size: int) -> "PaletteLUTs":
+        """Read-only mapping of every palette at one resolution"""
+        return PaletteLUTs(self, size)
+
+    @staticmethod
+    def _build(source: PaletteSource, size: int) -> np.ndarray:
+        if callable(source):
+            lut = np.asarray(source(np.linspace(0.0, 1.0, size)))
+            if lut.shape != (size, 3):
+                raise ValueError(f"Palette function returned shape {lut.shape}, expected {(size, 3)}")
+            return lut.astype(np.uint8, copy=False)
+        if isinstance(source, np.ndarray):
+            return resample_lut(source, size)
+        return load_gradient(source, size)
+
+    def _cache_path(self, name: str, size: int, source: PaletteSource) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        safe_name = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+        return self.cache_dir / f"{safe_name}_{size}_{_fingerprint(source)}.npy"
+
+    def _load_cached(self, name: str, size: int, source: PaletteSource) -> Optional[np.ndarray]:
+        path = self._cache_path(name, size, source)
+        if path is None or not path.exists():
+            return None
+        try:
+            lut = np.load(path)
+        except (OSError, ValueError):
+            return None  # Unreadable cache entry: rebuild and overwrite it
+        if lut.shape != (size, 3) or lut.dtype != np.uint8:
+            return None
+        self.stats.disk_hits += 1
+        return lut
+
+    def _store_cached(self, name: str, size: int, source: PaletteSource, lut: np.ndarray):
+        path = self._cache_path(name, size, source)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a concurrent reader never sees half a file
+            temporary = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporary, "wb") as f:
+                np.save(f, lut)
+            os.replace(temporary, path)
+        except OSError:
+            pass  # The disk cache is an optimization only
+
+
+class PaletteLUTs(Mapping):
+    """Dict-like access to the registry's palettes at a fixed LUT size"""
+
+    def __init__(self, registry: PaletteRegistry, size: int):
+        self.registry = registry
+        self.size = size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.registry.get(name, self.size)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.registry.names())
+
+    def __len__(self) -> int:
+        return len(self.registry.names())
+
+    def __contains__(self, name) -> bool:
+        return name in self.registry
@@ -0,0 +1,336 @@
+"""
+Perturbation-theory deep-zoom renderer for the Fractal Visualizer.
+
+Beyond a zoom of about 1e13 neighbouring pixels are no longer distinct in
+float64. Following USE_PERTURBATION in C-FFPGAv2/ffpga.c, a single reference
+orbit Z_n of the view centre C is computed in arbitrary precision (mpmath when
+installed, otherwise the standard decimal module), and every pixel c = C + dc
+only tracks its small deviation dz_n from that orbit in vectorized float64:
+
+    dz_{n+1} = 2 Z_n dz_n + dz_n^2 + dc
+
+Glitches (the pixel orbit diverging from the reference, which destroys the
+relative precision of dz) are detected when |Z_m + dz| < |dz| or when the
+reference orbit runs out, and are fixed by rebasing the pixel onto the start
+of the reference orbit (dz = z, m = 0), so a single reference suffices.
+
+Series approximation (USE_SERIES_APPROX in ffpga.c) skips the first N
+iterations of every pixel: alongside the reference orbit a truncated power
+series dz_n ~ sum_k A_k,n dc^(k+1) is advanced, and every pixel starts at
+iteration N from the series value. N is the last iteration at which the
+highest term is still negligible and a set of probe pixels on the view border,
+iterated exactly, agree with the series.
+
+Perturbation is not bit-identical to MandelbrotEngine at shallow zooms. Both
+iterate in float64, and on long orbits near the boundary rounding sends
+either one a few iterations off the exact count, in different pixels. In
+seahorse valley at zoom 1e4 with max_iter 1000, 112 of 19200 pixels differ,
+and each engine is wrong on most of them. At zooms of 1e12 and deeper the
+direct engine's counts drift while perturbation stays exact, so the
+visualizer switches at DEEP_ZOOM_THRESHOLD, just before that.
+"""
+
+import math
+import time
+import decimal
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from fractal_engine import MandelbrotEngine, EngineStats, ViewPort, ESCAPE_RADIUS_SQ, AA_GRID, _concat_escapes
+
+try:
+    import mpmath
+except ImportError:
+    mpmath = None
+
+# Zoom from which the visualizer switches to perturbation. Float64 pixel
+# coordinates start to collapse around 1e13, and direct escape counts already
+# drift around 1e12; shallower views agree only up to rounding (see above).
+DEEP_ZOOM_THRESHOLD = 1e10
+
+# Decimal digits kept beyond the zoom depth for the reference orbit
+GUARD_DIGITS = 20
+
+SERIES_TERMS = 8          # Number of terms for series approximation (as in ffpga.c)
+MIN_SERIES_ITER = 10      # Minimum iterations worth skipping
+SERIES_TOLERANCE = 1e-9   # Allowed relative series error at the probe pixels
+
+
+@dataclass
+class DeepViewPort:
+    """
+    View whose centre is given as decimal strings, so it can be placed more
+    precisely than float64 allows. Pixel offsets from the centre use the same
+    mapping as ViewPort and are small enough to stay in float64.
+    """
+    width: int = 256
+    height: int = 256
+    center_x: str = "-0.5"
+    center_y: str = "0"
+    zoom: float = 1.0
+
+    @property
+    def digits(self) -> int:
+        """Decimal precision needed for the reference orbit"""
+        return max(GUARD_DIGITS, int(math.log10(max(self.zoom, 1.0))) + GUARD_DIGITS)
+
+    def spans(self):
+        """(x_range, y_range) of the view"""
+        base_range = 3.0 / self.zoom
+        return base_range * self.width / self.height, base_range
+
+    def delta_grid(self, row_start: int = 0, row_stop: Optional[int] = None) -> np.ndarray:
+        """Offsets dc = c - C for a band of rows"""
+        x_range, y_range = self.spans()
+        dx = -x_range / 2.0 + np.arange(self.width) * (x_range / max(self.width - 1, 1))
+        dy = -y_range / 2.0 + np.arange(self.height) * (y_range / max(self.height - 1, 1))
+        return dx[np.newaxis, :] + 1j * dy[row_start:row_stop, np.newaxis]
+
+    def to_viewport(self) -> ViewPort:
+        """Plain float64 view (exact enough for shallow zooms)"""
+        return ViewPort(self.width, self.height, float(self.center_x), float(self.center_y), self.zoom)
+
+
+@dataclass
+class ReferenceOrbit:
+    """High-precision orbit of the view centre, rounded to complex128"""
+    orbit: np.ndarray
+    digits: int
+    elapsed: float
+    backend: str
+
+    @property
+    def length(self) -> int:
+        return len(self.orbit)
+
+    @property
+    def escaped(self) -> bool:
+        z = self.orbit[-1]
+        return z.real * z.real + z.imag * z.imag > ESCAPE_RADIUS_SQ
+
+
+def reference_orbit(center_x: str, center_y: str, max_iter: int, digits: int) -> ReferenceOrbit:
+    """Z_0 = 0 .. Z_K of the centre, stopping at max_iter or once |Z_K| > 2"""
+    start = time.perf_counter()
+    orbit = []
+    if mpmath is not None:
+        with mpmath.workdps(digits):
+            c = mpmath.mpc(mpmath.mpf(center_x), mpmath.mpf(center_y))
+            z = mpmath.mpc(0)
+            for _ in range(max_iter):
+                value = complex(z)
+                orbit.append(value)
+                if value.real * value.real + value.imag * value.imag > ESCAPE_RADIUS_SQ:
+                    break
+                z = z * z + c
+        backend = "mpmath"
+    else:
+        with decimal.localcontext() as ctx:
+            ctx.prec = digits
+            cr, ci = decimal.Decimal(center_x), decimal.Decimal(center_y)
+            zr = zi = decimal.Decimal(0)
+            for _ in range(max_iter):
+                value = complex(float(zr), float(zi))
+                orbit.append(value)
+                if value.real * value.real + value.imag * value.imag > ESCAPE_RADIUS_SQ:
+                    break
+                zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+        backend = "decimal"
+    return ReferenceOrbit(np.array(orbit, dtype=np.complex128), digits,
+                          time.perf_counter() - start, backend)
+
+
+@dataclass
+class SeriesApproximation:
+    """
+    Series coefficients at the skip iteration. Coefficients are scaled by the
+    view radius (A_k * radius^(k+1)) so high orders stay inside float64.
+    """
+    skip: int
+    coefficients: np.ndarray
+    radius: float
+    elapsed: float
+
+    def evaluate(self, dc: np.ndarray) -> np.ndarray:
+        """dz at iteration `skip` for offsets dc (Horner scheme)"""
+        u = dc / self.radius
+        dz = np.zeros_like(dc)
+        for coefficient in self.coefficients[::-1]:
+            dz = (dz + coefficient) * u
+        return dz
+
+
+def series_approximation(orbit: np.ndarray, probes: np.ndarray, terms: int = SERIES_TERMS,
+                         tolerance: float = SERIES_TOLERANCE) -> SeriesApproximation:
+    """
+    Advance the series along the reference orbit and return it at the last
+    iteration where it is still valid for every probe offset.
+    """
+    start = time.perf_counter()
+    radius = float(np.abs(probes).max()) or 1.0
+    u = probes / radius
+    powers = u[np.newaxis, :] ** np.arange(1, terms + 1)[:, np.newaxis]
+
+    coefficients = np.zeros(terms, dtype=np.complex128)
+    probe_dz = np.zeros_like(probes)
+    best = (0, coefficients.copy())
+    # Stop one short of the end of the orbit so pixels resume with a valid Z_m
+    with np.errstate(over="ignore", invalid="ignore"):
+        for n in range(len(orbit) - 2):
+            z_ref = orbit[n]
+            # A_k' = 2 Z A_k + sum_{i+j=k-1} A_i A_j (+ radius for the linear term)
+            advanced = 2.0 * z_ref * coefficients
+            advanced[1:] += np.convolve(coefficients, coefficients)[:terms - 1]
+            advanced[0] += radius
+            coefficients = advanced
+            probe_dz = (2.0 * z_ref + probe_dz) * probe_dz + probes
+
+            if not np.all(np.isfinite(coefficients)):
+                break
+            # Truncation: the highest term must stay negligible
+            if terms > 1 and abs(coefficients[-1]) > tolerance * abs(coefficients[0]):
+                break
+            # Probe pixels must neither escape nor glitch before the skip point
+            z = orbit[n + 1] + probe_dz
+            magnitude = np.abs(z)
+            if np.any(magnitude * magnitude > ESCAPE_RADIUS_SQ) or np.any(magnitude < np.abs(probe_dz)):
+                break
+            series = coefficients @ powers
+            error = np.abs(series - probe_dz)
+            if np.any(error > tolerance * np.abs(probe_dz)):
+                break
+            best = (n + 1, coefficients.copy())
+
+    skip, coefficients = best
+    if skip < MIN_SERIES_ITER:
+        skip, coefficients = 0, np.zeros(terms, dtype=np.complex128)
+    return SeriesApproximation(skip, coefficients, radius, time.perf_counter() - start)
+
+
+@dataclass
+class PerturbationStats(EngineStats):
+    """Work counters of a perturbation render"""
+    rebases: int = 0
+    series_skipped: int = 0        # Pixel iterations replaced by the series
+
+
+class PerturbationEngine(MandelbrotEngine):
+    """Deep-zoom renderer: one high-precision reference orbit, float64 pixel deltas"""
+
+    stats_class = PerturbationStats
+
+    def __init__(self, viewport: DeepViewPort, max_iter: int = 256, tile_rows: int = 32,
+                 series_terms: int = SERIES_TERMS, aa_threshold: float = 0.0, aa_grid: int = AA_GRID,
+                 smooth: bool = False):
+        # Pixel rows are offsets from an arbitrary centre, so there is no mirroring
+        super().__init__(viewport, max_iter, tile_rows, use_bulb_check=False, use_symmetry=False,
+                         aa_threshold=aa_threshold, aa_grid=aa_grid, smooth=smooth)
+        self.series_terms = series_terms
+        self.stats = PerturbationStats()
+        self._reference: Optional[ReferenceOrbit] = None
+        self._series: Optional[SeriesApproximation] = None
+
+    @property
+    def reference(self) -> ReferenceOrbit:
+        """Reference orbit of the view centre (computed on first use)"""
+        if self._reference is None:
+            vp = self.viewport
+            self._reference = reference_orbit(vp.center_x, vp.center_y, self.max_iter, vp.digits)
+        return self._reference
+
+    @property
+    def series(self) -> Optional[SeriesApproximation]:
+        """Series approximation for this view, or None when disabled"""
+        if self.series_terms <= 0:
+            return None
+        if self._series is None:
+            vp = self.viewport
+            grid = vp.delta_grid()
+            # Corners and edge midpoints bound the offsets of the whole view
+            rows, cols = [0, vp.height // 2, vp.height - 1], [0, vp.width // 2, vp.width - 1]
+            probes = np.array([grid[r, c] for r in rows for c in cols if (r, c) != (rows[1], cols[1])])
+            self._series = series_approximation(self.reference.orbit, probes, self.series_terms)
+        return self._series
+
+    def compute_rows(self, row_start: int, row_stop: int) -> np.ndarray:
+        """Iteration counts for rows [row_start, row_stop)"""
+        return self.iterate_deltas(self.viewport.delta_grid(row_start, row_stop))
+
+    def pixel_points(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Offsets dc of the given pixel centres"""
+        x_range, y_range = self.viewport.spans()
+        dx, dy = self.pixel_step()
+        return (-x_range / 2.0 + cols * dx) + 1j * (-y_range / 2.0 + rows * dy)
+
+    def pixel_step(self):
+        """(dx, dy) distance between neighbouring pixel centres"""
+        vp = self.viewport
+        x_range, y_range = vp.spans()
+        return x_range / max(vp.width - 1, 1), y_range / max(vp.height - 1, 1)
+
+    def iterate_points(self, points: np.ndarray) -> np.ndarray:
+        """Subsample points are offsets from the reference as well"""
+        return self.iterate_deltas(points)
+
+    def iterate_deltas(self, dc: np.ndarray) -> np.ndarray:
+        """
+        Escape-time counts for pixels at offsets dc from the reference point,
+        with the same convention as MandelbrotEngine.iterate().
+        """
+        shape = dc.shape
+        dc = dc.ravel()
+        counts = np.full(dc.size, self.max_iter, dtype=self.count_dtype)
+        orbit = self.reference.orbit
+        last = len(orbit) - 1
+        # Z_1 = C: the centre in float64, only needed for the smooth count
+        center = orbit[1] if last else 0j
+
+        index = np.arange(dc.size)
+        dc_active = dc
+        series = self.series
+        skip = series.skip if series is not None else 0
+        if skip:
+            # Every pixel resumes at iteration `skip` from the series value
+            dz = series.evaluate(dc)
+            self.stats.series_skipped += skip * dc.size
+        else:
+            dz = np.zeros_like(dc)
+        m = np.full(dc.size, skip, dtype=np.intp)
+        escapes = []
+        for n in range(skip + 1, self.max_iter):
+            if index.size == 0 or last == 0:
+                break
+            # dz' = 2 Z_m dz + dz^2 + dc
+            dz = (2.0 * orbit[m] + dz) * dz + dc_active
+            m += 1
+            z = orbit[m] + dz
+            self.stats.iterations += index.size
+
+            magnitude = z.real * z.real + z.imag * z.imag
+            escaped = magnitude > ESCAPE_RADIUS_SQ
+
+            # Glitch or end of the reference: continue from Z_0 with dz = z
+            rebase = (magnitude < dz.real * dz.real + dz.imag * dz.imag) | (m == last)
+            rebase &= ~escaped
+            if rebase.any():
+                dz[rebase] = z[rebase]
+                m[rebase] = 0
+                self.stats.rebases += int(np.count_nonzero(rebase))
+
+            if escaped.any():
+                if self.smooth:
+                    escapes.append((index[escaped], n, z[escaped], center + dc_active[escaped]))
+                else:
+                    counts[index[escaped]] = n
+                keep = ~escaped
+                index = index[keep]
+                dc_active = dc_active[keep]
+                dz = dz[keep]
+                m = m[keep]
+
+        if escapes:
+            escaped, steps, z_escape, c_escape = _concat_escapes(escapes)
+            counts[escaped] = self.smooth_count(steps, z_escape, c_escape)
+        return counts.reshape(shape)
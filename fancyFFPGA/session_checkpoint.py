@@ -0,0 +1,163 @@
+"""
+Checkpoint and resume of sessions ingesting a capture file.
+
+Restarting the visualizer used to re-read a capture from byte 0, which for a
+large text capture means minutes of parsing. A SessionCheckpoint keeps two
+files next to the capture:
+
+    <capture>.checkpoint.npy   the frame buffer itself, created with
+                               np.lib.format.open_memmap; the visualizer
+                               ingests straight into the mapping, so a
+                               checkpoint only flushes dirty pages
+    <capture>.checkpoint.json  file_position, pixels_read, settings,
+                               LogManager state and a fingerprint of the
+                               capture, replaced atomically after the flush
+
+Resuming maps the .npy again and continues reading at file_position, so it
+costs the same whatever the size of the frame or the capture. The
+fingerprint decides whether the capture is still the one the checkpoint was
+taken from: a file with the recorded size and mtime is accepted as is; one
+that has grown since (a capture still being written) must still hold the
+same bytes at its start and just before file_position. A shrunk or
+rewritten file invalidates the checkpoint.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_VERSION = 1
+# Bytes hashed at the start of the capture and before the checkpointed position
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def _digest(path: Path, start: int, stop: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(stop - start)).hexdigest()
+
+
+@dataclass
+class SourceFingerprint:
+    """Identity of the capture file up to a read position"""
+    size: int
+    mtime_ns: int
+    head: str   # SHA-1 of the first FINGERPRINT_BYTES (up to the position)
+    tail: str   # SHA-1 of the FINGERPRINT_BYTES before the position
+
+    @classmethod
+    def of(cls, path: Path, position: int) -> "SourceFingerprint":
+        stat = path.stat()
+        return cls(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            head=_digest(path, 0, min(position, FINGERPRINT_BYTES)),
+            tail=_digest(path, max(0, position - FINGERPRINT_BYTES), position),
+        )
+
+    def matches(self, path: Path, position: int) -> bool:
+        """True when the first `position` bytes of `path` are still the fingerprinted ones"""
+        stat = path.stat()
+        if stat.st_size < position:
+            return False  # Truncated
+        if (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns):
+            return True   # Untouched since the checkpoint
+        current = SourceFingerprint.of(path, position)
+        return (current.head, current.tail) == (self.head, self.tail)
+
+
+@dataclass
+class SessionState:
+    """Everything besides the frame buffer needed to continue a session"""
+    file_position: int
+    pixels_read: int
+    shape: Tuple[int, int]
+    settings: Dict[str, Any]
+    log: Dict[str, Any]
+    source: SourceFingerprint
+    saved_at: float
+    version: int = CHECKPOINT_VERSION
+
+
+class SessionCheckpoint:
+    """Checkpoint files of one capture"""
+
+    def __init__(self, source: Path):
+        self.source = Path(source)
+        base = str(self.source) + CHECKPOINT_SUFFIX
+        self.frame_path = Path(base + ".npy")
+        self.state_path = Path(base + ".json")
+        self.saved: Optional[Tuple[int, int]] = None  # (file_position, pixels_read) last written
+        self.last_saved = 0.0
+
+    def create_frame(self, shape: Tuple[int, int]) -> np.memmap:
+        """A zeroed float32 frame buffer backed by the checkpoint .npy"""
+        self.drop_state()
+        self.last_saved = time.monotonic()
+        return np.lib.format.open_memmap(self.frame_path, mode="w+", dtype=np.float32, shape=shape)
+
+    def drop_state(self):
+        """
+        Delete the saved state, which points into the frame about to be
+        overwritten; the .npy is kept and the next save describes the new frame
+        """
+        self.state_path.unlink(missing_ok=True)
+        self.saved = None
+
+    def due(self, interval: float, file_position: int, pixels_read: int) -> bool:
+        """True when `interval` seconds passed since the last save and there is progress to save"""
+        return (time.monotonic() - self.last_saved >= interval
+                and (file_position, pixels_read) != self.saved)
+
+    def save(self, frame: np.memmap, file_position: int, pixels_read: int,
+             settings: Dict[str, Any], log: Dict[str, Any]):
+        """Flush the frame, then atomically replace the state that points into it"""
+        frame.flush()
+        state = SessionState(
+            file_position=file_position,
+            pixels_read=pixels_read,
+            shape=tuple(frame.shape),
+            settings=settings,
+            log=log,
+            source=SourceFingerprint.of(self.source, file_position),
+            saved_at=time.time(),
+        )
+        temporary = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(asdict(state), f)
+        os.replace(temporary, self.state_path)
+        self.saved = (file_position, pixels_read)
+        self.last_saved = time.monotonic()
+
+    def load(self) -> Optional[Tuple[SessionState, np.memmap]]:
+        """The saved state and its mapped frame, or None if missing or no longer valid"""
+        if not (self.state_path.exists() and self.frame_path.exists() and self.source.exists()):
+            return None
+        with open(self.state_path) as f:
+            raw = json.load(f)
+        if raw.get("version") != CHECKPOINT_VERSION:
+            return None
+        raw["source"] = SourceFingerprint(**raw["source"])
+        raw["shape"] = tuple(raw["shape"])
+        state = SessionState(**raw)
+        if not state.source.matches(self.source, state.file_position):
+            return None
+        frame = np.lib.format.open_memmap(self.frame_path, mode="r+")
+        if frame.shape != state.shape or frame.dtype != np.float32 or state.pixels_read > frame.size:
+            return None
+        self.saved = (state.file_position, state.pixels_read)
+        self.last_saved = time.monotonic()
+        return state, frame
+
+    def discard(self):
+        """Delete the checkpoint files"""
+        self.state_path.unlink(missing_ok=True)
+        self.frame_path.unlink(missing_ok=True)
+        self.saved = None
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The application modules live next to this directory, not in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark import HeadlessVisualizer  # noqa: E402
+
+
+class _Root:
+    """Stands in for the Tk root: UI refreshes are dropped"""
+
+    def after_idle(self, *args):
+        pass
+
+
+class SessionVisualizer(HeadlessVisualizer):
+    """Headless visualizer that can also resume a checkpointed session"""
+
+    def _setup_ui(self):
+        self.root = _Root()
+
+    def _sync_controls(self):
+        pass
+
+
+@pytest.fixture
+def session_visualizer(tmp_path, monkeypatch):
+    """Factory of headless visualizers reading a text capture in tmp_path"""
+    monkeypatch.chdir(tmp_path)  # The log file is written to the working directory
+
+    def create(capture: Path, width: int, height: int, **kwargs) -> SessionVisualizer:
+        visualizer = SessionVisualizer(str(capture), **kwargs)
+        if visualizer.fractal_data is None:
+            visualizer.settings.width, visualizer.settings.height = width, height
+        return visualizer
+
+    return create
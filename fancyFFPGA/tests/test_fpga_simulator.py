@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+from fpga_simulator import TextWriter, load_capture, mandelbrot_samples
+
+
+@pytest.mark.parametrize("sample_format", ["int10", "uint16", "float32"])
+def test_text_capture_round_trip(tmp_path, sample_format):
+    frame = mandelbrot_samples(64, 48, sample_format=sample_format).ravel()
+    path = tmp_path / "capture.txt"
+    writer = TextWriter(str(path), frame_markers=True)
+    writer.start_frame()
+    writer.write(frame)
+    writer.close()
+    samples = load_capture(str(path), sample_format)
+    np.testing.assert_array_equal(samples, frame)
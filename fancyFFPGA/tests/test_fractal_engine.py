@@ -0,0 +1,59 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import fractal_engine
+from fractal_engine import MandelbrotEngine, ParallelMandelbrotEngine, ViewPort
+
+# Seahorse valley, as in the benchmark's anti-aliasing stages
+AA_VIEW = ViewPort(128, 96, -0.745, 0.1, 20.0)
+
+
+def _render(**kwargs):
+    engine = MandelbrotEngine(AA_VIEW, 256, aa_threshold=0.05)
+    for name, value in kwargs.items():
+        setattr(engine, name, value)
+    return engine, engine.render()
+
+
+def test_antialias_without_budget_only_probes():
+    engine, frame = _render(aa_budget=0.0)
+    stats = engine.stats
+    assert stats.supersampled > 0 and stats.fully_supersampled == 0
+    assert stats.subsamples == stats.supersampled
+    assert frame.min() >= 0.0 and frame.max() <= 1.0
+
+
+def test_antialias_budget_bounds_full_grids():
+    plain = MandelbrotEngine(AA_VIEW, 256)
+    plain.render()
+    engine, _ = _render()
+    unbounded, _ = _render(aa_budget=100.0)
+    assert 0 < engine.stats.fully_supersampled <= unbounded.stats.fully_supersampled
+    # Far below the 4x of full 2x2 supersampling
+    assert engine.stats.iterations < 2.5 * plain.stats.iterations
+
+
+def test_antialias_is_deterministic():
+    _, first = _render()
+    _, second = _render()
+    np.testing.assert_array_equal(first, second)
+
+
+def test_parallel_render_recovers_from_a_dead_worker():
+    view = ViewPort(64, 48)
+    serial = MandelbrotEngine(view, 128).render()
+    try:
+        pool = fractal_engine._get_pool(2)
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()  # Kills a worker and breaks the pool
+        engine = ParallelMandelbrotEngine(view, 128, workers=2)
+        try:
+            np.testing.assert_array_equal(engine.render(), serial)
+        finally:
+            engine.buffer.close()
+        assert fractal_engine._pools[2] is not pool
+    finally:
+        fractal_engine.shutdown_pools()
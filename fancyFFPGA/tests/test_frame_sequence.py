@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from frame_sequence import FRAME_MARKERS, FrameRing, marker_splits
+from frame_stats import StreamingHistogram
+
+SHAPE = (4, 6)
+
+
+def _frame(value: float) -> np.ndarray:
+    return np.full(SHAPE, value, dtype=np.float32)
+
+
+def _push(ring: FrameRing, value: float):
+    histogram = StreamingHistogram()
+    frame = _frame(value)
+    histogram.add(frame)
+    return ring.push(frame, frame.size, histogram)
+
+
+@pytest.mark.parametrize("sample_format, dtype", [("int10", "<u2"), ("float32", "<f4")])
+def test_marker_splits_round_trip(sample_format, dtype):
+    marker = FRAME_MARKERS[sample_format]
+    first, second = np.arange(5, dtype=dtype), np.arange(3, dtype=dtype) + 1
+    stream = np.concatenate(([marker], first, [marker], second)).astype(dtype)
+    runs = marker_splits(stream, sample_format)
+    assert [run.tolist() for run in runs] == [[], first.tolist(), second.tolist()]
+
+
+def test_marker_splits_uint16_has_no_marker():
+    stream = np.array([0xFFFF, 1, 2], dtype="<u2")
+    runs = marker_splits(stream, "uint16")
+    assert len(runs) == 1 and runs[0] is stream
+
+
+def test_ring_keeps_latest_frames_and_copies_them():
+    ring = FrameRing(capacity=3)
+    frames = [_frame(value) for value in (0.1, 0.2, 0.3, 0.4)]
+    for frame in frames:
+        ring.push(frame, frame.size, StreamingHistogram())
+    frames[-1].fill(0)  # The live buffer is reused; the ring holds a copy
+    assert [entry.sequence for entry in ring.snapshot()] == [1, 2, 3]
+    assert ring.get(0) is None
+    np.testing.assert_array_equal(ring.get(3).data, _frame(0.4))
+    assert ring.get(2).histogram.total == 0
+
+
+def test_ring_never_overwrites_pinned_frame():
+    ring = FrameRing(capacity=2)
+    _push(ring, 0.1)
+    _push(ring, 0.2)
+    ring.pin(0)
+    for value in (0.3, 0.4, 0.5):
+        _push(ring, value)
+    assert [entry.sequence for entry in ring.snapshot()] == [0, 4]
+    np.testing.assert_array_equal(ring.get(0).data, _frame(0.1))
+
+
+def test_single_slot_ring_skips_frames_while_pinned():
+    ring = FrameRing(capacity=1)
+    _push(ring, 0.1)
+    ring.pin(0)
+    assert _push(ring, 0.2) is None
+    np.testing.assert_array_equal(ring.get(0).data, _frame(0.1))
+    ring.pin(None)
+    assert _push(ring, 0.3).sequence == 2
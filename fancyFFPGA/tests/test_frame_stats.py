@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from fancyFractal import AUTO_CONTRAST_RANGE, AUTO_EXPOSURE_RANGE, FractalSettings, FractalTheme
+from frame_stats import HISTOGRAM_BINS, StreamingHistogram, histogram_of
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(7)
+    values = rng.beta(2, 5, 20000).astype(np.float32)
+    values[::10] = 1.0  # Bounded pixels
+    return values
+
+
+def _streamed(values: np.ndarray, chunk: int = 1234) -> StreamingHistogram:
+    histogram = StreamingHistogram()
+    for start in range(0, values.size, chunk):
+        histogram.add(values[start:start + chunk])
+    return histogram
+
+
+def test_streaming_counts_match_a_single_pass(samples):
+    streamed, whole = _streamed(samples), histogram_of(samples)
+    np.testing.assert_array_equal(streamed.counts, whole.counts)
+    assert streamed.total == samples.size
+    assert streamed.interior == samples.size // 10
+
+
+def test_equalization_flattens_the_escaped_samples(samples):
+    size = 4096
+    table = _streamed(samples).equalization_table(size)
+    assert table.shape == (size,) and table.dtype == np.float32
+    assert np.all(np.diff(table) >= 0)
+    assert table[-1] == 1.0  # Bounded pixels stay at the top of the palette
+
+    escaped = samples[samples < 1.0]
+    equalized = table[(escaped * (size - 1)).astype(int)]
+    # Equal shares of the escaped samples land in each tenth of the range
+    shares = np.histogram(equalized, bins=10, range=(0, 1))[0] / escaped.size
+    np.testing.assert_allclose(shares, 0.1, atol=0.02)
+
+
+def test_equalization_is_the_identity_before_anything_escaped():
+    histogram = histogram_of(np.ones(100, dtype=np.float32))
+    table = histogram.equalization_table(HISTOGRAM_BINS)
+    np.testing.assert_allclose(table, np.arange(HISTOGRAM_BINS) / (HISTOGRAM_BINS - 1))
+
+
+def test_copy_is_independent(samples):
+    histogram = _streamed(samples)
+    snapshot = histogram.copy()
+    histogram.add(samples)
+    assert snapshot.total == samples.size and histogram.total == 2 * samples.size
+    assert snapshot.version != histogram.version
+
+
+@pytest.mark.parametrize("q", [0, 1, 25, 50, 99, 100])
+def test_percentiles_match_numpy_within_a_bin(samples, q):
+    escaped = samples[samples < 1.0]
+    assert _streamed(samples).percentile(q) == pytest.approx(np.percentile(escaped, q), abs=1 / HISTOGRAM_BINS)
+
+
+def test_running_levels_of_the_escaped_samples(samples):
+    histogram = _streamed(samples)
+    escaped = samples[samples < 1.0]
+    assert histogram.minimum == escaped.min() and histogram.maximum == escaped.max()
+    assert histogram.mean == pytest.approx(escaped.mean(), rel=1e-5)
+
+
+def test_levels_are_undefined_before_anything_escaped():
+    histogram = histogram_of(np.ones(10, dtype=np.float32))
+    assert np.isnan(histogram.percentile(50)) and np.isnan(histogram.mean)
+    assert FractalTheme.auto_levels("classic", FractalSettings(), histogram) is None
+
+
+def test_auto_levels_stay_within_the_slider_ranges(samples):
+    contrast, exposure = FractalTheme.auto_levels("classic", FractalSettings(), _streamed(samples))
+    assert AUTO_CONTRAST_RANGE[0] <= contrast <= AUTO_CONTRAST_RANGE[1]
+    assert AUTO_EXPOSURE_RANGE[0] <= exposure <= AUTO_EXPOSURE_RANGE[1]
@@ -0,0 +1,65 @@
+import os
+import sys
+import uuid
+from multiprocessing import resource_tracker
+
+import numpy as np
+import pytest
+
+from frame_transport import ShmFrameConsumer, ShmFrameHeader, ShmFrameProducer, synthetic_frame
+
+WIDTH, HEIGHT = 16, 12
+
+
+@pytest.fixture
+def producer():
+    producer = ShmFrameProducer(f"ffpga_test_{os.getpid()}_{uuid.uuid4().hex[:8]}", WIDTH, HEIGHT)
+    yield producer
+    producer.close()
+
+
+@pytest.fixture
+def consumer(producer):
+    consumer = ShmFrameConsumer(producer.name)
+    if sys.version_info < (3, 13):
+        # Attaching dropped the producer's resource-tracker registration (both
+        # ends live in this process); restore it so unlinking stays quiet
+        resource_tracker.register(producer.shm._name, "shared_memory")
+    yield consumer
+    consumer.close()
+
+
+def test_header_round_trip():
+    header = ShmFrameHeader(WIDTH, HEIGHT, bit_depth=16, rows_complete=5, frame_id=7)
+    assert ShmFrameHeader.unpack(header.pack()) == header
+
+
+def test_missing_segment_raises():
+    with pytest.raises(FileNotFoundError):
+        ShmFrameConsumer(f"ffpga_missing_{uuid.uuid4().hex[:8]}")
+
+
+def test_poll_reports_rows_as_they_are_published(producer, consumer):
+    frame = synthetic_frame(WIDTH, HEIGHT)
+    producer.start_frame()
+    assert consumer.poll() == (0, 0, True)
+    assert consumer.poll() is None
+
+    producer.write_rows(frame[:5])
+    assert consumer.poll() == (0, 5, False)
+    assert consumer.poll() is None
+    producer.write_rows(frame[5:])
+    assert consumer.poll() == (5, HEIGHT, False)
+    np.testing.assert_array_equal(consumer.samples, frame)
+    assert consumer.scale == pytest.approx(1 / 1023)
+
+
+def test_poll_detects_the_next_frame(producer, consumer):
+    frame = synthetic_frame(WIDTH, HEIGHT)
+    producer.publish_frame(frame, rows_per_step=4)
+    assert consumer.poll() == (0, HEIGHT, True)
+
+    producer.start_frame()
+    producer.write_rows(frame[::-1][:3])
+    assert consumer.poll() == (0, 3, True)
+    np.testing.assert_array_equal(consumer.samples[:3], frame[::-1][:3])
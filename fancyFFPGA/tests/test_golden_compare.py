@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from golden_compare import GoldenComparator, capture_reference, engine_reference
+
+WIDTH, HEIGHT = 32, 24
+
+
+@pytest.fixture
+def reference():
+    return engine_reference(WIDTH, HEIGHT, "int10")
+
+
+def test_matching_frame_fed_in_chunks(reference):
+    comparator = GoldenComparator(reference, chunk=50)
+    frame = np.zeros_like(reference)
+    flat, expected = frame.reshape(-1), reference.reshape(-1)
+    for pixels in (100, 101, 400, reference.size):
+        flat[:pixels] = expected[:pixels]
+        comparator.advance(frame, pixels)
+    stats = comparator.stats
+    assert stats.compared == reference.size
+    assert (stats.mismatches, stats.first_divergent, stats.max_error_index) == (0, -1, -1)
+
+
+def test_mismatches_are_located(reference):
+    frame = reference.copy()
+    frame[3, 5] += 2 / 1023
+    frame[10, 0] -= 5 / 1023
+    frame[20, 7] += 0.5 / 1023   # Within the tolerance
+    comparator = GoldenComparator(reference, tolerance=1 / 1023, chunk=64)
+    assert comparator.advance(frame, 200) == 200
+    assert comparator.stats.mismatches == 1
+    assert comparator.advance(frame, frame.size) == frame.size - 200
+    stats = comparator.stats
+    assert stats.mismatches == 2
+    assert comparator.row(stats.first_divergent) == 3
+    assert comparator.row(stats.max_error_index) == 10
+    assert stats.max_error == pytest.approx(5 / 1023, rel=1e-4)
+    assert "max error 5 LSB (row 10)" in comparator.summary(1023)
+
+
+def test_new_frame_in_the_same_buffer_starts_over(reference):
+    frame = reference + np.float32(0.5)
+    comparator = GoldenComparator(reference)
+    comparator.advance(frame, frame.size)
+    assert comparator.stats.mismatches == frame.size
+    frame[:] = reference
+    comparator.advance(frame, 10)  # Fewer samples than compared: a new frame
+    assert (comparator.stats.compared, comparator.stats.mismatches) == (10, 0)
+
+
+def test_capture_reference_reads_the_first_text_frame(tmp_path, reference):
+    samples = np.rint(reference * 1023).astype(int).reshape(-1)
+    capture = tmp_path / "reference.txt"
+    lines = ["FRAME", *map(str, samples), "FRAME", *map(str, samples[::-1])]
+    capture.write_text("\n".join(lines) + "\n")
+    loaded = capture_reference(capture, "int10", (HEIGHT, WIDTH), binary=False)
+    np.testing.assert_allclose(loaded, reference, atol=1e-6)
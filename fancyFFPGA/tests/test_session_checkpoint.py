@@ -0,0 +1,105 @@
+import numpy as np
+
+from fancyFractal import FractalSettings
+from session_checkpoint import SessionCheckpoint
+
+WIDTH, HEIGHT = 8, 8
+PIXELS = WIDTH * HEIGHT
+
+
+def _append(capture, samples):
+    with open(capture, "a") as f:
+        f.write("".join(f"{value}\n" for value in samples))
+
+
+def test_resume_after_rollover_crash_keeps_frames_intact(tmp_path, session_visualizer):
+    capture = tmp_path / "capture.txt"
+    first = (np.arange(PIXELS) * 16) % 1024
+    second = 1023 - first
+    capture.touch()
+
+    visualizer = session_visualizer(capture, WIDTH, HEIGHT)
+    _append(capture, first[:PIXELS // 2])
+    visualizer._poll_source()
+    visualizer._save_checkpoint()
+    _append(capture, first[PIXELS // 2:])
+    _append(capture, second[:10])
+    visualizer._poll_source()
+    # Crash: no checkpoint of the new frame, nothing closed
+
+    resumed = session_visualizer(capture, WIDTH, HEIGHT)
+    resumed._poll_source()
+    frame = resumed.frame_ring.get(0)
+    assert frame is not None and frame.complete
+    np.testing.assert_allclose(frame.data.reshape(-1), first / 1023, rtol=1e-6)
+    assert resumed.pixels_read == 10
+    np.testing.assert_allclose(resumed.fractal_data.reshape(-1)[:10], second[:10] / 1023, rtol=1e-6)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    capture = tmp_path / "capture.txt"
+    capture.write_text("1\n2\n3\n")
+    checkpoint = SessionCheckpoint(capture)
+    frame = checkpoint.create_frame((2, 3))
+    frame[0] = [0.25, 0.5, 0.75]
+    checkpoint.save(frame, 6, 3, {"sample_format": "int10"}, {"sessions": 1})
+
+    state, loaded = SessionCheckpoint(capture).load()
+    assert (state.file_position, state.pixels_read, state.shape) == (6, 3, (2, 3))
+    assert state.settings == {"sample_format": "int10"} and state.log == {"sessions": 1}
+    np.testing.assert_array_equal(loaded, frame)
+
+
+def test_checkpoint_follows_a_growing_capture_but_not_a_rewritten_one(tmp_path):
+    capture = tmp_path / "capture.txt"
+    capture.write_text("1\n2\n3\n")
+    checkpoint = SessionCheckpoint(capture)
+    checkpoint.save(checkpoint.create_frame((2, 3)), 6, 3, {}, {})
+
+    with open(capture, "a") as f:
+        f.write("4\n")
+    assert SessionCheckpoint(capture).load() is not None
+
+    capture.write_text("9\n2\n3\n4\n5\n")
+    assert SessionCheckpoint(capture).load() is None
+
+    capture.write_text("1\n")
+    assert SessionCheckpoint(capture).load() is None
+
+
+def test_resume_continues_where_the_checkpoint_left_off(tmp_path, session_visualizer):
+    capture = tmp_path / "capture.txt"
+    frame = (np.arange(PIXELS) * 16) % 1024
+    capture.touch()
+    visualizer = session_visualizer(capture, WIDTH, HEIGHT)
+    _append(capture, frame[:PIXELS // 2])
+    visualizer._poll_source()
+    visualizer._save_checkpoint()
+    position = visualizer.file_position
+    _append(capture, frame[PIXELS // 2:])
+
+    resumed = session_visualizer(capture, WIDTH, HEIGHT)
+    assert (resumed.file_position, resumed.pixels_read) == (position, PIXELS // 2)
+    resumed._poll_source()
+    assert resumed.pixels_read == PIXELS
+    np.testing.assert_allclose(resumed.fractal_data.reshape(-1), frame / 1023, rtol=1e-6)
+
+
+def test_pinned_sample_format_discards_a_checkpoint_of_another_format(tmp_path, session_visualizer):
+    capture = tmp_path / "capture.txt"
+    capture.touch()
+    visualizer = session_visualizer(capture, WIDTH, HEIGHT)
+    _append(capture, range(PIXELS // 2))
+    visualizer._poll_source()
+    visualizer._save_checkpoint()
+    checkpoint = visualizer.checkpoint
+
+    restored = session_visualizer(capture, WIDTH, HEIGHT, settings=FractalSettings(sample_format="uint16"))
+    assert restored.settings.sample_format == "int10"  # Not pinned: taken from the checkpoint
+    assert restored.pixels_read == PIXELS // 2
+
+    pinned = session_visualizer(capture, WIDTH, HEIGHT, settings=FractalSettings(sample_format="uint16"),
+                                pinned_settings=("sample_format",))
+    assert pinned.settings.sample_format == "uint16"
+    assert pinned.pixels_read == 0 and pinned.file_position == 0
+    assert not checkpoint.state_path.exists()
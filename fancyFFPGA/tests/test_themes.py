@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from benchmark import HeadlessVisualizer
+from fancyFractal import FractalTheme, FractalSettings
+from fpga_simulator import mandelbrot_samples
+
+WIDTH, HEIGHT = 300, 200
+
+
+@pytest.fixture
+def visualizer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The log file is written to the working directory
+    visualizer = HeadlessVisualizer(str(tmp_path / "capture.txt"))
+    visualizer.settings.width, visualizer.settings.height = WIDTH, HEIGHT
+    visualizer.fractal_data = (mandelbrot_samples(WIDTH, HEIGHT) / 1023).astype(np.float32)
+    visualizer.pixels_read = visualizer.total_pixels = WIDTH * HEIGHT
+    return visualizer
+
+
+def test_dramatic_theme_has_no_nan_on_default_view(visualizer):
+    themed = FractalTheme.apply_theme(visualizer.fractal_data, "dramatic", FractalSettings())
+    assert not np.isnan(themed).any()
+
+
+def test_dramatic_theme_renders_default_view(visualizer):
+    visualizer.settings.theme = "dramatic"
+    image = visualizer._compose_image(HEIGHT)
+    assert image.size == (WIDTH, HEIGHT)
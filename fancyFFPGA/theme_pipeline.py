@@ -0,0 +1,274 @@
+"""
+Declarative image pipeline for the Fractal Visualizer's themes and enhancements.
+
+A theme is a small graph of named stages over the normalized sample frame
+instead of a hand-written function. Each operation declares its kind:
+
+    point    elementwise, one input (power, scale, contrast, clip, lookup)
+    combine  elementwise, several inputs (blend, unsharp)
+    stencil  neighbourhood filter with a declared radius in pixels
+             (gaussian, sobel, laplace, rank, maximum, and the specialized
+             median3x3 and fast_maximum kernels from fast_filters)
+
+Stages are hash-consed while the graph is built, so an identical operation on
+an identical input (e.g. the same gaussian_filter requested by a theme and an
+enhancement) is computed once, and operations that are the identity for their
+parameters (contrast == 1, exposure == 1, gamma == 1) are never added. When
+the graph runs, only stages the output depends on are executed, stencils and
+combines are scheduled before point operations, and a run of point
+operations reuses one buffer in place once no other stage needs it. Every
+stage performs exactly the NumPy/SciPy calls of the code it replaces, so
+results are bit-identical.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import ndimage
+
+from fast_filters import median3x3, maximum_filter
+
+
+@dataclass(frozen=True)
+class Operation:
+    """Kind, implementation and properties of one stage type"""
+    kind: str                                              # "point", "combine" or "stencil"
+    compute: Callable[[Sequence[np.ndarray], Dict[str, Any]], np.ndarray]
+    in_place: Optional[Callable[[Sequence[np.ndarray], Dict[str, Any]], np.ndarray]] = None
+    radius: Callable[[Dict[str, Any]], int] = lambda params: 0
+    identity: Callable[[Dict[str, Any]], bool] = lambda params: False
+
+
+def _power(args, params):
+    return np.power(args[0], params["exponent"])
+
+
+def _power_in_place(args, params):
+    return np.power(args[0], params["exponent"], out=args[0])
+
+
+def _scale(args, params):
+    return args[0] * params["factor"]
+
+
+def _scale_in_place(args, params):
+    return np.multiply(args[0], params["factor"], out=args[0])
+
+
+def _contrast(args, params):
+    return 0.5 + (args[0] - 0.5) * params["factor"]
+
+
+def _contrast_in_place(args, params):
+    x = args[0]
+    np.subtract(x, 0.5, out=x)
+    np.multiply(x, params["factor"], out=x)
+    return np.add(x, 0.5, out=x)
+
+
+def _clip(args, params):
+    return np.clip(args[0], params["low"], params["high"])
+
+
+def _clip_in_place(args, params):
+    return np.clip(args[0], params["low"], params["high"], out=args[0])
+
+
+def _lookup(args, params):
+    """Table lookup indexed like a palette LUT (float32 table passed as bytes, so it hashes)"""
+    table = np.frombuffer(params["table"], dtype=np.float32)
+    top = len(table) - 1
+    return table[np.clip(args[0] * top, 0, top).astype(int)]
+
+
+def _blend(args, params):
+    """sum(weight_i * input_i), accumulated left to right"""
+    weights = params["weights"]
+    result = args[0] if weights[0] == 1 else args[0] * weights[0]
+    for weight, x in zip(weights[1:], args[1:]):
+        result = result + (x if weight == 1 else weight * x)
+    return result
+
+
+def _blend_in_place(args, params):
+    weights = params["weights"]
+    result = args[0]
+    if weights[0] != 1:
+        np.multiply(result, weights[0], out=result)
+    for weight, x in zip(weights[1:], args[1:]):
+        np.add(result, x if weight == 1 else weight * x, out=result)
+    return result
+
+
+def _unsharp(args, params):
+    """x + strength * (x - blurred)"""
+    x, blurred = args
+    return x + params["strength"] * (x - blurred)
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "power": Operation("point", _power, _power_in_place,
+                       identity=lambda p: p["exponent"] == 1),
+    "scale": Operation("point", _scale, _scale_in_place,
+                       identity=lambda p: p["factor"] == 1),
+    "contrast": Operation("point", _contrast, _contrast_in_place,
+                          identity=lambda p: p["factor"] == 1),
+    "clip": Operation("point", _clip, _clip_in_place),
+    "lookup": Operation("point", _lookup),
+    "blend": Operation("combine", _blend, _blend_in_place,
+                       identity=lambda p: tuple(p["weights"]) == (1,)),
+    "unsharp": Operation("combine", _unsharp,
+                         identity=lambda p: p["strength"] == 0),
+    "gaussian": Operation("stencil", lambda a, p: ndimage.gaussian_filter(a[0], sigma=p["sigma"]),
+                          radius=lambda p: int(4.0 * p["sigma"] + 0.5),
+                          identity=lambda p: p["sigma"] == 0),
+    "sobel": Operation("stencil", lambda a, p: ndimage.sobel(a[0]), radius=lambda p: 1),
+    "laplace": Operation("stencil", lambda a, p: ndimage.laplace(a[0]), radius=lambda p: 1),
+    "rank": Operation("stencil", lambda a, p: ndimage.rank_filter(a[0], rank=p["rank"], size=p["size"]),
+                      radius=lambda p: p["size"] // 2),
+    "maximum": Operation("stencil", lambda a, p: ndimage.maximum_filter(a[0], size=p["size"]),
+                         radius=lambda p: p["size"] // 2),
+    "median3x3": Operation("stencil", lambda a, p: median3x3(a[0]), radius=lambda p: 1),
+    "fast_maximum": Operation("stencil", lambda a, p: maximum_filter(a[0], size=p["size"]),
+                              radius=lambda p: p["size"] // 2),
+}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the graph: an operation applied to earlier stages"""
+    index: int
+    op: str
+    inputs: Tuple[int, ...]
+    params: Tuple[Tuple[str, Any], ...]
+
+    @property
+    def operation(self) -> Operation:
+        return OPERATIONS[self.op]
+
+    @property
+    def radius(self) -> int:
+        return self.operation.radius(dict(self.params))
+
+
+@dataclass
+class PipelineStats:
+    """What the builder and executor saved"""
+    stages: int = 0               # Stages added to the graph
+    deduplicated: int = 0         # Requests answered by an identical existing stage
+    identities: int = 0           # Stages skipped as the identity
+    executed: int = 0
+    dead: int = 0                 # Stages the output does not depend on
+    in_place: int = 0             # Stages that reused their input's buffer
+
+
+class ThemePipeline:
+    """Graph builder and executor; stage 0 is the input frame"""
+
+    INPUT = 0
+
+    def __init__(self):
+        self.stages: List[Stage] = [Stage(0, "input", (), ())]
+        self.stats = PipelineStats()
+        self._index: Dict[Tuple, int] = {}
+
+    def add(self, op: str, *inputs: int, **params) -> int:
+        """Stage computing `op` over `inputs`; returns its index"""
+        operation = OPERATIONS[op]
+        if operation.identity(params):
+            self.stats.identities += 1
+            return inputs[0]
+        frozen = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()))
+        key = (op, inputs, frozen)
+        existing = self._index.get(key)
+        if existing is not None:
+            self.stats.deduplicated += 1
+            return existing
+        stage = Stage(len(self.stages), op, inputs, frozen)
+        self.stages.append(stage)
+        self._index[key] = stage.index
+        self.stats.stages += 1
+        return stage.index
+
+    def halo(self, output: int) -> int:
+        """Rows/columns of context an output pixel depends on (sum of radii along the deepest path)"""
+        depth = [0] * len(self.stages)
+        for stage in self.stages[1:output + 1]:
+            depth[stage.index] = stage.radius + max((depth[i] for i in stage.inputs), default=0)
+        return depth[output]
+
+    def schedule(self, output: int) -> List[Stage]:
+        """
+        Live stages in execution order: stencils and combines as soon as
+        they are ready, point operations last, and a point operation right
+        after the stage it consumes so chains stay on one buffer.
+        """
+        live = set()
+        pending = [output]
+        while pending:
+            index = pending.pop()
+            if index not in live:
+                live.add(index)
+                pending.extend(self.stages[index].inputs)
+        live.discard(self.INPUT)
+        self.stats.dead = len(self.stages) - 1 - len(live)
+
+        waiting = {i: len(set(self.stages[i].inputs) - {self.INPUT}) for i in live}
+        consumers: Dict[int, List[int]] = {}
+        for i in sorted(live):
+            for source in set(self.stages[i].inputs):
+                consumers.setdefault(source, []).append(i)
+
+        order = []
+        ready = [i for i in sorted(live) if waiting[i] == 0]
+        while ready:
+            # Prefer non-point stages; among point stages take the newest ready one
+            choice = next((i for i in ready if self.stages[i].operation.kind != "point"), ready[-1])
+            ready.remove(choice)
+            order.append(self.stages[choice])
+            for consumer in consumers.get(choice, []):
+                waiting[consumer] -= 1
+                if waiting[consumer] == 0:
+                    ready.append(consumer)
+        return order
+
+    def run(self, data: np.ndarray, output: int) -> np.ndarray:
+        """Evaluate the stages `output` depends on; `data` is never modified"""
+        if output == self.INPUT:
+            return data
+        order = self.schedule(output)
+        uses: Dict[int, int] = {output: 1}
+        for stage in order:
+            for source in stage.inputs:
+                uses[source] = uses.get(source, 0) + 1
+
+        values: Dict[int, np.ndarray] = {self.INPUT: data}
+        for stage in order:
+            operation = stage.operation
+            params = dict(stage.params)
+            args = [values[i] for i in stage.inputs]
+            first = stage.inputs[0]
+            if (operation.in_place is not None and first != self.INPUT and uses[first] == 1
+                    and stage.inputs.count(first) == 1):
+                result = operation.in_place(args, params)
+                self.stats.in_place += 1
+            else:
+                result = operation.compute(args, params)
+            self.stats.executed += 1
+            for source in stage.inputs:
+                uses[source] -= 1
+                if uses[source] == 0 and source != self.INPUT:
+                    del values[source]  # Last consumer done: release the buffer
+            values[stage.index] = result
+        return values[output]
+
+    def describe(self, output: int) -> str:
+        """Human-readable execution plan"""
+        lines = []
+        for stage in self.schedule(output):
+            params = ", ".join(f"{k}={v}" for k, v in stage.params)
+            inputs = ", ".join("input" if i == self.INPUT else f"#{i}" for i in stage.inputs)
+            lines.append(f"#{stage.index} {stage.op}({inputs}{', ' if params else ''}{params})"
+                         f" [{stage.operation.kind}, r={stage.radius}]")
+        return "\n".join(lines)